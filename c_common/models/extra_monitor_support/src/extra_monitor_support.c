@@ -74,6 +74,8 @@ enum {
 typedef enum data_out_sdp_commands {
     //! send data command ID in SDP
     SDP_CMD_START_SENDING_DATA = 100,
+    //! send data from several ranges of memory command ID in SDP
+    SDP_CMD_START_SENDING_DATA_RANGES = 101,
     //! start missing SDP sequence numbers in SDP
     //! (this includes number of SDP packets expected)
     SDP_CMD_START_OF_MISSING_SDP_PACKETS = 1000,
@@ -86,6 +88,9 @@ typedef enum data_out_sdp_commands {
 //! timeout for trying to end SDP packet
 #define SDP_TIMEOUT 1000
 
+//! the most ranges of memory that can be sent in one data out session
+#define MAX_DATA_OUT_RANGES 16
+
 //! extra length adjustment for the SDP header, in bytes
 #define LENGTH_OF_SDP_HEADER 8
 
@@ -249,6 +254,20 @@ typedef struct sdp_data_out_t {
     uint length;
 } sdp_data_out_t;
 
+//! \brief a range of memory to send by data speed up out
+typedef struct data_out_range_t {
+    address_t sdram_location;
+    uint length;
+} data_out_range_t;
+
+//! \brief message payload for sending several ranges of memory in one go;
+//! each range starts at the start of a packet
+typedef struct sdp_data_out_ranges_t {
+    data_out_sdp_commands command;
+    uint n_ranges;
+    data_out_range_t ranges[];
+} sdp_data_out_ranges_t;
+
 //! \brief router entry positions in sdram
 typedef struct router_entry_t {
     uint32_t key;
@@ -330,7 +349,9 @@ enum speed_up_in_command {
     //! load application mc routes
     SDP_COMMAND_FOR_LOADING_APPLICATION_MC_ROUTES = 7,
     //! load system mc routes
-    SDP_COMMAND_FOR_LOADING_SYSTEM_MC_ROUTES = 8
+    SDP_COMMAND_FOR_LOADING_SYSTEM_MC_ROUTES = 8,
+    //! sum the words of a block of SDRAM, to check data that was written
+    SDP_COMMAND_FOR_CHECKSUMMING_SDRAM = 9
 };
 
 //! human readable definitions of each element in the transmission region
@@ -429,6 +450,12 @@ static uint32_t first_data_key = 0;
 static uint32_t end_flag_key = 0;
 static uint32_t stop = 0;
 
+//! the ranges of memory being sent, and the first sequence number of each
+static data_out_range_t data_out_ranges[MAX_DATA_OUT_RANGES];
+static uint32_t data_out_range_first_seq_num[MAX_DATA_OUT_RANGES];
+static uint32_t n_data_out_ranges = 0;
+static uint32_t current_data_out_range = 0;
+
 // ------------------------------------------------------------------------
 // support functions
 // ------------------------------------------------------------------------
@@ -983,10 +1010,47 @@ static void data_in_speed_up_load_in_application_routes(void) {
             saved_application_router_table, N_USABLE_ROUTER_ENTRIES);
 }
 
+//! \brief sums a block of SDRAM as little-endian 32-bit words, modulo 2^32,
+//! with any bytes after the last whole word zero-padded to a word. Used to
+//! check that data sent in arrived intact without reading it all back.
+//! \param[in] msg: the SDP message, with the address in arg1 and the number
+//! of bytes in arg2; the sum is put in arg1
+//! \return: the length of the body of the reply
+static uint data_in_checksum_sdram(sdp_msg_t *msg) {
+    uint8_t *bytes = (uint8_t *) msg->arg1;
+    uint n_bytes = msg->arg2;
+    uint n_words = n_bytes / sizeof(uint32_t);
+    uint32_t sum = 0;
+
+    if (((uint) bytes & (sizeof(uint32_t) - 1)) == 0) {
+        uint32_t *words = (uint32_t *) bytes;
+        for (uint i = 0; i < n_words; i++) {
+            sum += words[i];
+        }
+    } else {
+        for (uint i = 0; i < n_words; i++) {
+            uint8_t *word = &bytes[i * sizeof(uint32_t)];
+            sum += word[0] | (word[1] << 8) | (word[2] << 16) |
+                    (word[3] << 24);
+        }
+    }
+
+    uint8_t *tail = &bytes[n_words * sizeof(uint32_t)];
+    uint32_t last_word = 0;
+    for (uint i = 0; i < n_bytes % sizeof(uint32_t); i++) {
+        last_word |= tail[i] << (8 * i);
+    }
+    sum += last_word;
+
+    msg->arg1 = sum;
+    msg->cmd_rc = RC_OK;
+    return sizeof(uint32_t);
+}
+
 //! \brief the handler for all messages coming in for data in speed up
 //! functionality.
 //! \param[in] msg: the SDP message (without SCP header)
-//! \return: complete code if successful
+//! \return: the length of the body of the reply
 static uint data_in_speed_up_command(sdp_msg_t *msg) {
     switch (msg->cmd_rc) {
     case SDP_COMMAND_FOR_SAVING_APPLICATION_MC_ROUTING:
@@ -1005,6 +1069,8 @@ static uint data_in_speed_up_command(sdp_msg_t *msg) {
                 dsg_block(CONFIG_DATA_SPEED_UP_IN));
         msg->cmd_rc = RC_OK;
         break;
+    case SDP_COMMAND_FOR_CHECKSUMMING_SDRAM:
+        return data_in_checksum_sdram(msg);
     default:
         io_printf(IO_BUF,
                 "Received unknown SDP packet in data in speed up port with"
@@ -1082,6 +1148,54 @@ static void data_out_read(
             &data_to_transmit[transmit_dma_pointer][offset], items_to_read);
 }
 
+//! \brief makes a range of memory the one being read from
+//! \param[in] range: the index of the range
+static void data_out_start_range(uint32_t range) {
+    current_data_out_range = range;
+    store_address = data_out_ranges[range].sdram_location;
+    bytes_to_read_write = data_out_ranges[range].length;
+    n_elements_to_read_from_sdram = bytes_to_read_write / sizeof(uint);
+    position_in_store = 0;
+}
+
+//! \brief makes the data of a sequence number the next to be read
+//! \param[in] seq_num: the sequence number
+static void data_out_locate_seq_num(uint32_t seq_num) {
+    uint32_t range = n_data_out_ranges - 1;
+    while (range > 0 && data_out_range_first_seq_num[range] > seq_num) {
+        range--;
+    }
+    data_out_start_range(range);
+    position_in_store =
+            (seq_num - data_out_range_first_seq_num[range]) * SDP_PAYLOAD_WORDS;
+}
+
+//! \brief starts sending the ranges of memory set up
+static void data_out_start_sending(void) {
+    stop = 0;
+
+    // each range starts at the start of a packet
+    uint32_t seq = 0;
+    for (uint32_t i = 0; i < n_data_out_ranges; i++) {
+        uint32_t length = data_out_ranges[i].length;
+        data_out_range_first_seq_num[i] = seq;
+        seq += length / SDP_PAYLOAD_BYTES + (length % SDP_PAYLOAD_BYTES > 0);
+    }
+    max_seq_num = seq;
+
+    // reset states
+    first_transmission = true;
+    transmit_dma_pointer = 0;
+    data_out_start_range(0);
+
+    if (n_elements_to_read_from_sdram < SDP_PAYLOAD_WORDS) {
+        data_out_read(DMA_TAG_READ_FOR_TRANSMISSION, 1,
+                n_elements_to_read_from_sdram);
+    } else {
+        data_out_read(DMA_TAG_READ_FOR_TRANSMISSION, 1, SDP_PAYLOAD_WORDS);
+    }
+}
+
 //! \brief sends a end flag via multicast
 static void data_out_send_end_flag(void) {
     send_fixed_route_packet(end_flag_key, END_FLAG);
@@ -1093,6 +1207,7 @@ static void data_out_dma_complete_reading_for_original_transmission(void) {
     uint32_t current_dma_pointer = transmit_dma_pointer;
     uint32_t key_to_transmit = basic_data_key;
     uint32_t items_read_this_time = num_items_read;
+    uint32_t first_item = 0;
 
     // put size in bytes if first send
     if (first_transmission) {
@@ -1101,6 +1216,19 @@ static void data_out_dma_complete_reading_for_original_transmission(void) {
         key_to_transmit = first_data_key;
         first_transmission = false;
         items_read_this_time += 1;
+        first_item = 1;
+    }
+
+    // if a range is done and another follows, fill the rest of the packet so
+    // that the next range starts at the start of a packet, and move on
+    if (position_in_store >= n_elements_to_read_from_sdram
+            && current_data_out_range + 1 < n_data_out_ranges) {
+        for (uint32_t i = items_read_this_time;
+                i < first_item + SDP_PAYLOAD_WORDS; i++) {
+            data_to_transmit[current_dma_pointer][i] = 0;
+        }
+        items_read_this_time = first_item + SDP_PAYLOAD_WORDS;
+        data_out_start_range(current_data_out_range + 1);
     }
 
     // stopping procedure
@@ -1237,9 +1365,9 @@ static void data_out_dma_complete_read_missing_seqeuence_nums(void) {
             retransmit_seq_nums[position_in_read_data];
     if (missing_seq_num_being_processed != END_FLAG) {
         // regenerate data
-        position_in_store = missing_seq_num_being_processed * SDP_PAYLOAD_WORDS;
+        data_out_locate_seq_num(missing_seq_num_being_processed);
         uint32_t left_over_portion =
-                bytes_to_read_write / sizeof(uint) - position_in_store;
+                n_elements_to_read_from_sdram - position_in_store;
 
         if (left_over_portion < SDP_PAYLOAD_WORDS) {
             retransmitted_seq_num_items_read = left_over_portion + 1;
@@ -1288,30 +1416,27 @@ static void data_out_dma_complete_writing_missing_seq_to_sdram(void) {
 static void data_out_speed_up_command(sdp_msg_pure_data *msg) {
     sdp_data_out_t *message = (sdp_data_out_t *) msg->data;
     switch (message->command) {
-    case SDP_CMD_START_SENDING_DATA: {
-        stop = 0;
-
+    case SDP_CMD_START_SENDING_DATA:
         // set SDRAM position and length
-        store_address = message->sdram_location;
-        bytes_to_read_write = message->length;
-
-        uint32_t seq = bytes_to_read_write / (67 * 4),
-                mod = bytes_to_read_write % (67 * 4);
-        seq += mod > 0;
-        max_seq_num = seq;
-
-        // reset states
-        first_transmission = true;
-        transmit_dma_pointer = 0;
-        position_in_store = 0;
-        n_elements_to_read_from_sdram = bytes_to_read_write / sizeof(uint);
-
-        if (n_elements_to_read_from_sdram < SDP_PAYLOAD_WORDS) {
-            data_out_read(DMA_TAG_READ_FOR_TRANSMISSION, 1,
-                    n_elements_to_read_from_sdram);
-        } else {
-            data_out_read(DMA_TAG_READ_FOR_TRANSMISSION, 1, SDP_PAYLOAD_WORDS);
+        data_out_ranges[0].sdram_location = message->sdram_location;
+        data_out_ranges[0].length = message->length;
+        n_data_out_ranges = 1;
+        data_out_start_sending();
+        return;
+    case SDP_CMD_START_SENDING_DATA_RANGES: {
+        sdp_data_out_ranges_t *ranges_message =
+                (sdp_data_out_ranges_t *) msg->data;
+        if (ranges_message->n_ranges == 0
+                || ranges_message->n_ranges > MAX_DATA_OUT_RANGES) {
+            io_printf(IO_BUF, "Can't send %d ranges of memory\n",
+                    ranges_message->n_ranges);
+            return;
+        }
+        for (uint32_t i = 0; i < ranges_message->n_ranges; i++) {
+            data_out_ranges[i] = ranges_message->ranges[i];
         }
+        n_data_out_ranges = ranges_message->n_ranges;
+        data_out_start_sending();
         return;
     }
     case SDP_CMD_START_OF_MISSING_SDP_PACKETS:
@@ -0,0 +1,578 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import heapq
+import itertools
+import random
+import struct
+import threading
+import time
+import traceback
+import numpy
+from spinn_machine import virtual_machine
+from spinnman.connections.udp_packet_connections import (
+    SCAMPConnection, UDPConnection)
+from spinnman.messages.scp.enums import SCPResult
+from spinnman.messages.sdp import SDPFlag, SDPHeader
+from pacman.model.placements import Placement
+from spinn_front_end_common.utilities import globals_variables
+from spinn_front_end_common.utilities.constants import SDP_PORTS
+from spinn_front_end_common.utilities.failed_state import FailedState
+from spinn_front_end_common.utility_models import (
+    data_speed_up_packet_gatherer_machine_vertex as gatherer_module)
+from spinn_front_end_common.utility_models.\
+    data_speed_up_packet_gatherer_machine_vertex import (
+        BYTES_FOR_COMMAND_AND_ADDRESS_HEADER,
+        BYTES_FOR_COMMAND_AND_SEQ_HEADER, BYTES_IN_FULL_PACKET_WITH_ADDRESS,
+        BYTES_IN_FULL_PACKET_WITHOUT_ADDRESS, DATA_IN_COMMANDS,
+        DATA_OUT_COMMANDS, WORD_SIZE, WORDS_PER_FULL_PACKET,
+        WORDS_PER_FULL_PACKET_WITH_SEQUENCE_NUM,
+        DataSpeedUpPacketGatherMachineVertex)
+
+#: The start of the SDRAM of each chip
+SDRAM_BASE_ADDRESS = 0x60000000
+
+#: The default number of bytes of SDRAM on each chip
+DEFAULT_SDRAM_PER_CHIP = 16 * 1024 * 1024
+
+#: The core the gatherer of the board is on
+GATHERER_CORE = 1
+
+#: The core the extra monitor of each chip is on
+MONITOR_CORE = 2
+
+# How long the gatherer waits for more data in before reporting what is
+# missing; the same as the real gatherer
+_DATA_IN_TIMEOUT = 0.033
+
+# The longest time to wait for something to arrive before checking whether to
+# stop
+_POLL_INTERVAL = 0.1
+
+# The bytes of data in a data out packet, after the sequence number
+_DATA_OUT_PACKET_BYTES = WORDS_PER_FULL_PACKET_WITH_SEQUENCE_NUM * WORD_SIZE
+
+# The most missing sequence numbers in the reports sent about data in
+_FIRST_MISSING_ITEMS = WORDS_PER_FULL_PACKET - 2
+_MORE_MISSING_ITEMS = WORDS_PER_FULL_PACKET - 1
+
+_LAST_MESSAGE_FLAG = 0x80000000
+
+_CMD_IPTAG = 26
+_ONE_WORD = struct.Struct("<I")
+_TWO_WORDS = struct.Struct("<II")
+_SCP_HEADER = struct.Struct("<2H")
+_SCP_OFFSET = 10
+
+
+class LoopbackMachine(threading.Thread):
+    """ A stand-in for a board with a gatherer and extra monitors that\
+        speaks the Data Out and Data In protocols over UDP on localhost,\
+        so that the speed of the protocols can be measured without\
+        hardware. Packets carrying data can be lost, reordered and delayed.
+
+    Use it as a context manager; while it is in use, gatherers connect to\
+    it rather than to a board, and the simulator's transceiver is one that\
+    reads and writes its memory directly.
+    """
+
+    def __init__(
+            self, loss_rate=0.0, control_loss_rate=0.0, reorder_rate=0.0,
+            reorder_delay=0.002, latency=0.0, bandwidth=None, seed=None,
+            sdram_per_chip=DEFAULT_SDRAM_PER_CHIP):
+        """
+        :param loss_rate: \
+            The chance of losing each packet that carries data, in either\
+            direction
+        :type loss_rate: float
+        :param control_loss_rate: \
+            The chance of losing each other packet, such as requests for\
+            missing data and end flags. Note that the real gatherer does not\
+            answer again once it has said that a Data In transfer is finished,\
+            so losing that answer fails the transfer.
+        :type control_loss_rate: float
+        :param reorder_rate: \
+            The chance of each packet sent to the host being held back, so\
+            that later packets overtake it
+        :type reorder_rate: float
+        :param reorder_delay: \
+            How long, in seconds, packets that are held back are held for
+        :type reorder_delay: float
+        :param latency: \
+            How long, in seconds, each packet sent to the host takes to arrive
+        :type latency: float
+        :param bandwidth: \
+            The most bytes per second sent to the host, or None for no limit
+        :type bandwidth: float or None
+        :param seed: The seed for the choice of packets to lose and reorder
+        :type seed: int or None
+        :param sdram_per_chip: The number of bytes of SDRAM on each chip
+        :type sdram_per_chip: int
+        """
+        # pylint: disable=too-many-arguments
+        super(LoopbackMachine, self).__init__(name="Loopback machine")
+        self.daemon = True
+        self._loss_rate = loss_rate
+        self._control_loss_rate = control_loss_rate
+        self._reorder_rate = reorder_rate
+        self._reorder_delay = reorder_delay
+        self._latency = latency
+        self._bandwidth = bandwidth
+        self._random = random.Random(seed)
+        self._sdram_per_chip = sdram_per_chip
+
+        self._receiver = UDPConnection(local_host="127.0.0.1")
+        self._running = False
+        self._error = None
+        self._machine = virtual_machine(8, 8)
+        self._memory = dict()
+        self._memory_lock = threading.Lock()
+
+        # Packets waiting to be sent to the host, as (time, count, data,
+        # is_data_out); the count keeps packets due together in order. Only
+        # the thread of the machine uses these.
+        self._outgoing = list()
+        self._count = itertools.count()
+        self._link_free_at = 0.0
+
+        # Where the IP tag of the gatherer sends packets
+        self._tag_address = None
+
+        # The state of the data out transfer
+        self._out_chip = None
+        self._out_data = None
+        self._out_max_seq_num = 0
+        self._out_missing = list()
+        self._out_n_missing_packets = 0
+        self._out_n_missing_packets_received = 0
+
+        # The state of the data in transfer
+        self._in_chip = None
+        self._in_address = None
+        self._in_max_seq_num = 0
+        self._in_received = None
+        self._in_timeout_at = None
+
+        self._transceiver = _LoopbackTransceiver(self)
+        self._real_gatherer_connection = None
+
+    @property
+    def local_port(self):
+        """ The port that the machine receives packets on
+
+        :rtype: int
+        """
+        return self._receiver.local_port
+
+    @property
+    def error(self):
+        """ The first error in handling a packet, if any
+        """
+        return self._error
+
+    @property
+    def transceiver(self):
+        """ A transceiver that talks to this machine
+        """
+        return self._transceiver
+
+    @property
+    def machine(self):
+        """ The machine being stood in for
+
+        :rtype: ~spinn_machine.Machine
+        """
+        return self._machine
+
+    def make_gatherer(self, report_folder, app_id=30):
+        """ Make a gatherer for the board, as if placed on it
+
+        :param report_folder: Where the gatherer is to write any reports
+        :type report_folder: str
+        :param app_id: The application ID of the gatherer
+        :type app_id: int
+        :rtype: DataSpeedUpPacketGatherMachineVertex
+        """
+        gatherer = DataSpeedUpPacketGatherMachineVertex(
+            0, 0, dict(), "127.0.0.1", report_folder, False)
+        # pylint: disable=protected-access
+        gatherer._placement = Placement(gatherer, 0, 0, GATHERER_CORE)
+        gatherer._app_id = app_id
+        gatherer._remote_tag = 1
+        return gatherer
+
+    @staticmethod
+    def monitor_placement(x, y):
+        """ The placement of the extra monitor of a chip, from which data is\
+            read by the Data Out protocol
+
+        :rtype: ~pacman.model.placements.Placement
+        """
+        return Placement(None, x, y, MONITOR_CORE)
+
+    def read_memory(self, x, y, address, length):
+        """ Read the memory of a chip directly
+
+        :rtype: bytearray
+        """
+        offset = self.__offset(address, length)
+        with self._memory_lock:
+            return bytearray(
+                self.__sdram(x, y)[offset:offset + length])
+
+    def write_memory(self, x, y, address, data):
+        """ Write the memory of a chip directly
+        """
+        offset = self.__offset(address, len(data))
+        with self._memory_lock:
+            self.__sdram(x, y)[offset:offset + len(data)] = data
+
+    def __offset(self, address, length):
+        offset = address - SDRAM_BASE_ADDRESS
+        if offset < 0 or offset + length > self._sdram_per_chip:
+            raise ValueError(
+                "0x{:08x} to 0x{:08x} is not in SDRAM".format(
+                    address, address + length))
+        return offset
+
+    def __sdram(self, x, y):
+        if (x, y) not in self._memory:
+            self._memory[x, y] = bytearray(self._sdram_per_chip)
+        return self._memory[x, y]
+
+    def __enter__(self):
+        self.start()
+        globals_variables.set_failed_state(FailedState())
+        globals_variables.set_simulator(self._transceiver)
+
+        # Connections that gatherers make to their board come here
+        # pylint: disable=protected-access
+        self._real_gatherer_connection = gatherer_module._GathererConnection
+
+        def connect(chip_x, chip_y, remote_host):
+            # pylint: disable=unused-argument
+            return self._real_gatherer_connection(
+                chip_x, chip_y, "127.0.0.1", self.local_port)
+        gatherer_module._GathererConnection = connect
+        return self
+
+    def __exit__(self, _type, _value, _tb):
+        # pylint: disable=protected-access
+        gatherer_module._GathererConnection = self._real_gatherer_connection
+        globals_variables.unset_simulator()
+        self.stop()
+        return False
+
+    def stop(self):
+        """ Stop the machine
+        """
+        self._running = False
+        self.join()
+        self._receiver.close()
+        self._transceiver.close()
+
+    def run(self):
+        self._running = True
+        while self._running:
+            try:
+                if self._receiver.is_ready_to_receive(self.__time_to_wait()):
+                    data, address = self._receiver.receive_with_address()
+                    self.__received(data, address)
+                self.__send_due()
+                self.__check_data_in_timeout()
+            except Exception as e:  # pylint: disable=broad-except
+                if self._running:
+                    traceback.print_exc()
+                    if self._error is None:
+                        self._error = e
+
+    def __time_to_wait(self):
+        now = time.time()
+        wait = _POLL_INTERVAL
+        if self._outgoing:
+            wait = min(wait, self._outgoing[0][0] - now)
+        if self._in_timeout_at is not None:
+            wait = min(wait, self._in_timeout_at - now)
+        return max(wait, 0)
+
+    def __lost(self, carries_data):
+        rate = self._loss_rate if carries_data else self._control_loss_rate
+        return rate > 0 and self._random.random() < rate
+
+    def __send(self, data, carries_data, is_data_out=False):
+        """ Queue a packet to go to the host through the IP tag
+        """
+        if self._tag_address is None or self.__lost(carries_data):
+            return
+        now = time.time()
+        send_at = now
+        if self._bandwidth:
+            send_at = max(now, self._link_free_at)
+            self._link_free_at = send_at + len(data) / float(self._bandwidth)
+        send_at += self._latency
+        if self._reorder_rate and self._random.random() < self._reorder_rate:
+            send_at += self._reorder_delay
+        heapq.heappush(self._outgoing, (
+            send_at, next(self._count), bytes(data), is_data_out))
+
+    def __send_due(self):
+        now = time.time()
+        while self._outgoing and self._outgoing[0][0] <= now:
+            _, _, data, _ = heapq.heappop(self._outgoing)
+            self._receiver.send_to(data, self._tag_address)
+
+    def __clear_data_out(self):
+        """ Stop sending any data out that has not yet gone
+        """
+        self._outgoing = [item for item in self._outgoing if not item[3]]
+        heapq.heapify(self._outgoing)
+        self._link_free_at = 0.0
+
+    def __received(self, data, address):
+        header = SDPHeader.from_bytestring(data, 2)
+        if header.destination_port == 0:
+            self.__scp(header, data, address)
+            return
+        payload = data[_SCP_OFFSET:]
+        command, = _ONE_WORD.unpack_from(payload, 0)
+        if (header.destination_port ==
+                SDP_PORTS.EXTRA_MONITOR_CORE_DATA_SPEED_UP.value):
+            self.__data_out(header, command, payload)
+        elif (header.destination_port ==
+                SDP_PORTS.EXTRA_MONITOR_CORE_DATA_IN_SPEED_UP.value):
+            self.__data_in(command, payload)
+
+    def __scp(self, header, data, address):
+        """ Answer an SCP request with OK; an IP tag set points the tag at\
+            the sender
+        """
+        command, sequence = _SCP_HEADER.unpack_from(data, _SCP_OFFSET)
+        if command == _CMD_IPTAG:
+            self._tag_address = address
+        reply = SDPHeader(
+            flags=SDPFlag.REPLY_NOT_EXPECTED, tag=0, destination_port=0,
+            destination_cpu=0, destination_chip_x=header.source_chip_x,
+            destination_chip_y=header.source_chip_y, source_port=0,
+            source_cpu=0, source_chip_x=header.destination_chip_x,
+            source_chip_y=header.destination_chip_y)
+        self._receiver.send_to(
+            b"\0\0" + reply.bytestring +
+            _SCP_HEADER.pack(SCPResult.RC_OK.value, sequence), address)
+
+    def __data_out(self, header, command, payload):
+        if command == DATA_OUT_COMMANDS.START_SENDING.value:
+            address, length = _TWO_WORDS.unpack_from(payload, WORD_SIZE)
+            self.__start_data_out(
+                header, [self.read_memory(
+                    header.destination_chip_x, header.destination_chip_y,
+                    address, length)])
+        elif command == DATA_OUT_COMMANDS.START_SENDING_RANGES.value:
+            n_ranges, = _ONE_WORD.unpack_from(payload, WORD_SIZE)
+            ranges = struct.unpack_from(
+                "<{}I".format(n_ranges * 2), payload, 2 * WORD_SIZE)
+            self.__start_data_out(header, [
+                self.read_memory(
+                    header.destination_chip_x, header.destination_chip_y,
+                    address, length)
+                for address, length in zip(ranges[::2], ranges[1::2])])
+        elif command == DATA_OUT_COMMANDS.START_MISSING_SEQ.value:
+            if self.__lost(False):
+                return
+            self._out_n_missing_packets, = _ONE_WORD.unpack_from(
+                payload, WORD_SIZE)
+            self._out_n_missing_packets_received = 1
+            self._out_missing = list(struct.unpack_from(
+                "<{}I".format(len(payload) // WORD_SIZE - 2), payload,
+                2 * WORD_SIZE))
+            self.__check_missing_data_out()
+        elif command == DATA_OUT_COMMANDS.MISSING_SEQ.value:
+            if self.__lost(False):
+                return
+            self._out_n_missing_packets_received += 1
+            self._out_missing.extend(struct.unpack_from(
+                "<{}I".format(len(payload) // WORD_SIZE - 1), payload,
+                WORD_SIZE))
+            self.__check_missing_data_out()
+        elif command == DATA_OUT_COMMANDS.CLEAR.value:
+            self.__clear_data_out()
+            self._out_data = None
+
+    def __start_data_out(self, header, blocks):
+        """ Send the data of some ranges of memory, each starting at the\
+            start of a packet, as the extra monitor and gatherer do
+        """
+        self.__clear_data_out()
+        data = bytearray()
+        for i, block in enumerate(blocks):
+            data += block
+            if i + 1 < len(blocks) and len(data) % _DATA_OUT_PACKET_BYTES:
+                data += bytearray(
+                    _DATA_OUT_PACKET_BYTES -
+                    len(data) % _DATA_OUT_PACKET_BYTES)
+        self._out_chip = (header.destination_chip_x, header.destination_chip_y)
+        self._out_data = data
+        self._out_max_seq_num = (
+            (len(data) + _DATA_OUT_PACKET_BYTES - 1) // _DATA_OUT_PACKET_BYTES)
+        for seq_num in range(self._out_max_seq_num):
+            self.__send_data_out_packet(
+                seq_num, seq_num + 1 == self._out_max_seq_num and
+                len(data) % _DATA_OUT_PACKET_BYTES != 0)
+        if not len(data) % _DATA_OUT_PACKET_BYTES:
+            self.__send_data_out_end_flag()
+
+    def __send_data_out_packet(self, seq_num, is_last):
+        start = seq_num * _DATA_OUT_PACKET_BYTES
+        flags = _LAST_MESSAGE_FLAG if is_last else 0
+        self.__send(
+            _ONE_WORD.pack(seq_num | flags) +
+            self._out_data[start:start + _DATA_OUT_PACKET_BYTES],
+            carries_data=True, is_data_out=True)
+
+    def __send_data_out_end_flag(self):
+        self.__send(
+            _ONE_WORD.pack(self._out_max_seq_num | _LAST_MESSAGE_FLAG),
+            carries_data=False, is_data_out=True)
+
+    def __check_missing_data_out(self):
+        """ Send the missing data once all of the packets saying what is\
+            missing have arrived
+        """
+        if (self._out_data is None or self._out_n_missing_packets_received <
+                self._out_n_missing_packets):
+            return
+        for seq_num in self._out_missing:
+            if seq_num < self._out_max_seq_num:
+                self.__send_data_out_packet(seq_num, False)
+        self.__send_data_out_end_flag()
+        self._out_missing = list()
+
+    def __data_in(self, command, payload):
+        if command == DATA_IN_COMMANDS.SEND_DATA_TO_LOCATION.value:
+            if self.__lost(True):
+                return
+            _, self._in_address, chip, self._in_max_seq_num = \
+                struct.unpack_from("<4I", payload, 0)
+            self._in_chip = (chip >> 16, chip & 0xFFFF)
+            self._in_received = numpy.zeros(
+                self._in_max_seq_num + 1, dtype=bool)
+            self.__write_data_in(
+                self._in_address, payload,
+                BYTES_FOR_COMMAND_AND_ADDRESS_HEADER)
+            self._in_timeout_at = time.time() + _DATA_IN_TIMEOUT
+        elif command == DATA_IN_COMMANDS.SEND_SEQ_DATA.value:
+            if self.__lost(True) or self._in_received is None:
+                return
+            seq_num, = _ONE_WORD.unpack_from(payload, WORD_SIZE)
+            if seq_num < 1 or seq_num > self._in_max_seq_num:
+                return
+            self._in_received[seq_num] = True
+            self.__write_data_in(
+                self._in_address + BYTES_IN_FULL_PACKET_WITH_ADDRESS +
+                BYTES_IN_FULL_PACKET_WITHOUT_ADDRESS * (seq_num - 1),
+                payload, BYTES_FOR_COMMAND_AND_SEQ_HEADER)
+            self._in_timeout_at = time.time() + _DATA_IN_TIMEOUT
+        elif command == DATA_IN_COMMANDS.SEND_DONE.value:
+            if self.__lost(False):
+                return
+            self._in_timeout_at = None
+            self.__report_data_in()
+
+    def __write_data_in(self, address, payload, offset):
+        """ Write the whole words of data in a packet, as the gatherer does
+        """
+        n_bytes = (len(payload) - offset) // WORD_SIZE * WORD_SIZE
+        self.write_memory(
+            self._in_chip[0], self._in_chip[1], address,
+            payload[offset:offset + n_bytes])
+
+    def __check_data_in_timeout(self):
+        if (self._in_timeout_at is not None and
+                time.time() >= self._in_timeout_at):
+            self._in_timeout_at = None
+            self.__report_data_in()
+
+    def __report_data_in(self):
+        """ Say that a data in transfer is finished, or what is missing from\
+            it. Once finished, nothing more is said, as with the real\
+            gatherer.
+        """
+        if self._in_received is None:
+            return
+        missing = numpy.flatnonzero(
+            ~self._in_received[1:]).astype("<u4") + 1
+        if not len(missing):
+            self._in_received = None
+            self.__send(
+                _ONE_WORD.pack(DATA_IN_COMMANDS.RECEIVE_FINISHED.value),
+                carries_data=False)
+            return
+        n_more = max(0, (
+            len(missing) - _FIRST_MISSING_ITEMS + _MORE_MISSING_ITEMS - 1) //
+            _MORE_MISSING_ITEMS)
+        self.__send(_TWO_WORDS.pack(
+            DATA_IN_COMMANDS.RECEIVE_FIRST_MISSING_SEQ.value, n_more) +
+            missing[:_FIRST_MISSING_ITEMS].tobytes(), carries_data=False)
+        for start in range(
+                _FIRST_MISSING_ITEMS, len(missing), _MORE_MISSING_ITEMS):
+            self.__send(_ONE_WORD.pack(
+                DATA_IN_COMMANDS.RECEIVE_MISSING_SEQ_DATA.value) +
+                missing[start:start + _MORE_MISSING_ITEMS].tobytes(),
+                carries_data=False)
+
+
+class _LoopbackTransceiver(object):
+    """ The parts of a transceiver used by the gatherer, talking to a\
+        loopback machine. It also stands in for the simulator, of which only\
+        the transceiver is used.
+    """
+
+    __slots__ = ["_board", "_connection"]
+
+    def __init__(self, board):
+        self._board = board
+        self._connection = None
+
+    @property
+    def transceiver(self):
+        return self
+
+    def send_sdp_message(self, message, connection=None):
+        # pylint: disable=unused-argument
+        if self._connection is None:
+            self._connection = SCAMPConnection(
+                0, 0, remote_host="127.0.0.1",
+                remote_port=self._board.local_port)
+        self._connection.send_sdp_message(message)
+
+    def read_memory(self, x, y, base_address, length, cpu=0):
+        # pylint: disable=too-many-arguments, unused-argument
+        return self._board.read_memory(x, y, base_address, length)
+
+    def write_memory(
+            self, x, y, base_address, data, n_bytes=None, offset=0, cpu=0,
+            is_filename=False):
+        # pylint: disable=too-many-arguments, unused-argument
+        if n_bytes is None:
+            n_bytes = len(data) - offset
+        self._board.write_memory(
+            x, y, base_address, data[offset:offset + n_bytes])
+
+    def get_machine_details(self):
+        return self._board.machine
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
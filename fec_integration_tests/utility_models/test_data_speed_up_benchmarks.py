@@ -0,0 +1,164 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+""" Benchmarks of the Data In and Data Out protocols against a loopback\
+    machine, reporting the speed and number of rounds of retransmission of\
+    each transfer across sizes and loss rates.
+
+Run as a script to run the full set and print a table; set the environment\
+variable FEC_BENCHMARK_REPORT to the name of a file to also append the\
+results to it, one JSON object per line.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import numpy
+from spinn_front_end_common.utility_models import (
+    DataSpeedUpPacketGatherMachineVertex)
+from fec_integration_tests.loopback_machine import (
+    LoopbackMachine, SDRAM_BASE_ADDRESS)
+
+#: The environment variable naming a file to append results to
+REPORT_VARIABLE = "FEC_BENCHMARK_REPORT"
+
+#: The sizes and loss rates run as part of the tests
+QUICK_SIZES = (4 * 1024, 256 * 1024)
+QUICK_LOSS_RATES = (0.0, 0.01)
+
+#: The sizes and loss rates run as a script
+FULL_SIZES = (1024, 16 * 1024, 256 * 1024, 1024 * 1024, 8 * 1024 * 1024)
+FULL_LOSS_RATES = (0.0, 0.001, 0.01, 0.05)
+
+# How long the gatherer waits for the loopback machine before asking again;
+# much shorter than for a real machine, as it is close by
+_TIMEOUT_IN_SECONDS = 0.1
+
+# The chip written to and read from; not the one the gatherer is on, so that
+# the transfers cross the board
+_CHIP = (1, 1)
+
+
+def run_benchmarks(sizes, loss_rates, seed=1, **loopback_args):
+    """ Write blocks of data to a loopback machine by Data In and read them\
+        back by Data Out, checking that they are unchanged.
+
+    :param sizes: the sizes of block to move, in bytes
+    :type sizes: iterable(int)
+    :param loss_rates: the chances of losing a packet carrying data
+    :type loss_rates: iterable(float)
+    :param seed: the seed for the data and the packets lost
+    :type seed: int
+    :param loopback_args: other arguments for the LoopbackMachine
+    :return: the measurements of each transfer, as dicts
+    :rtype: list(dict)
+    :raises AssertionError: if the data read is not what was written
+    """
+    cls = DataSpeedUpPacketGatherMachineVertex
+    timeout = cls.TIMEOUT_PER_RECEIVE_IN_SECONDS
+    cls.TIMEOUT_PER_RECEIVE_IN_SECONDS = _TIMEOUT_IN_SECONDS
+    folder = tempfile.mkdtemp()
+    results = list()
+    try:
+        for loss_rate in loss_rates:
+            with LoopbackMachine(
+                    loss_rate=loss_rate, seed=seed,
+                    sdram_per_chip=max(sizes), **loopback_args) as board:
+                gatherer = board.make_gatherer(folder)
+                # Always use the protocols being measured
+                gatherer.set_thresholds(0, 0)
+                try:
+                    for size in sizes:
+                        _move(board, gatherer, size, seed)
+                finally:
+                    gatherer.close_connection()
+                if board.error is not None:
+                    raise board.error
+            for transfer in gatherer.transfer_metrics.transfers:
+                result = dict(transfer)
+                result["loss_rate"] = loss_rate
+                results.append(result)
+    finally:
+        cls.TIMEOUT_PER_RECEIVE_IN_SECONDS = timeout
+        shutil.rmtree(folder)
+    return results
+
+
+def _move(board, gatherer, size, seed):
+    x, y = _CHIP
+    data = bytearray(numpy.random.RandomState(seed + size).bytes(size))
+    gatherer.send_data_into_spinnaker(x, y, SDRAM_BASE_ADDRESS, data)
+    if board.read_memory(x, y, SDRAM_BASE_ADDRESS, size) != data:
+        raise AssertionError(
+            "data in of {} bytes was corrupted".format(size))
+    read = gatherer.get_data(
+        board.monitor_placement(x, y), SDRAM_BASE_ADDRESS, size, None)
+    if read != data:
+        raise AssertionError(
+            "data out of {} bytes was corrupted".format(size))
+
+
+def report(results, output=sys.stdout):
+    """ Print a table of the measurements of some transfers, and append\
+        them to the file named by FEC_BENCHMARK_REPORT, if set.
+
+    :param results: the measurements, as from run_benchmarks
+    :type results: list(dict)
+    :param output: where to print the table
+    """
+    output.write("{:>8} {:>6} {:>10} {:>10} {:>8} {:>8}\n".format(
+        "path", "loss", "bytes", "MB/s", "rounds", "timeouts"))
+    for result in results:
+        output.write("{:>8} {:>6.3f} {:>10} {:>10.2f} {:>8} {:>8}\n".format(
+            result["path"], result["loss_rate"], result["bytes"],
+            result["mbs"] or 0.0, result["retransmit_rounds"],
+            result["timeouts"]))
+    report_file = os.environ.get(REPORT_VARIABLE)
+    if report_file:
+        with open(report_file, "a") as f:
+            for result in results:
+                f.write(json.dumps(result))
+                f.write("\n")
+
+
+class TestDataSpeedUpBenchmarks(unittest.TestCase):
+
+    def test_quick_benchmarks(self):
+        results = run_benchmarks(QUICK_SIZES, QUICK_LOSS_RATES)
+        report(results)
+        self.assertEqual(
+            len(results), 2 * len(QUICK_SIZES) * len(QUICK_LOSS_RATES))
+        self.assertEqual(
+            {result["path"] for result in results}, {"data_in", "data_out"})
+        for result in results:
+            if result["loss_rate"] == 0.0:
+                self.assertEqual(result["timeouts"], 0)
+
+    def test_small_data_in(self):
+        # Smaller than the first packet of data in
+        results = run_benchmarks((64, 256), (0.0, ))
+        self.assertEqual(len(results), 4)
+
+    def test_reordering_and_latency(self):
+        results = run_benchmarks(
+            (64 * 1024, ), (0.01, ), reorder_rate=0.05, latency=0.001)
+        self.assertEqual(len(results), 2)
+
+
+if __name__ == "__main__":
+    report(run_benchmarks(FULL_SIZES, FULL_LOSS_RATES))
@@ -13,9 +13,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from .abstract_caches_data_specification import (
+    AbstractCachesDataSpecification)
 from .abstract_changable_after_run import AbstractChangableAfterRun
 from .abstract_generates_data_specification import (
     AbstractGeneratesDataSpecification)
+from .abstract_generates_data_specification_in_worker import (
+    AbstractGeneratesDataSpecificationInWorker)
 from .abstract_has_associated_binary import AbstractHasAssociatedBinary
 from .abstract_machine_allocation_controller import (
     AbstractMachineAllocationController)
@@ -39,7 +43,9 @@ from .abstract_supports_database_injection import (
 from .abstract_uses_memory_io import AbstractUsesMemoryIO
 from .abstract_can_reset import AbstractCanReset
 
-__all__ = ["AbstractChangableAfterRun", "AbstractGeneratesDataSpecification",
+__all__ = ["AbstractCachesDataSpecification",
+           "AbstractChangableAfterRun", "AbstractGeneratesDataSpecification",
+           "AbstractGeneratesDataSpecificationInWorker",
            "AbstractHasAssociatedBinary",
            "AbstractMachineAllocationController",
            "AbstractProvidesIncomingPartitionConstraints",
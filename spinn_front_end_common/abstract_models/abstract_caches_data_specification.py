@@ -0,0 +1,39 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from six import add_metaclass
+from spinn_utilities.abstract_base import AbstractBase, abstractmethod
+
+
+@add_metaclass(AbstractBase)
+class AbstractCachesDataSpecification(object):
+    """ Indicates an object that generates a data specification that can be\
+        kept and reused in later runs, as long as what it is generated from\
+        has not changed
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def get_data_specification_cache_key(self, placement):
+        """ Get something that identifies everything that the data\
+            specification of a placement is generated from, other than the\
+            placement itself; data specifications generated when this gives\
+            equal keys must be identical. When a kept data specification is\
+            reused, generate_data_specification is not called.
+
+        :param placement: where the vertex is placed
+        :return: the key, or None if the data specification must be generated
+        :rtype: str or bytes or None
+        """
@@ -0,0 +1,32 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from six import add_metaclass
+from spinn_utilities.abstract_base import AbstractBase
+from .abstract_generates_data_specification import (
+    AbstractGeneratesDataSpecification)
+
+
+@add_metaclass(AbstractBase)
+class AbstractGeneratesDataSpecificationInWorker(
+        AbstractGeneratesDataSpecification):
+    """ Indicates an object that generates its data specification without\
+        changing any of its own state, or anything else in this process, so\
+        that it can be generated in a forked worker process whose changes\
+        are lost. Only objects that declare this are generated in worker\
+        processes.
+    """
+
+    __slots__ = ()
@@ -62,7 +62,7 @@ from spinn_front_end_common.utilities.exceptions import ConfigurationException
 from spinn_front_end_common.utilities.function_list import (
     get_front_end_common_pacman_xml_paths)
 from spinn_front_end_common.utilities.helpful_functions import (
-    convert_time_diff_to_total_milliseconds,
+    clear_region_address_cache, convert_time_diff_to_total_milliseconds,
     sort_out_downed_chips_cores_links)
 from spinn_front_end_common.utilities.report_functions import EnergyReport
 from spinn_front_end_common.utilities.utility_objs import (
@@ -71,6 +71,8 @@ from spinn_front_end_common.utility_models import (
     CommandSender, CommandSenderMachineVertex,
     DataSpeedUpPacketGatherMachineVertex)
 from spinn_front_end_common.interface.java_caller import JavaCaller
+from spinn_front_end_common.interface.ds.data_specification_cache import (
+    CACHE_FILE_NAME, DataSpecificationCache)
 from spinn_front_end_common.interface.config_handler import ConfigHandler
 from spinn_front_end_common.interface.provenance import (
     PacmanProvenanceExtractor)
@@ -1124,6 +1126,16 @@ class AbstractSpinnakerBase(ConfigHandler, SimulatorInterface):
         inputs["DisableAdvancedMonitorUsageForDataIn"] = \
             self._config.getboolean(
                 "Machine", "disable_advanced_monitor_usage_for_data_in")
+        inputs["CalibrateDataTransferThresholds"] = self._config.getboolean(
+            "Machine", "calibrate_data_transfer_thresholds")
+        inputs["DataTransferThresholdsFile"] = self._config.get_str(
+            "Machine", "data_transfer_thresholds_file")
+        inputs["MaxParallelBoardLoads"] = self._config.getint(
+            "Machine", "max_parallel_board_loads")
+        inputs["VerifyDataInChecksums"] = self._config.getboolean(
+            "Machine", "verify_data_in_checksums")
+        inputs["DataSpecExecutionQueueDepth"] = self._config.getint(
+            "Machine", "data_spec_execution_queue_depth")
 
         if (self._config.getboolean("Buffers", "use_auto_pause_and_resume")):
             inputs["PlanNTimeSteps"] = self._minimum_auto_time_steps
@@ -1602,6 +1614,14 @@ class AbstractSpinnakerBase(ConfigHandler, SimulatorInterface):
                         self._json_folder, java_call, java_spinnaker_path,
                         java_properties)
             inputs["JavaCaller"] = self._java_caller
+            inputs["MaxParallelBoardExtractions"] = self._config.getint(
+                "Buffers", "max_parallel_board_extractions")
+            inputs["MaxSCPReadsInFlightPerBoard"] = self._config.getint(
+                "Buffers", "max_scp_reads_in_flight_per_board")
+            inputs["LazyBufferExtraction"] = self._config.getboolean(
+                "Buffers", "extract_recordings_lazily")
+            inputs["MaxBytesWaitingToBeStored"] = self._config.getint(
+                "Buffers", "max_bytes_waiting_to_be_stored")
 
         # Execute the mapping algorithms
         executor = self._run_algorithms(
@@ -1644,6 +1664,24 @@ class AbstractSpinnakerBase(ConfigHandler, SimulatorInterface):
         inputs["FirstMachineTimeStep"] = self._current_run_timesteps
         inputs["RunTimeMachineTimeSteps"] = n_machine_time_steps
         inputs["DataNTimeSteps"] = self._max_run_time_steps
+        inputs["NDataSpecificationProcesses"] = self._config.getint(
+            "Mapping", "n_data_specification_processes")
+        inputs["DataSpecificationCacheFile"] = None
+        if self._config.getboolean("Mapping", "cache_data_specifications"):
+            cache_file = self._config.get_str(
+                "Mapping", "data_specification_cache_file")
+            if cache_file is None:
+                cache_file = os.path.join(
+                    self._report_simulation_top_directory, CACHE_FILE_NAME)
+            max_bytes = self._read_config_int(
+                "Mapping", "data_specification_cache_max_bytes")
+            if max_bytes is not None:
+                cache = DataSpecificationCache(cache_file)
+                try:
+                    cache.prune(max_bytes)
+                finally:
+                    cache.close()
+            inputs["DataSpecificationCacheFile"] = cache_file
 
         # Run the data generation algorithms
         outputs = []
@@ -1911,6 +1949,13 @@ class AbstractSpinnakerBase(ConfigHandler, SimulatorInterface):
         if self._config.getboolean("Reports", "write_provenance_data"):
             algorithms.append("GraphProvenanceGatherer")
 
+        # write out the transfers measured during loading and extraction
+        if (self._config.getboolean("Reports", "reports_enabled") and
+                self._config.getboolean(
+                    "Reports", "write_transfer_metrics_report") and
+                not self._use_virtual_board):
+            algorithms.append("TransferMetricsReport")
+
         # add any extra post algorithms as needed
         if self._extra_post_run_algorithms is not None:
             algorithms += self._extra_post_run_algorithms
@@ -2423,6 +2468,7 @@ class AbstractSpinnakerBase(ConfigHandler, SimulatorInterface):
 
             self._txrx.close(power_off_machine=turn_off_machine)
             self._txrx = None
+        clear_region_address_cache()
 
     def __close_allocation_controller(self):
         if self._machine_allocation_controller is not None:
@@ -2493,6 +2539,14 @@ class AbstractSpinnakerBase(ConfigHandler, SimulatorInterface):
         if self._config.getboolean("Reports", "extract_iobuf"):
             self._extract_iobufs()
 
+        # get any recorded data not yet extracted, as it is lost when the
+        # machine is released
+        if self._buffer_manager is not None and not self._use_virtual_board:
+            try:
+                self._buffer_manager.extract_pending_data()
+            except Exception:
+                logger.exception("Error when extracting recorded data")
+
         # shut down the machine properly
         self._shutdown(turn_off_machine, clear_routing_tables, clear_tags)
 
@@ -15,10 +15,14 @@
 
 import logging
 import threading
+import time
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
+from six import itervalues
 from six.moves import xrange
 from spinn_utilities.log import FormatAdapter
 from spinn_utilities.ordered_set import OrderedSet
+from spinn_utilities.overrides import overrides
 from spinn_utilities.progress_bar import ProgressBar
 from spinnman.constants import UDP_MESSAGE_MAX_SIZE
 from spinnman.connections.udp_packet_connections import EIEIOConnection
@@ -36,14 +40,24 @@ from spinn_front_end_common.utilities.exceptions import (
     BufferableRegionTooSmall, ConfigurationException, SpinnFrontEndException)
 from spinn_front_end_common.utilities.helpful_functions import (
     locate_memory_region_for_placement, locate_extra_monitor_mc_receiver)
+from spinn_front_end_common.utilities.utility_objs import (
+    ProvenanceDataItem, TransferMetrics)
+from spinn_front_end_common.utilities.scp import ReadMemoriesProcess
+from spinn_front_end_common.utilities.scp.read_memories_process import (
+    DEFAULT_CHANNELS_PER_BOARD)
+from spinn_front_end_common.interface.provenance import (
+    AbstractProvidesLocalProvenanceData)
 from spinn_front_end_common.interface.buffer_management.storage_objects \
     import (
         BuffersSentDeque, BufferedReceivingData, ChannelBufferState)
+from spinn_front_end_common.interface.buffer_management.storage_objects.\
+    write_behind_queue import DEFAULT_MAX_QUEUED_BYTES
 from spinn_front_end_common.interface.buffer_management.buffer_models \
     import (
         AbstractReceiveBuffersToHost)
 from .recording_utilities import (
-    TRAFFIC_IDENTIFIER, get_last_sequence_number, get_region_pointer)
+    TRAFFIC_IDENTIFIER, decode_recording_header,
+    get_recording_header_read_size)
 
 logger = FormatAdapter(logging.getLogger(__name__))
 
@@ -57,7 +71,7 @@ _N_BYTES_PER_KEY = EIEIOType.KEY_32_BIT.key_bytes  # @UndefinedVariable
 _SDP_MAX_PACKAGE_SIZE = 272
 
 
-class BufferManager(object):
+class BufferManager(AbstractProvidesLocalProvenanceData):
     """ Manager of send buffers.
     """
 
@@ -117,13 +131,36 @@ class BufferManager(object):
         "_uses_advanced_monitors",
 
         # Support class to help call Java
-        "_java_caller"
+        "_java_caller",
+
+        # The most boards to extract recorded data from at the same time
+        "_max_parallel_extractions",
+
+        # The most SCP reads of recorded data in flight on each board
+        "_max_scp_reads_per_board",
+
+        # True if recorded data is only retrieved when needed
+        "_lazy_extraction",
+
+        # (vertex, region) -> priority of retrieving it when lazy
+        "_extraction_priorities",
+
+        # (x, y, p, region) -> (placement, region) of recorded data not yet
+        # retrieved when lazy
+        "_pending_regions",
+
+        # measurements of the transfers of recorded data
+        "_transfer_metrics"
     ]
 
     def __init__(self, placements, tags, transceiver, extra_monitor_cores,
                  packet_gather_cores_to_ethernet_connection_map,
                  extra_monitor_to_chip_mapping, machine, fixed_routes,
-                 uses_advanced_monitors, report_folder, java_caller=None):
+                 uses_advanced_monitors, report_folder, java_caller=None,
+                 max_parallel_extractions=1,
+                 max_scp_reads_per_board=DEFAULT_CHANNELS_PER_BOARD,
+                 lazy_extraction=False,
+                 max_bytes_waiting_to_store=DEFAULT_MAX_QUEUED_BYTES):
         """
         :param placements: The placements of the vertices
         :type placements:\
@@ -141,6 +178,22 @@ class BufferManager(object):
         :param java_caller: Support class to call Java or None to use python
         :type java_caller:\
             :py:class:`~spinn_front_end_common.interface.java_caller.JavaCaller`
+        :param max_parallel_extractions: \
+            The most boards to extract recorded data from at the same time\
+            when using advanced monitors; 1 extracts one core at a time
+        :type max_parallel_extractions: int
+        :param max_scp_reads_per_board: \
+            The most SCP reads of recorded data in flight on each board when\
+            not using advanced monitors
+        :type max_scp_reads_per_board: int
+        :param lazy_extraction: \
+            Whether to only retrieve recorded data when it is asked for,\
+            given an extraction priority, or before the next run
+        :type lazy_extraction: bool
+        :param max_bytes_waiting_to_store: \
+            The most bytes of retrieved data that may wait to be stored\
+            before retrieving more waits
+        :type max_bytes_waiting_to_store: int
         """
         # pylint: disable=too-many-arguments
         self._placements = placements
@@ -164,7 +217,8 @@ class BufferManager(object):
         self._sent_messages = dict()
 
         # storage area for received data from cores
-        self._received_data = BufferedReceivingData(report_folder)
+        self._received_data = BufferedReceivingData(
+            report_folder, max_bytes_waiting_to_store)
 
         # Lock to avoid multiple messages being processed at the same time
         self._thread_lock_buffer_out = threading.RLock()
@@ -174,6 +228,12 @@ class BufferManager(object):
         self._finished = False
         self._listener_port = None
         self._java_caller = java_caller
+        self._max_parallel_extractions = max(1, max_parallel_extractions)
+        self._max_scp_reads_per_board = max(1, max_scp_reads_per_board)
+        self._lazy_extraction = lazy_extraction
+        self._extraction_priorities = dict()
+        self._pending_regions = OrderedDict()
+        self._transfer_metrics = TransferMetrics("BufferManager")
         if self._java_caller is not None:
             self._java_caller.set_machine(machine)
             self._java_caller.set_report_folder(report_folder)
@@ -214,6 +274,38 @@ class BufferManager(object):
             self._placements.get_placement_of_vertex(sender),
             address, length, self._fixed_routes)
 
+    def _request_data_multi(self, transceiver, placement_x, placement_y,
+                            reads):
+        """ Uses the extra monitor cores for data extraction of several\
+            blocks of memory of a chip, all in one transfer.
+
+        :param transceiver: the spinnman interface
+        :type transceiver: :py:class:`spinnman.transceiver.Transceiver`
+        :param placement_x: \
+            the placement x coord where data is to be extracted from
+        :type placement_x: int
+        :param placement_y: \
+            the placement y coord where data is to be extracted from
+        :type placement_y: int
+        :param reads: the (address, length) of each block to read
+        :type reads: list(tuple(int, int))
+        :return: the data of each block, in order
+        :rtype: list(bytearray)
+        """
+        if not self._uses_advanced_monitors:
+            return [
+                transceiver.read_memory(
+                    placement_x, placement_y, address, length)
+                for address, length in reads]
+
+        sender = self._extra_monitor_cores_by_chip[placement_x, placement_y]
+        receiver = locate_extra_monitor_mc_receiver(
+            self._machine, placement_x, placement_y,
+            self._packet_gather_cores_to_ethernet_connection_map)
+        return receiver.get_data_multi(
+            self._placements.get_placement_of_vertex(sender), reads,
+            self._fixed_routes)
+
     def _receive_buffer_command_message(self, packet):
         """ Handle an EIEIO command message for the buffers.
 
@@ -349,6 +441,7 @@ class BufferManager(object):
             data files.
         """
         self._received_data.reset()
+        self._pending_regions.clear()
 
         # rewind buffered in
         for vertex in self._sender_vertices:
@@ -361,6 +454,9 @@ class BufferManager(object):
         """ Resets any data structures needed before starting running again.
         """
 
+        # the machine is about to overwrite anything not yet extracted
+        self.extract_pending_data()
+
         # update the received data items
         self._received_data.resume()
         self._finished = False
@@ -377,17 +473,78 @@ class BufferManager(object):
         :param recording_region_id: the recording region ID
         :type recording_region_id: int
         """
+        self._pending_regions.pop((x, y, p, recording_region_id), None)
         self._received_data.clear(x, y, p, recording_region_id)
 
-    def _generate_end_buffering_state_from_machine(
-            self, placement, state_region_base_address):
+    def _read_recording_metadata(self, placements):
+        """ Read the last sequence number and the end state of each region\
+            of the recordings of cores, where these are not already known;\
+            must be locked first. The reads for all the cores are in flight\
+            together, and the header of each core is read in one go.
+
+        :param placements: the placements to get the metadata of
+        :type placements: \
+            iterable(:py:class:`~pacman.model.placements.Placement`)
+        """
+        received = self._received_data
+
+        # The header of a core holds the sequence number and a pointer to
+        # the state of each channel; the states are separate allocations
+        cores = list()
+        header_reads = list()
+        for placement in placements:
+            x, y, p = placement.x, placement.y, placement.p
+            region_ids = placement.vertex.get_recorded_region_ids()
+            regions = [
+                region for region in region_ids
+                if not received.is_data_from_region_flushed(x, y, p, region)
+                and not received.is_end_buffering_state_recovered(
+                    x, y, p, region)]
+            if not regions and (
+                    not region_ids or
+                    received.is_end_buffering_sequence_number_stored(
+                        x, y, p)):
+                continue
+            n_regions = max(region_ids) + 1
+            header_reads.append((
+                x, y, placement.vertex.get_recording_region_base_address(
+                    self._transceiver, placement),
+                get_recording_header_read_size(n_regions), len(cores)))
+            cores.append((placement, regions, n_regions))
+        if not header_reads:
+            return
+
+        state_reads = list()
 
-        # retrieve channel state memory area
-        channel_state_data = self._request_data(
-            transceiver=self._transceiver, placement_x=placement.x,
-            address=state_region_base_address, placement_y=placement.y,
-            length=ChannelBufferState.size_of_channel_state())
-        return ChannelBufferState.create_from_bytearray(channel_state_data)
+        def header_read(index, data):
+            placement, regions, n_regions = cores[index]
+            last_sequence_number, pointers = decode_recording_header(
+                data, n_regions)
+            if not received.is_end_buffering_sequence_number_stored(
+                    placement.x, placement.y, placement.p):
+                received.store_end_buffering_sequence_number(
+                    placement.x, placement.y, placement.p,
+                    last_sequence_number)
+            state_reads.extend(
+                (placement.x, placement.y, pointers[region],
+                 ChannelBufferState.size_of_channel_state(),
+                 (placement, region))
+                for region in regions)
+
+        def state_read(key, data):
+            placement, region = key
+            received.store_end_buffering_state(
+                placement.x, placement.y, placement.p, region,
+                ChannelBufferState.create_from_bytearray(data))
+
+        ReadMemoriesProcess(
+            self._transceiver.scamp_connection_selector,
+            self._max_scp_reads_per_board).read_memories(
+                header_reads, header_read)
+        ReadMemoriesProcess(
+            self._transceiver.scamp_connection_selector,
+            self._max_scp_reads_per_board).read_memories(
+                state_reads, state_read)
 
     def _create_message_to_send(self, size, vertex, region):
         """ Creates a single message to send with the given boundaries.
@@ -582,6 +739,18 @@ class BufferManager(object):
                 self._finished = True
 
     def get_data_for_placements(self, placements, progress=None):
+        """ Retrieve the data recorded by the given placements during the\
+            last run. When extracting lazily, only the state of the\
+            recordings is retrieved, along with any regions given an\
+            extraction priority; the rest are retrieved when first asked\
+            for or before the next run.
+
+        :param placements: the placements to get the data of
+        :type placements: \
+            iterable(:py:class:`~pacman.model.placements.Placement`)
+        :param progress: a progress bar to update once for each region
+        :type progress: :py:class:`~spinn_utilities.progress_bar.ProgressBar`
+        """
         if self._java_caller is not None:
             self._java_caller.set_placements(placements, self._transceiver)
 
@@ -590,36 +759,207 @@ class BufferManager(object):
                 self._java_caller.get_all_data()
                 if progress:
                     progress.end()
-            elif self._uses_advanced_monitors:
-                self.__old_get_data_for_placements_with_monitors(
-                    placements, progress)
+                return
+
+            # Get the state of all the recordings before reading any data
+            self._read_recording_metadata(placements)
+            regions = [
+                (placement, recording_region_id)
+                for placement in placements
+                for recording_region_id in
+                placement.vertex.get_recorded_region_ids()]
+            if self._lazy_extraction:
+                regions = self.__defer_regions(regions, progress)
+            self.__get_data_for_regions(regions, progress)
+
+    def set_extraction_priority(self, vertex, recording_region_id, priority):
+        """ Set how soon a recorded region is retrieved after a run when\
+            extracting lazily. Regions with a priority are retrieved as soon\
+            as the run ends, highest priority first; other regions are only\
+            retrieved when first asked for or before the next run.
+
+        :param vertex: the vertex that records the region
+        :type vertex: AbstractReceiveBuffersToHost
+        :param recording_region_id: the recording region
+        :type recording_region_id: int
+        :param priority: the priority of the region, or None for none
+        :type priority: int or None
+        """
+        if priority is None:
+            self._extraction_priorities.pop(
+                (vertex, recording_region_id), None)
+        else:
+            self._extraction_priorities[vertex, recording_region_id] = \
+                priority
+
+    def extract_pending_data(self):
+        """ Retrieve any recorded data that lazy extraction has not yet\
+            retrieved. This must happen before the machine runs again or is\
+            released, as the data is only held on the machine.
+        """
+        with self._thread_lock_buffer_out:
+            if not self._pending_regions:
+                return
+            regions = list(itervalues(self._pending_regions))
+            progress = ProgressBar(
+                len(regions), "Extracting deferred recorded data")
+            try:
+                self.__get_data_for_regions(regions, progress)
+            finally:
+                progress.end()
+
+    def __defer_regions(self, regions, progress):
+        """ Note regions to be retrieved later, and pick out those to be\
+            retrieved now in priority order.
+        """
+        prioritised = list()
+        for placement, recording_region_id in regions:
+            priority = self._extraction_priorities.get(
+                (placement.vertex, recording_region_id))
+            if priority is not None:
+                prioritised.append((priority, placement, recording_region_id))
             else:
-                self.__old_get_data_for_placements(placements, progress)
+                self._pending_regions[
+                    placement.x, placement.y, placement.p,
+                    recording_region_id] = (placement, recording_region_id)
+                if progress is not None:
+                    progress.update()
+        prioritised.sort(key=lambda item: -item[0])
+        return [(placement, recording_region_id)
+                for _, placement, recording_region_id in prioritised]
 
-    def __old_get_data_for_placements_with_monitors(
-            self, placements, progress):
+    def __get_data_for_regions(self, regions, progress):
+        """ Retrieve the data for (placement, region) pairs; must be locked\
+            first.
+        """
+        for placement, recording_region_id in regions:
+            self._pending_regions.pop(
+                (placement.x, placement.y, placement.p, recording_region_id),
+                None)
+        if not regions:
+            return
+        if self._uses_advanced_monitors:
+            self.__old_get_data_for_regions_with_monitors(regions, progress)
+        else:
+            self.__get_data_for_regions_by_scp(regions, progress)
+
+        # Wait for the last of the data to be stored
+        self._received_data.flush()
+
+    def __get_data_for_regions_by_scp(self, regions, progress):
+        """ Get the data using SCP, with the reads for all the regions in\
+            flight together rather than one after another.
+        """
+        reads, store_block = self.__prepare_block_reads(
+            regions, progress, "scp",
+            lambda placement, address, length, key: (
+                placement.x, placement.y, address, length, key))
+        process = ReadMemoriesProcess(
+            self._transceiver.scamp_connection_selector,
+            self._max_scp_reads_per_board)
+        process.read_memories(reads, store_block)
+
+    def __prepare_block_reads(self, regions, progress, path, make_read):
+        """ Work out the blocks of memory to read to get the data of some\
+            regions, and how to store each region as soon as all its blocks\
+            are in.
+
+        :param regions: the (placement, region) pairs to get the data of
+        :param progress: the progress bar to update, or None
+        :param path: how the data is read, for the transfer metrics
+        :param make_read: \
+            Called with (placement, address, length, key) to make the\
+            description of a read of a block for the reader
+        :return: the reads, and the callback to call with (key, data) as\
+            each block is read
+        """
+        # Work out what to read
+        to_read = list()
+        reads = list()
+        for placement, recording_region_id in regions:
+            region_reads = self._get_reads_for_region(
+                placement, recording_region_id)
+            if not region_reads:
+                if region_reads is not None:
+                    self._store_region_reads(
+                        placement, recording_region_id, [])
+                if progress is not None:
+                    progress.update()
+                continue
+            reads.extend(
+                make_read(placement, address, length, (len(to_read), index))
+                for index, (address, length) in enumerate(region_reads))
+            to_read.append((
+                placement, recording_region_id, [None] * len(region_reads)))
+
+        # Store each region as soon as all its blocks are in
+        n_missing = [len(pieces) for _, _, pieces in to_read]
+        start = time.time()
+
+        def store_block(key, data):
+            region_index, index = key
+            placement, recording_region_id, pieces = to_read[region_index]
+            pieces[index] = data
+            n_missing[region_index] -= 1
+            if not n_missing[region_index]:
+                self.__store_and_record(
+                    path, placement, recording_region_id, pieces, start)
+                to_read[region_index] = None
+                if progress is not None:
+                    progress.update()
+
+        return reads, store_block
+
+    def __old_get_data_for_regions_with_monitors(self, regions, progress):
         # locate receivers
         receivers = list(OrderedSet(
             locate_extra_monitor_mc_receiver(
                 self._machine, placement.x, placement.y,
                 self._packet_gather_cores_to_ethernet_connection_map)
-            for placement in placements))
+            for placement, _ in regions))
 
         # Ugly, to avoid an import loop...
         with receivers[0].streaming(
                 receivers, self._transceiver, self._extra_monitor_cores,
                 self._placements):
             # get data
-            self.__old_get_data_for_placements(placements, progress)
+            if self._max_parallel_extractions > 1 and len(receivers) > 1:
+                self.__get_data_for_regions_by_board(
+                    regions, progress, receivers[0])
+            else:
+                self.__old_get_data_for_regions(regions, progress)
 
-    def __old_get_data_for_placements(self, placements, progress):
-        # get data
-        for placement in placements:
-            vertex = placement.vertex
-            for recording_region_id in vertex.get_recorded_region_ids():
-                self._retreive_by_placement(placement, recording_region_id)
-                if progress is not None:
-                    progress.update()
+    def __get_data_for_regions_by_board(
+            self, regions, progress, receiver):
+        """ Get the data using the gatherers of several boards at once, all\
+            from this thread; each gatherer can only do one transfer at a\
+            time, but the boards are independent.
+        """
+        def make_read(placement, address, length, key):
+            sender = self._extra_monitor_cores_by_chip[
+                placement.x, placement.y]
+            return (
+                locate_extra_monitor_mc_receiver(
+                    self._machine, placement.x, placement.y,
+                    self._packet_gather_cores_to_ethernet_connection_map),
+                self._placements.get_placement_of_vertex(sender),
+                address, length, key)
+
+        reads, store_block = self.__prepare_block_reads(
+            regions, progress, "advanced_monitors", make_read)
+        receiver.get_data_concurrently(
+            reads, store_block, self._fixed_routes,
+            self._max_parallel_extractions)
+
+    def __old_get_data_for_regions(self, regions, progress):
+        # get data, reading all the regions of a core in one go
+        region_ids = OrderedDict()
+        for placement, recording_region_id in regions:
+            region_ids.setdefault(placement, list()).append(
+                recording_region_id)
+        for placement, recording_region_ids in region_ids.items():
+            self.__retrieve_regions_by_placement(
+                placement, recording_region_ids, progress)
 
     def get_data_for_vertex(self, placement, recording_region_id):
         """ It is no longer possible to get access to the data pointer.
@@ -648,11 +988,50 @@ class BufferManager(object):
                 "vertex {} does not implement AbstractReceiveBuffersToHost "
                 "so no data read".format(placement.vertex))
         with self._thread_lock_buffer_out:
+            self.__get_pending_region(placement, recording_region_id)
+
             # data flush has been completed - return appropriate data
             (byte_array, missing) = self._received_data.get_region_data(
                 placement.x, placement.y, placement.p, recording_region_id)
             return byte_array, missing
 
+    def get_region_array(self, placement, region, dtype, shape=None):
+        """ Get all the data retrieved during the simulation from a specific\
+            region area of a core, as a NumPy array. The array is filled\
+            directly from the stored data, so this avoids the copy made by\
+            getting the bytes with :py:meth:`get_data_by_placement` and\
+            then converting them.
+
+        :param placement: the placement to get the data from
+        :type placement: :py:class:`~pacman.model.placements.Placement`
+        :param region: desired recording data region
+        :type region: int
+        :param dtype: The type of the elements of the array
+        :type dtype: numpy.dtype or str
+        :param shape: The shape of the array, or None for one dimension
+        :type shape: tuple(int) or None
+        :return: an array of all the data received during the simulation,\
+            and a flag indicating if any data was missing
+        :rtype: (numpy.ndarray, bool)
+        """
+        if not isinstance(placement.vertex, AbstractReceiveBuffersToHost):
+            raise NotImplementedError(
+                "vertex {} does not implement AbstractReceiveBuffersToHost "
+                "so no data read".format(placement.vertex))
+        with self._thread_lock_buffer_out:
+            self.__get_pending_region(placement, region)
+            return self._received_data.get_region_array(
+                placement.x, placement.y, placement.p, region, dtype, shape)
+
+    def __get_pending_region(self, placement, recording_region_id):
+        """ Retrieve the data of a region if lazy extraction has not yet\
+            done so; must be locked first.
+        """
+        key = (placement.x, placement.y, placement.p, recording_region_id)
+        if key in self._pending_regions:
+            self.__get_data_for_regions(
+                [self._pending_regions[key]], None)
+
     def _retreive_by_placement(self, placement, recording_region_id):
         """ Retrieve the data for a vertex; must be locked first.
 
@@ -661,141 +1040,166 @@ class BufferManager(object):
         :param recording_region_id: desired recording data region
         :type recording_region_id: int
         """
-        recording_data_address = \
-            placement.vertex.get_recording_region_base_address(
-                self._transceiver, placement)
-
-        # Ensure the last sequence number sent has been retrieved
-        if not self._received_data.is_end_buffering_sequence_number_stored(
-                placement.x, placement.y, placement.p):
-            self._received_data.store_end_buffering_sequence_number(
-                placement.x, placement.y, placement.p,
-                get_last_sequence_number(
-                    placement, self._transceiver, recording_data_address))
-
-        # Read the data if not already received
-        if not self._received_data.is_data_from_region_flushed(
-                placement.x, placement.y, placement.p,
-                recording_region_id):
-
-            # Read the end state of the recording for this region
-            if not self._received_data.is_end_buffering_state_recovered(
-                    placement.x, placement.y, placement.p,
-                    recording_region_id):
-                end_state = self._generate_end_buffering_state_from_machine(
-                    placement, get_region_pointer(
-                        placement, self._transceiver, recording_data_address,
-                        recording_region_id))
-                self._received_data.store_end_buffering_state(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    end_state)
-            else:
-                end_state = self._received_data.get_end_buffering_state(
-                    placement.x, placement.y, placement.p, recording_region_id)
-
-            # current read needs to be adjusted in case the last portion of the
-            # memory has already been read, but the HostDataRead packet has not
-            # been processed by the chip before simulation finished.
-            # This situation is identified by the sequence number of the last
-            # packet sent to this core and the core internal state of the
-            # output buffering finite state machine
-            seq_no_last_ack_packet = \
-                self._received_data.last_sequence_no_for_core(
-                    placement.x, placement.y, placement.p)
-
-            # get the sequence number the core was expecting to see next
-            core_next_sequence_number = \
-                self._received_data.get_end_buffering_sequence_number(
-                    placement.x, placement.y, placement.p)
-
-            # if the core was expecting to see our last sent sequence,
-            # it must not have received it
-            if core_next_sequence_number == seq_no_last_ack_packet:
-                self._process_last_ack(placement, recording_region_id,
-                                       end_state)
-
-            # now state is updated, read back values for read pointer and
-            # last operation performed
-            last_operation = end_state.last_buffer_operation
-            start_ptr = end_state.start_address
-            end_ptr = end_state.end_address
-            write_ptr = end_state.current_write
-            read_ptr = end_state.current_read
-
-            # now read_ptr is updated, check memory to read
-            if read_ptr < write_ptr:
-                length = write_ptr - read_ptr
-                logger.debug(
-                    "< Reading {} bytes from {}, {}, {}: {} for region {}",
-                    length, placement.x, placement.y, placement.p,
-                    hex(read_ptr), recording_region_id)
-                data = self._request_data(
-                    transceiver=self._transceiver, placement_x=placement.x,
-                    address=read_ptr, length=length, placement_y=placement.y)
-                self._received_data.flushing_data_from_region(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    data)
-
-            elif read_ptr > write_ptr:
-                length = end_ptr - read_ptr
-                if length < 0:
-                    raise ConfigurationException(
-                        "The amount of data to read is negative!")
-                logger.debug(
-                    "> Reading {} bytes from {}, {}, {}: {} for region {}",
-                    length, placement.x, placement.y, placement.p,
-                    hex(read_ptr), recording_region_id)
-                data = self._request_data(
-                    transceiver=self._transceiver, placement_x=placement.x,
-                    address=read_ptr, length=length, placement_y=placement.y)
-                self._received_data.store_data_in_region_buffer(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    data)
-                read_ptr = start_ptr
-                length = write_ptr - read_ptr
-                logger.debug(
-                    "Reading {} bytes from {}, {}, {}: {} for region {}",
-                    length, placement.x, placement.y, placement.p,
-                    hex(read_ptr), recording_region_id)
-                data = self._request_data(
-                    transceiver=self._transceiver, placement_x=placement.x,
-                    address=read_ptr, length=length, placement_y=placement.y)
-                self._received_data.flushing_data_from_region(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    data)
-
-            elif (read_ptr == write_ptr and
-                    last_operation == BUFFERING_OPERATIONS.BUFFER_WRITE.value):
-                length = end_ptr - read_ptr
-                logger.debug(
-                    "= Reading {} bytes from {}, {}, {}: {} for region {}",
-                    length, placement.x, placement.y, placement.p,
-                    hex(read_ptr), recording_region_id)
-                data = self._request_data(
-                    transceiver=self._transceiver, placement_x=placement.x,
-                    address=read_ptr, length=length, placement_y=placement.y)
-                self._received_data.store_data_in_region_buffer(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    data)
-                read_ptr = start_ptr
-                length = write_ptr - read_ptr
-                logger.debug(
-                    "Reading {} bytes from {}, {}, {}: {} for region {}",
-                    length, placement.x, placement.y, placement.p,
-                    hex(read_ptr), recording_region_id)
-                data = self._request_data(
-                    transceiver=self._transceiver, placement_x=placement.x,
-                    address=read_ptr, length=length, placement_y=placement.y)
-                self._received_data.flushing_data_from_region(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    data)
-
-            elif (read_ptr == write_ptr and
-                    last_operation == BUFFERING_OPERATIONS.BUFFER_READ.value):
-                data = bytearray()
-                self._received_data.flushing_data_from_region(
-                    placement.x, placement.y, placement.p, recording_region_id,
-                    data)
+        self.__retrieve_regions_by_placement(
+            placement, [recording_region_id], None)
+
+    def __retrieve_regions_by_placement(
+            self, placement, recording_region_ids, progress):
+        """ Retrieve the data for some regions of a vertex, reading the\
+            blocks of all of them together; must be locked first.
+
+        :param placement: the placement to get the data from
+        :type placement: :py:class:`~pacman.model.placements.Placement`
+        :param recording_region_ids: desired recording data regions
+        :type recording_region_ids: list(int)
+        :param progress: the progress bar to update, or None
+        """
+        region_reads = list()
+        for recording_region_id in recording_region_ids:
+            reads = self._get_reads_for_region(placement, recording_region_id)
+            if reads is not None:
+                region_reads.append((recording_region_id, reads))
+            elif progress is not None:
+                progress.update()
+        if not region_reads:
+            return
+
+        start = time.time()
+        pieces = self._request_data_multi(
+            self._transceiver, placement.x, placement.y,
+            [read for _, reads in region_reads for read in reads])
+        for recording_region_id, reads in region_reads:
+            self.__store_and_record(
+                "advanced_monitors" if self._uses_advanced_monitors
+                else "scp", placement, recording_region_id,
+                pieces[:len(reads)], start)
+            pieces = pieces[len(reads):]
+            if progress is not None:
+                progress.update()
+
+    def __store_and_record(
+            self, path, placement, recording_region_id, pieces, start):
+        """ Store the blocks read for a region and record how long reading\
+            them and waiting to store them took.
+        """
+        # pylint: disable=too-many-arguments
+        end = time.time()
+        self._store_region_reads(placement, recording_region_id, pieces)
+        self._transfer_metrics.record(
+            path, self.__board_of(placement.x, placement.y),
+            placement.x, placement.y, placement.p,
+            sum(len(data) for data in pieces), start, end,
+            queue_wait=time.time() - end)
+
+    def __board_of(self, x, y):
+        """ The Ethernet chip of the board of a chip, if known
+        """
+        if self._machine is None:
+            return None
+        chip = self._machine.get_chip_at(x, y)
+        if chip is None:
+            return None
+        return (chip.nearest_ethernet_x, chip.nearest_ethernet_y)
+
+    def _get_reads_for_region(self, placement, recording_region_id):
+        """ Work out which blocks of memory must be read to retrieve the\
+            data for a region of a vertex; must be locked first.
+
+        :param placement: the placement to get the data from
+        :type placement: :py:class:`~pacman.model.placements.Placement`
+        :param recording_region_id: desired recording data region
+        :type recording_region_id: int
+        :return: The (address, length) of each block to read, in order,\
+            or None if there is nothing to retrieve
+        :rtype: list(tuple(int, int)) or None
+        """
+        # Ensure the last sequence number sent and the end state of the
+        # recording have been retrieved
+        self._read_recording_metadata([placement])
+
+        # Nothing to read if the data has already been received
+        if self._received_data.is_data_from_region_flushed(
+                placement.x, placement.y, placement.p, recording_region_id):
+            return None
+        end_state = self._received_data.get_end_buffering_state(
+            placement.x, placement.y, placement.p, recording_region_id)
+
+        # The core could not record some of the data
+        if end_state.missing_info:
+            self._received_data.mark_region_missing(
+                placement.x, placement.y, placement.p, recording_region_id)
+
+        # current read needs to be adjusted in case the last portion of the
+        # memory has already been read, but the HostDataRead packet has not
+        # been processed by the chip before simulation finished.
+        # This situation is identified by the sequence number of the last
+        # packet sent to this core and the core internal state of the
+        # output buffering finite state machine
+        seq_no_last_ack_packet = \
+            self._received_data.last_sequence_no_for_core(
+                placement.x, placement.y, placement.p)
+
+        # get the sequence number the core was expecting to see next
+        core_next_sequence_number = \
+            self._received_data.get_end_buffering_sequence_number(
+                placement.x, placement.y, placement.p)
+
+        # if the core was expecting to see our last sent sequence,
+        # it must not have received it
+        if core_next_sequence_number == seq_no_last_ack_packet:
+            self._process_last_ack(placement, recording_region_id, end_state)
+
+        # now state is updated, read back values for read pointer and
+        # last operation performed
+        last_operation = end_state.last_buffer_operation
+        start_ptr = end_state.start_address
+        end_ptr = end_state.end_address
+        write_ptr = end_state.current_write
+        read_ptr = end_state.current_read
+
+        # now read_ptr is updated, check memory to read
+        if read_ptr < write_ptr:
+            reads = [(read_ptr, write_ptr - read_ptr)]
+        elif read_ptr > write_ptr or (
+                last_operation == BUFFERING_OPERATIONS.BUFFER_WRITE.value):
+            # The data wraps around the end of the buffer
+            if end_ptr < read_ptr:
+                raise ConfigurationException(
+                    "The amount of data to read is negative!")
+            reads = [(read_ptr, end_ptr - read_ptr),
+                     (start_ptr, write_ptr - start_ptr)]
+        elif last_operation == BUFFERING_OPERATIONS.BUFFER_READ.value:
+            reads = []
+        else:
+            return None
+
+        for address, length in reads:
+            logger.debug(
+                "Reading {} bytes from {}, {}, {}: {} for region {}",
+                length, placement.x, placement.y, placement.p,
+                hex(address), recording_region_id)
+        return reads
+
+    def _store_region_reads(self, placement, recording_region_id, pieces):
+        """ Queue the blocks read for a region of a vertex to be stored,\
+            which completes the data for that region.
+
+        :param placement: the placement the data came from
+        :type placement: :py:class:`~pacman.model.placements.Placement`
+        :param recording_region_id: the recording data region
+        :type recording_region_id: int
+        :param pieces: the data read for each block, in order
+        :type pieces: list(bytearray)
+        """
+        # The data is written to the database in the background, so the
+        # next read can start while it is being written
+        for data in pieces[:-1]:
+            self._received_data.queue_data_in_region_buffer(
+                placement.x, placement.y, placement.p, recording_region_id,
+                data)
+        self._received_data.queue_flushing_data_from_region(
+            placement.x, placement.y, placement.p, recording_region_id,
+            pieces[-1] if pieces else bytearray())
 
     def _process_last_ack(self, placement, region_id, end_state):
         # if the last ACK packet has not been processed on the chip,
@@ -919,9 +1323,17 @@ class BufferManager(object):
 
             # Note this *always* uses the transceiver, as fast data transfer
             # isn't guaranteed to work whilst a simulation is running!
-            self._received_data.store_data_in_region_buffer(
-                x, y, p, region_id, self._transceiver.read_memory(
-                    x, y, start_address, length))
+            # The data is written to the database in the background, so the
+            # core is told it can reuse the space as soon as we have it.
+            start = time.time()
+            data = self._transceiver.read_memory(
+                x, y, start_address, length)
+            end = time.time()
+            self._received_data.queue_data_in_region_buffer(
+                x, y, p, region_id, data)
+            self._transfer_metrics.record(
+                "live_scp", self.__board_of(x, y), x, y, p, length, start,
+                end, queue_wait=time.time() - end)
             channels.append(channel)
             region_ids.append(region_id)
             space_read.append(length)
@@ -930,6 +1342,33 @@ class BufferManager(object):
         return HostDataRead(
             len(channels), pkt_seq, channels, region_ids, space_read)
 
+    @overrides(AbstractProvidesLocalProvenanceData.get_local_provenance_data)
+    def get_local_provenance_data(self):
+        write_behind = self._received_data.write_behind
+        names = ["BufferManager", "buffered_data_writer"]
+        prov_items = self._transfer_metrics.get_provenance_data()
+        return prov_items + [
+            ProvenanceDataItem(
+                names + ["max_queue_depth"], write_behind.max_depth),
+            ProvenanceDataItem(
+                names + ["n_commits"], write_behind.n_commits),
+            ProvenanceDataItem(
+                names + ["n_pieces_stored"], write_behind.n_stored),
+            ProvenanceDataItem(
+                names + ["mean_commit_latency_ms"],
+                write_behind.mean_commit_time * 1000.0),
+            ProvenanceDataItem(
+                names + ["max_commit_latency_ms"],
+                write_behind.max_commit_time * 1000.0)]
+
+    @property
+    def transfer_metrics(self):
+        """ The measurements of the transfers of recorded data
+
+        :rtype: TransferMetrics
+        """
+        return self._transfer_metrics
+
     @property
     def sender_vertices(self):
         """ The vertices which are buffered.
@@ -14,6 +14,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import struct
+import numpy
 from spinn_front_end_common.interface.buffer_management.storage_objects\
     import ChannelBufferState
 from spinn_front_end_common.utilities.constants import (
@@ -159,3 +160,35 @@ def get_region_pointer(placement, transceiver, recording_data_address, region):
         recording_data_address + _FIRST_REGION_ADDRESS_OFFSET + (region * 4),
         4)
     return _ONE_WORD.unpack_from(data)[0]
+
+
+def get_recording_header_read_size(n_regions):
+    """ Get the number of bytes to read from the start of the recording\
+        data to get the last sequence number and the pointers to the first\
+        regions
+
+    :param n_regions: The number of region pointers to read
+    :type n_regions: int
+    :rtype: int
+    """
+    return _FIRST_REGION_ADDRESS_OFFSET + (n_regions * 4)
+
+
+def decode_recording_header(data, n_regions):
+    """ Decode the last sequence number and the region pointers from the\
+        start of the recording data
+
+    :param data: \
+        The data read, of at least :py:func:`get_recording_header_read_size`\
+        bytes
+    :type data: bytearray
+    :param n_regions: The number of region pointers to decode
+    :type n_regions: int
+    :return: The last sequence number and a pointer to each region
+    :rtype: tuple(int, list(int))
+    """
+    words = numpy.frombuffer(
+        data, dtype="<u4",
+        count=_RECORDING_ELEMENTS_BEFORE_REGION_SIZES + n_regions)
+    return (int(words[_LAST_SEQUENCE_NUMBER_OFFSET // 4]),
+            words[_RECORDING_ELEMENTS_BEFORE_REGION_SIZES:].tolist())
@@ -20,7 +20,8 @@ from .buffers_sent_deque import BuffersSentDeque
 from .channel_buffer_state import ChannelBufferState
 from .end_buffering_state import EndBufferingState
 from .sqllite_database import SqlLiteDatabase
+from .write_behind_queue import WriteBehindQueue
 
 __all__ = ["AbstractDatabase", "BufferedReceivingData",
            "BufferedSendingRegion", "BuffersSentDeque", "ChannelBufferState",
-           "EndBufferingState", "SqlLiteDatabase"]
+           "EndBufferingState", "SqlLiteDatabase", "WriteBehindQueue"]
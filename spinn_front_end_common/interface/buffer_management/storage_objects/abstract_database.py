@@ -68,6 +68,32 @@ class AbstractDatabase(object):
         :type data: bytearray
         """
 
+    @abstractmethod
+    def store_data_in_region_buffers(self, items):
+        """ Store several pieces of information, each for a specific chip,\
+            core and region, in one go
+
+        :param items: the (x, y, p, region, data) of each piece, in the\
+            order they are to be appended
+        :type items: iterable(tuple(int, int, int, int, bytearray))
+        """
+
+    @abstractmethod
+    def mark_region_missing(self, x, y, p, region):
+        """ Record that some of the data of a specific chip, core and region\
+            was lost, so that getting the data of the region reports it as\
+            missing
+
+        :param x: x coordinate of the chip
+        :type x: int
+        :param y: y coordinate of the chip
+        :type y: int
+        :param p: Core within the specified chip
+        :type p: int
+        :param region: Region missing some data
+        :type region: int
+        """
+
     @abstractmethod
     def get_region_data(self, x, y, p, region):
         """ Get the data stored for a given region of a given core
@@ -85,6 +111,47 @@ class AbstractDatabase(object):
         :rtype: (bytearray, bool)
         """
 
+    @abstractmethod
+    def get_region_array(self, x, y, p, region, dtype, shape=None):
+        """ Get the data stored for a given region of a given core as a\
+            NumPy array, without building an intermediate bytes object
+
+        :param x: x coordinate of the chip
+        :type x: int
+        :param y: y coordinate of the chip
+        :type y: int
+        :param p: Core within the specified chip
+        :type p: int
+        :param region: Region containing the data
+        :type region: int
+        :param dtype: The type of the elements of the array
+        :type dtype: numpy.dtype or str
+        :param shape: The shape of the array, or None for one dimension
+        :type shape: tuple(int) or None
+        :return: an array of all the data received during the simulation,\
+            and a flag indicating if any data was missing
+        :rtype: (numpy.ndarray, bool)
+        """
+
+    @abstractmethod
+    def get_region_data_chunks(self, x, y, p, region):
+        """ Get the data stored for a given region of a given core, as the\
+            pieces it was stored in, without joining them together
+
+        :param x: x coordinate of the chip
+        :type x: int
+        :param y: y coordinate of the chip
+        :type y: int
+        :param p: Core within the specified chip
+        :type p: int
+        :param region: Region containing the data
+        :type region: int
+        :return: a list of views of the data received during the\
+            simulation, in order, and a flag indicating if any data was\
+            missing
+        :rtype: (list(memoryview), bool)
+        """
+
     @abstractmethod
     def clear(self):
         """ Clears the data for all regions.
@@ -21,6 +21,7 @@ except ImportError:
     from collections import defaultdict
 from spinn_utilities.log import FormatAdapter
 from .sqllite_database import SqlLiteDatabase
+from .write_behind_queue import WriteBehindQueue, DEFAULT_MAX_QUEUED_BYTES
 
 DDL_FILE = os.path.join(os.path.dirname(__file__), "db.sql")
 DB_FILE_NAME = "buffer.sqlite3"
@@ -43,6 +44,12 @@ class BufferedReceivingData(object):
         # the path to the database
         "_db_file",
 
+        # the queue of data waiting to be written to the database
+        "_write_behind",
+
+        # the most bytes that may wait to be written to the database
+        "_max_queued_bytes",
+
         # dict of booleans indicating if a region on a core has been flushed
         "_is_flushed",
 
@@ -62,22 +69,33 @@ class BufferedReceivingData(object):
         "_end_buffering_state"
     ]
 
-    def __init__(self, report_folder):
+    def __init__(self, report_folder,
+                 max_queued_bytes=DEFAULT_MAX_QUEUED_BYTES):
         """
         :param report_folder: The directory to write the database used to
             store some of the data.
         :type report_folder: str
+        :param max_queued_bytes: \
+            The most bytes of data that may wait to be written to the\
+            database before queueing more waits
+        :type max_queued_bytes: int
         """
         self._db_file = os.path.join(report_folder, DB_FILE_NAME)
+        self._max_queued_bytes = max_queued_bytes
         self._db = None
+        self._write_behind = None
         self.reset()
 
     def reset(self):
+        if self._write_behind is not None:
+            self._write_behind.close()
         if os.path.exists(self._db_file):
             if self._db:
                 self._db.close()
             os.remove(self._db_file)
         self._db = SqlLiteDatabase(self._db_file)
+        self._write_behind = WriteBehindQueue(
+            self._db, max_queued_bytes=self._max_queued_bytes)
         self._is_flushed = defaultdict(lambda: False)
         self._sequence_no = defaultdict(lambda: 0xFF)
         self._last_packet_received = defaultdict(lambda: None)
@@ -101,8 +119,61 @@ class BufferedReceivingData(object):
         :type data: bytearray
         """
         # pylint: disable=too-many-arguments
+        # Anything queued earlier must go in first to keep the order
+        self._write_behind.flush()
         self._db.store_data_in_region_buffer(x, y, p, region, data)
 
+    def queue_data_in_region_buffer(self, x, y, p, region, data):
+        """ Store some information in the correspondent buffer class for a\
+            specific chip, core and region, without waiting for it to be\
+            written to the database
+
+        :param x: x coordinate of the chip
+        :type x: int
+        :param y: y coordinate of the chip
+        :type y: int
+        :param p: Core within the specified chip
+        :type p: int
+        :param region: Region containing the data to be stored
+        :type region: int
+        :param data: data to be stored; must not be changed afterwards
+        :type data: bytearray
+        """
+        # pylint: disable=too-many-arguments
+        self._write_behind.put(x, y, p, region, data)
+
+    def mark_region_missing(self, x, y, p, region):
+        """ Record that some of the data of a specific chip, core and region\
+            was lost
+
+        :param x: x coordinate of the chip
+        :type x: int
+        :param y: y coordinate of the chip
+        :type y: int
+        :param p: Core within the specified chip
+        :type p: int
+        :param region: Region missing some data
+        :type region: int
+        """
+        self._db.mark_region_missing(x, y, p, region)
+
+    def flush(self):
+        """ Wait until all queued information has been written to the\
+            database
+
+        :raises Exception: \
+            if any information could not be written since the last reset
+        """
+        self._write_behind.flush()
+
+    @property
+    def write_behind(self):
+        """ The queue of data waiting to be written to the database
+
+        :rtype: WriteBehindQueue
+        """
+        return self._write_behind
+
     def is_data_from_region_flushed(self, x, y, p, region):
         """ Check if the data region has been flushed
 
@@ -138,6 +209,26 @@ class BufferedReceivingData(object):
         self.store_data_in_region_buffer(x, y, p, region, data)
         self._is_flushed[x, y, p, region] = True
 
+    def queue_flushing_data_from_region(self, x, y, p, region, data):
+        """ Store flushed data from a region of a core on a chip, and mark it\
+            as being flushed, without waiting for it to be written to the\
+            database
+
+        :param x: x coordinate of the chip
+        :type x: int
+        :param y: y coordinate of the chip
+        :type y: int
+        :param p: Core within the specified chip
+        :type p: int
+        :param region: Region containing the data to be stored
+        :type region: int
+        :param data: data to be stored; must not be changed afterwards
+        :type data: bytearray
+        """
+        # pylint: disable=too-many-arguments
+        self.queue_data_in_region_buffer(x, y, p, region, data)
+        self._is_flushed[x, y, p, region] = True
+
     def store_last_received_packet_from_core(self, x, y, p, packet):
         """ Store the most recent packet received from SpiNNaker for a given\
             core
@@ -243,8 +334,53 @@ class BufferedReceivingData(object):
             simulation, and a flag indicating if any data was missing
         :rtype: (bytearray, bool)
         """
+        self._write_behind.flush()
         return self._db.get_region_data(x, y, p, region)
 
+    def get_region_array(self, x, y, p, region, dtype, shape=None):
+        """ Get the data stored for a given region of a given core as a\
+            NumPy array
+
+        :param x: x coordinate of the chip
+        :type x: int
+        :param y: y coordinate of the chip
+        :type y: int
+        :param p: Core within the specified chip
+        :type p: int
+        :param region: Region containing the data
+        :type region: int
+        :param dtype: The type of the elements of the array
+        :type dtype: numpy.dtype or str
+        :param shape: The shape of the array, or None for one dimension
+        :type shape: tuple(int) or None
+        :return: an array of all the data received during the simulation,\
+            and a flag indicating if any data was missing
+        :rtype: (numpy.ndarray, bool)
+        """
+        # pylint: disable=too-many-arguments
+        self._write_behind.flush()
+        return self._db.get_region_array(x, y, p, region, dtype, shape)
+
+    def get_region_data_chunks(self, x, y, p, region):
+        """ Get the data stored for a given region of a given core, as the\
+            pieces it was received in
+
+        :param x: x coordinate of the chip
+        :type x: int
+        :param y: y coordinate of the chip
+        :type y: int
+        :param p: Core within the specified chip
+        :type p: int
+        :param region: Region containing the data
+        :type region: int
+        :return: a list of views of the data received during the\
+            simulation, in order, and a flag indicating if any data was\
+            missing
+        :rtype: (list(memoryview), bool)
+        """
+        self._write_behind.flush()
+        return self._db.get_region_data_chunks(x, y, p, region)
+
     def get_region_data_pointer(self, x, y, p, region):
         """
         It is no longer possible to get access to the data pointer.
@@ -37,13 +37,38 @@ CREATE TABLE IF NOT EXISTS region(
 	local_region_index INTEGER NOT NULL,
 	address INTEGER,
 	content BLOB NOT NULL DEFAULT X'',
+	-- Whether the core dropped any of the data of the region
+	missing INTEGER NOT NULL DEFAULT 0,
 	fetches INTEGER NOT NULL DEFAULT 0,
 	append_time INTEGER);
 -- Every recording region has a unique vertex and index
 CREATE UNIQUE INDEX IF NOT EXISTS regionSanity ON region(
 	core_id ASC, local_region_index ASC);
 
-CREATE VIEW IF NOT EXISTS region_view AS
+-- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+-- A table holding the pieces of data fetched for each recording region, in
+-- the order they were fetched. Appending a row is cheap, where appending to
+-- region.content copies all the earlier data again.
+CREATE TABLE IF NOT EXISTS region_chunk(
+	chunk_id INTEGER PRIMARY KEY AUTOINCREMENT,
+	region_id INTEGER NOT NULL
+		REFERENCES region(region_id) ON DELETE RESTRICT,
+	seq INTEGER NOT NULL,
+	content BLOB NOT NULL);
+-- Every chunk has a unique position within its region
+CREATE UNIQUE INDEX IF NOT EXISTS regionChunkSanity ON region_chunk(
+	region_id ASC, seq ASC);
+
+-- The content column of the view is the whole of the data of the region:
+-- region.content followed by every chunk in order, so readers of the view
+-- do not need to know about region_chunk.
+DROP VIEW IF EXISTS region_view;
+CREATE VIEW region_view AS
 	SELECT core_id, region_id, x, y, processor, local_region_index, address,
-		content, fetches, append_time
+		CAST(region.content || COALESCE((
+			SELECT group_concat(chunk.content, '') FROM (
+				SELECT content FROM region_chunk
+				WHERE region_chunk.region_id = region.region_id
+				ORDER BY seq ASC) AS chunk), X'') AS BLOB) AS content,
+		missing, fetches, append_time
 FROM core NATURAL JOIN region;
\ No newline at end of file
@@ -15,8 +15,10 @@
 
 import os
 import sqlite3
+import threading
 import time
 import sys
+import numpy
 from spinn_front_end_common.interface.buffer_management.storage_objects \
     import AbstractDatabase
 from spinn_utilities.overrides import overrides
@@ -35,6 +37,9 @@ class SqlLiteDatabase(AbstractDatabase):
     __slots__ = [
         # the database holding the data to store
         "_db",
+
+        # Lock so that the database can be used from several threads
+        "_lock",
     ]
 
     def __init__(self, database_file=None):
@@ -43,8 +48,9 @@ class SqlLiteDatabase(AbstractDatabase):
             contain) an SQLite database holding the data.
         :type database_file: str
         """
-        self._db = sqlite3.connect(database_file)
+        self._db = sqlite3.connect(database_file, check_same_thread=False)
         self._db.text_factory = memoryview
+        self._lock = threading.RLock()
         self.__init_db()
 
     def __del__(self):
@@ -52,18 +58,21 @@ class SqlLiteDatabase(AbstractDatabase):
 
     @overrides(AbstractDatabase.close)
     def close(self):
-        if self._db is not None:
-            self._db.close()
-            self._db = None
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
 
     @overrides(AbstractDatabase.clear)
     def clear(self):
-        with self._db:
+        with self._lock, self._db:
             cursor = self._db.cursor()
             cursor.execute(
                 "UPDATE region "
-                + "SET content = ?, fetches = 0, append_time = NULL",
-                (sqlite3.Binary(b"")))
+                + "SET content = ?, missing = 0, fetches = 0, "
+                + "append_time = NULL",
+                (sqlite3.Binary(b""),))
+            cursor.execute("DELETE FROM region_chunk")
 
     def __init_db(self):
         """ Set up the database if required. """
@@ -73,15 +82,86 @@ class SqlLiteDatabase(AbstractDatabase):
         self._db.executescript(sql)
 
     @staticmethod
-    def _read_contents(cursor, x, y, p, region):
+    def _read_region(cursor, x, y, p, region):
+        """ Get the ID of a region and whether any of its data is missing.
+
+        :return: the ID of the region, or None if nothing has been stored\
+            for it, and whether any of its data is missing
+        :rtype: tuple(int, bool)
+        """
+        # Not region_view, whose content already includes the chunks
         for row in cursor.execute(
-                "SELECT content FROM region_view "
+                "SELECT region_id, missing FROM core NATURAL JOIN region "
                 + "WHERE x = ? AND y = ? AND processor = ? "
                 + "AND local_region_index = ?",
                 (x, y, p, region)):
-            data = row["content"]
-            return memoryview(data)
-        return b""
+            return row["region_id"], bool(row["missing"])
+        return None, False
+
+    @staticmethod
+    def _region_size(cursor, region_id):
+        """ Get how many pieces of data are stored for a region, and their\
+            total size in bytes, without reading the data.
+
+        :rtype: tuple(int, int)
+        """
+        n_pieces = 0
+        size = 0
+        for row in cursor.execute(
+                "SELECT length(content) AS size FROM region "
+                + "WHERE region_id = ?", (region_id, )):
+            if row["size"]:
+                n_pieces += 1
+                size += row["size"]
+        for row in cursor.execute(
+                "SELECT COUNT(*) AS n_chunks, "
+                + "TOTAL(length(content)) AS size FROM region_chunk "
+                + "WHERE region_id = ?", (region_id, )):
+            n_pieces += row["n_chunks"]
+            size += int(row["size"])
+        return n_pieces, size
+
+    @staticmethod
+    def _iter_chunks(cursor, region_id):
+        """ Get the pieces of data stored for a region, in the order they\
+            were stored, reading each one only when it is asked for.
+
+        The content column of the region itself comes first; it is only\
+        non-empty if something other than this class (e.g., Java) wrote it.
+
+        :rtype: iterable(memoryview)
+        """
+        for row in cursor.execute(
+                "SELECT content FROM region WHERE region_id = ?",
+                (region_id, )):
+            if len(row["content"]):
+                yield memoryview(row["content"])
+        for row in cursor.execute(
+                "SELECT content FROM region_chunk "
+                + "WHERE region_id = ? ORDER BY seq ASC",
+                (region_id, )):
+            yield memoryview(row["content"])
+
+    @classmethod
+    def _read_chunks(cls, cursor, x, y, p, region):
+        """ Get the pieces of data stored for a region, in the order they\
+            were stored, and whether any of its data is missing.
+
+        :rtype: tuple(list(memoryview), bool)
+        """
+        region_id, missing = cls._read_region(cursor, x, y, p, region)
+        if region_id is None:
+            return [], missing
+        return list(cls._iter_chunks(cursor, region_id)), missing
+
+    @classmethod
+    def _read_contents(cls, cursor, x, y, p, region):
+        chunks, missing = cls._read_chunks(cursor, x, y, p, region)
+        if not chunks:
+            return b"", missing
+        if len(chunks) == 1:
+            return chunks[0], missing
+        return memoryview(b"".join(chunks)), missing
 
     @staticmethod
     def _get_core_id(cursor, x, y, p):
@@ -127,17 +207,59 @@ class SqlLiteDatabase(AbstractDatabase):
         :type data: bytearray
         """
         # pylint: disable=too-many-arguments
-        with self._db:
+        with self._lock, self._db:
+            self._store(self._db.cursor(), x, y, p, region, data)
+
+    @overrides(AbstractDatabase.store_data_in_region_buffers)
+    def store_data_in_region_buffers(self, items):
+        """ Store several pieces of information in one transaction
+
+        :param items: the (x, y, p, region, data) of each piece, in the\
+            order they are to be appended
+        :type items: iterable(tuple(int, int, int, int, bytearray))
+        """
+        with self._lock, self._db:
+            cursor = self._db.cursor()
+            for x, y, p, region, data in items:
+                self._store(cursor, x, y, p, region, data)
+
+    def _store(self, cursor, x, y, p, region, data):
+        # pylint: disable=too-many-arguments
+        region_id = self._get_region_id(cursor, x, y, p, region)
+        # Each fetch is its own row, so earlier data is never copied again
+        cursor.execute(
+            "INSERT INTO region_chunk(region_id, seq, content) "
+            + "SELECT region_id, fetches, ? FROM region "
+            + "WHERE region_id = ?",
+            (sqlite3.Binary(data), region_id))
+        cursor.execute(
+            "UPDATE region SET "
+            + "fetches = fetches + 1, append_time = ? "
+            + "WHERE region_id = ? ",
+            (int(time.time() * SECONDS_TO_MICRO_SECONDS_CONVERSION),
+             region_id))
+        assert cursor.rowcount == 1
+
+    @overrides(AbstractDatabase.mark_region_missing)
+    def mark_region_missing(self, x, y, p, region):
+        """ Record that some of the data of a specific chip, core and region\
+            was lost
+
+        :param x: x coordinate of the chip
+        :type x: int
+        :param y: y coordinate of the chip
+        :type y: int
+        :param p: Core within the specified chip
+        :type p: int
+        :param region: Region missing some data
+        :type region: int
+        """
+        with self._lock, self._db:
             cursor = self._db.cursor()
             region_id = self._get_region_id(cursor, x, y, p, region)
             cursor.execute(
-                "UPDATE region SET content = content || ?, "
-                + "fetches = fetches + 1, append_time = ?"
-                + "WHERE region_id = ? ",
-                (sqlite3.Binary(data),
-                 int(time.time() * SECONDS_TO_MICRO_SECONDS_CONVERSION),
-                 region_id))
-            assert cursor.rowcount == 1
+                "UPDATE region SET missing = 1 WHERE region_id = ?",
+                (region_id, ))
 
     @overrides(AbstractDatabase.get_region_data)
     def get_region_data(self, x, y, p, region):
@@ -156,10 +278,79 @@ class SqlLiteDatabase(AbstractDatabase):
         """
         missing = None
         if self._db is not None:
-            with self._db:
+            with self._lock, self._db:
                 c = self._db.cursor()
-                data = self._read_contents(c, x, y, p, region)
-                # TODO missing data
+                data, missing = self._read_contents(c, x, y, p, region)
         else:
             data = self._data[x, y, p, region].read_all()
         return data, missing
+
+    @overrides(AbstractDatabase.get_region_array)
+    def get_region_array(self, x, y, p, region, dtype, shape=None):
+        """ Get the data stored for a given region of a given core as a\
+            NumPy array
+
+        :param x: x coordinate of the chip
+        :type x: int
+        :param y: y coordinate of the chip
+        :type y: int
+        :param p: Core within the specified chip
+        :type p: int
+        :param region: Region containing the data
+        :type region: int
+        :param dtype: The type of the elements of the array
+        :type dtype: numpy.dtype or str
+        :param shape: The shape of the array, or None for one dimension
+        :type shape: tuple(int) or None
+        :return: an array of all the data received during the simulation,\
+            and a flag indicating if any data was missing
+        :rtype: (numpy.ndarray, bool)
+        """
+        # pylint: disable=too-many-arguments
+        with self._lock, self._db:
+            c = self._db.cursor()
+            region_id, missing = self._read_region(c, x, y, p, region)
+            n_pieces, size = 0, 0
+            if region_id is not None:
+                n_pieces, size = self._region_size(c, region_id)
+            if n_pieces == 1:
+                # Use the bytes SQLite handed over directly
+                data = numpy.frombuffer(
+                    next(self._iter_chunks(c, region_id)), dtype=dtype)
+            else:
+                # Copy each piece into place as soon as it is read, so only
+                # one piece is ever held outside the array
+                data = numpy.empty(size, "uint8")
+                offset = 0
+                if region_id is not None:
+                    for chunk in self._iter_chunks(c, region_id):
+                        if len(chunk):
+                            data[offset:offset + len(chunk)] = \
+                                numpy.frombuffer(chunk, dtype="uint8")
+                            offset += len(chunk)
+                data = data.view(dtype)
+        if shape is not None:
+            data = data.reshape(shape)
+        return data, missing
+
+    @overrides(AbstractDatabase.get_region_data_chunks)
+    def get_region_data_chunks(self, x, y, p, region):
+        """ Get the data stored for a given region of a given core, as the\
+            pieces it was stored in
+
+        :param x: x coordinate of the chip
+        :type x: int
+        :param y: y coordinate of the chip
+        :type y: int
+        :param p: Core within the specified chip
+        :type p: int
+        :param region: Region containing the data
+        :type region: int
+        :return: a list of views of the data received during the\
+            simulation, in order, and a flag indicating if any data was\
+            missing
+        :rtype: (list(memoryview), bool)
+        """
+        with self._lock, self._db:
+            c = self._db.cursor()
+            return self._read_chunks(c, x, y, p, region)
@@ -0,0 +1,256 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import sys
+import threading
+import time
+from six import reraise
+from six.moves import queue
+from spinn_utilities.log import FormatAdapter
+
+logger = FormatAdapter(logging.getLogger(__name__))
+
+# The number of pieces of data that may wait to be stored before whoever is
+# adding more has to wait
+DEFAULT_MAX_QUEUED = 1024
+
+# The most pieces of data that are stored in a single transaction
+DEFAULT_MAX_BATCH = 256
+
+# The number of bytes of data that may wait to be stored before whoever is
+# adding more has to wait
+DEFAULT_MAX_QUEUED_BYTES = 128 * 1024 * 1024
+
+# Placed on the queue to stop the writer thread
+_STOP = object()
+
+
+class WriteBehindQueue(object):
+    """ Stores received data in a database from a dedicated thread, so that\
+        whoever received the data does not have to wait for it to be\
+        committed. Pieces that arrive while a commit is in progress are\
+        grouped together into the next transaction.
+    """
+
+    __slots__ = [
+        # The AbstractDatabase to store the data in
+        "_db",
+
+        # The queue of (x, y, p, region, data) waiting to be stored
+        "_queue",
+
+        # The thread doing the storing
+        "_thread",
+
+        # The most pieces stored in a single transaction
+        "_max_batch",
+
+        # The most bytes that may wait to be stored
+        "_max_queued_bytes",
+
+        # The number of bytes waiting to be stored
+        "_queued_bytes",
+
+        # Condition used to wait for the bytes waiting to go down
+        "_bytes_condition",
+
+        # The first error in storing, as exc_info; kept for the life of the
+        # queue, as the data stored after it is incomplete
+        "_error",
+
+        # The largest number of pieces ever waiting to be stored
+        "_max_depth",
+
+        # The number of transactions committed
+        "_n_commits",
+
+        # The number of pieces of data stored
+        "_n_stored",
+
+        # The total time spent committing, in seconds
+        "_total_commit_time",
+
+        # The longest time spent committing, in seconds
+        "_max_commit_time"
+    ]
+
+    def __init__(self, db, max_queued=DEFAULT_MAX_QUEUED,
+                 max_batch=DEFAULT_MAX_BATCH,
+                 max_queued_bytes=DEFAULT_MAX_QUEUED_BYTES):
+        """
+        :param db: The database to store the data in
+        :type db: AbstractDatabase
+        :param max_queued: \
+            The number of pieces of data that may wait to be stored before\
+            adding another blocks
+        :type max_queued: int
+        :param max_batch: The most pieces stored in a single transaction
+        :type max_batch: int
+        :param max_queued_bytes: \
+            The number of bytes of data that may wait to be stored before\
+            adding more blocks; a single piece larger than this is allowed\
+            when nothing else is waiting
+        :type max_queued_bytes: int
+        """
+        self._db = db
+        self._queue = queue.Queue(max_queued)
+        self._max_batch = max_batch
+        self._max_queued_bytes = max_queued_bytes
+        self._queued_bytes = 0
+        self._bytes_condition = threading.Condition()
+        self._error = None
+        self._max_depth = 0
+        self._n_commits = 0
+        self._n_stored = 0
+        self._total_commit_time = 0.0
+        self._max_commit_time = 0.0
+        self._thread = threading.Thread(
+            target=self._run, name="Buffered data writer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def put(self, x, y, p, region, data):
+        """ Queue some data to be stored for a region of a core. This only\
+            waits if the queue is full.
+
+        :param x: x coordinate of the chip
+        :type x: int
+        :param y: y coordinate of the chip
+        :type y: int
+        :param p: Core within the specified chip
+        :type p: int
+        :param region: Region containing the data to be stored
+        :type region: int
+        :param data: data to be stored; must not be changed afterwards
+        :type data: bytearray
+        """
+        # pylint: disable=too-many-arguments
+        with self._bytes_condition:
+            while self._queued_bytes and (
+                    self._queued_bytes + len(data) > self._max_queued_bytes):
+                self._bytes_condition.wait()
+            self._queued_bytes += len(data)
+        self._queue.put((x, y, p, region, data))
+        self._max_depth = max(self._max_depth, self._queue.qsize())
+
+    def flush(self):
+        """ Wait until everything queued so far has been stored.
+
+        :raises Exception: \
+            if anything has ever failed to be stored by this queue; the\
+            same error is raised by every later flush, as the data of the\
+            regions affected can no longer be complete
+        """
+        self._queue.join()
+        if self._error is not None:
+            reraise(*self._error)
+
+    def close(self):
+        """ Store everything queued and stop the writer thread.
+        """
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while batch[-1] is not _STOP and len(batch) < self._max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _STOP:
+                running = False
+                to_store = batch[:-1]
+            else:
+                to_store = batch
+            # pylint: disable=broad-except
+            try:
+                if to_store:
+                    self._store(to_store)
+            except Exception:
+                logger.exception("problem when storing buffered data")
+                if self._error is None:
+                    self._error = sys.exc_info()
+            finally:
+                with self._bytes_condition:
+                    self._queued_bytes -= sum(
+                        len(item[4]) for item in to_store)
+                    self._bytes_condition.notify_all()
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _store(self, items):
+        start = time.time()
+        self._db.store_data_in_region_buffers(items)
+        duration = time.time() - start
+        self._n_commits += 1
+        self._n_stored += len(items)
+        self._total_commit_time += duration
+        self._max_commit_time = max(self._max_commit_time, duration)
+
+    @property
+    def queued_bytes(self):
+        """ The number of bytes of data waiting to be stored
+
+        :rtype: int
+        """
+        return self._queued_bytes
+
+    @property
+    def max_depth(self):
+        """ The largest number of pieces of data ever waiting to be stored
+
+        :rtype: int
+        """
+        return self._max_depth
+
+    @property
+    def n_commits(self):
+        """ The number of transactions committed
+
+        :rtype: int
+        """
+        return self._n_commits
+
+    @property
+    def n_stored(self):
+        """ The number of pieces of data stored
+
+        :rtype: int
+        """
+        return self._n_stored
+
+    @property
+    def mean_commit_time(self):
+        """ The mean time taken to commit a transaction, in seconds
+
+        :rtype: float
+        """
+        if not self._n_commits:
+            return 0.0
+        return self._total_commit_time / self._n_commits
+
+    @property
+    def max_commit_time(self):
+        """ The longest time taken to commit a transaction, in seconds
+
+        :rtype: float
+        """
+        return self._max_commit_time
@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from .data_specification_cache import DataSpecificationCache
 from .data_specification_targets import DataSpecificationTargets
 from .data_row_reader import DataRowReader
 from .data_row_writer import DataRowWriter
@@ -20,4 +21,5 @@ from .data_row_writer import DataRowWriter
 __all__ = [
     "DataRowReader",
     "DataRowWriter",
+    "DataSpecificationCache",
     "DataSpecificationTargets"]
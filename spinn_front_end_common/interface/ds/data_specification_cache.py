@@ -0,0 +1,222 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import numpy
+
+DDL_FILE = os.path.join(os.path.dirname(__file__), "ds_cache.sql")
+#: The name of the cache file when it is kept in the report folder
+CACHE_FILE_NAME = "ds_cache.sqlite3"
+
+
+class DataSpecificationCache(object):
+    """ Data specifications, and the images of data executed from them,\
+        kept in an SQLite database by hashes of what they were made from, so\
+        that later runs can reuse them rather than making them again. Those\
+        used least recently are removed by prune.
+    """
+
+    __slots__ = [
+        # the database holding the data specs and images
+        "_db",
+
+        # Lock so that the database can be used from several threads
+        "_lock"
+    ]
+
+    def __init__(self, database_file):
+        """
+        :param database_file: The name of a file that contains (or will\
+            contain) an SQLite database holding the data.
+        :type database_file: str
+        """
+        self._db = sqlite3.connect(database_file, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        with open(DDL_FILE) as f:
+            sql = f.read()
+        self._db.executescript(sql)
+
+    def __del__(self):
+        # The lock is not there if the database could not be opened
+        if getattr(self, "_lock", None) is not None:
+            self.close()
+
+    def close(self):
+        """ Close the database.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    @staticmethod
+    def hash_spec(spec):
+        """ Get the hash by which the image executed from a data spec is\
+            kept
+
+        :param spec: the data spec as byte code
+        :type spec: bytes or bytearray
+        :rtype: str
+        """
+        return hashlib.sha256(spec).hexdigest()
+
+    def get_spec(self, spec_key):
+        """ Get a data spec that was generated before
+
+        :param spec_key: the hash of what the data spec was generated from
+        :type spec_key: str
+        :return: the data spec as byte code and the sizes of its regions,\
+            or None if it has not been kept
+        :rtype: tuple(bytes, list(int)) or None
+        """
+        with self._lock, self._db:
+            for row in self._db.execute(
+                    "SELECT content, region_sizes FROM spec "
+                    + "WHERE spec_key = ?", (spec_key, )):
+                self._db.execute(
+                    "UPDATE spec SET last_used = ? WHERE spec_key = ?",
+                    (time.time(), spec_key))
+                return bytes(row["content"]), json.loads(row["region_sizes"])
+        return None
+
+    def set_spec(self, spec_key, spec, region_sizes):
+        """ Keep a data spec
+
+        :param spec_key: the hash of what the data spec was generated from
+        :type spec_key: str
+        :param spec: the data spec as byte code
+        :type spec: bytes or bytearray
+        :param region_sizes: the sizes of the regions of the data spec
+        :type region_sizes: list(int)
+        """
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO spec("
+                + "spec_key, content, region_sizes, last_used) "
+                + "VALUES(?, ?, ?, ?)",
+                (spec_key, sqlite3.Binary(spec),
+                 json.dumps([int(size) for size in region_sizes]),
+                 time.time()))
+
+    def get_image(self, spec_hash):
+        """ Get the image of data that was executed from a data spec before
+
+        :param spec_hash: the hash of the data spec, from hash_spec
+        :type spec_hash: str
+        :return: the number of bytes to allocate for the image, its pointer\
+            table relative to its start, and the (offset, data) of each\
+            region with anything written, or None if it has not been kept
+        :rtype: tuple(int, numpy.ndarray, list(tuple(int, bytes))) or None
+        """
+        with self._lock, self._db:
+            for row in self._db.execute(
+                    "SELECT memory_used, pointer_table FROM image "
+                    + "WHERE spec_hash = ?", (spec_hash, )):
+                regions = [
+                    (region["offset"], bytes(region["content"]))
+                    for region in self._db.execute(
+                        "SELECT offset, content FROM image_region "
+                        + "WHERE spec_hash = ? ORDER BY offset",
+                        (spec_hash, ))]
+                self._db.execute(
+                    "UPDATE image SET last_used = ? WHERE spec_hash = ?",
+                    (time.time(), spec_hash))
+                return (
+                    row["memory_used"],
+                    numpy.frombuffer(
+                        bytes(row["pointer_table"]), dtype="<u4").copy(),
+                    regions)
+        return None
+
+    def set_image(self, spec_hash, memory_used, pointer_table, regions):
+        """ Keep the image of data executed from a data spec
+
+        :param spec_hash: the hash of the data spec, from hash_spec
+        :type spec_hash: str
+        :param memory_used: the number of bytes to allocate for the image
+        :type memory_used: int
+        :param pointer_table: the pointer table relative to the image start
+        :type pointer_table: numpy.ndarray
+        :param regions: the (offset, data) of each region with anything\
+            written
+        :type regions: list(tuple(int, bytes or bytearray))
+        """
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO image("
+                + "spec_hash, memory_used, pointer_table, last_used) "
+                + "VALUES(?, ?, ?, ?)",
+                (spec_hash, int(memory_used), sqlite3.Binary(
+                    numpy.asarray(pointer_table, dtype="<u4").tobytes()),
+                 time.time()))
+            # The image is already kept if the hash is already there
+            if cursor.rowcount == 0:
+                self._db.execute(
+                    "UPDATE image SET last_used = ? WHERE spec_hash = ?",
+                    (time.time(), spec_hash))
+                return
+            self._db.executemany(
+                "INSERT INTO image_region(spec_hash, offset, content) "
+                + "VALUES(?, ?, ?)",
+                ((spec_hash, int(offset), sqlite3.Binary(data))
+                 for offset, data in regions))
+
+    def prune(self, max_bytes):
+        """ Remove the data specs and images used least recently, until\
+            those left take up no more than a given number of bytes
+
+        :param max_bytes: the most bytes of data specs and images to keep
+        :type max_bytes: int
+        :return: the number of data specs and images removed
+        :rtype: int
+        """
+        with self._lock, self._db:
+            # The bytes each takes up, most recently used first
+            kept = sorted(
+                [(row["last_used"], "spec", row["spec_key"], row["n_bytes"])
+                 for row in self._db.execute(
+                     "SELECT spec_key, last_used, "
+                     + "length(content) + length(region_sizes) AS n_bytes "
+                     + "FROM spec")] +
+                [(row["last_used"], "image", row["spec_hash"],
+                  row["n_bytes"])
+                 for row in self._db.execute(
+                     "SELECT spec_hash, last_used, length(pointer_table) + "
+                     + "(SELECT TOTAL(length(content)) FROM image_region "
+                     + "WHERE image_region.spec_hash = image.spec_hash) "
+                     + "AS n_bytes FROM image")],
+                reverse=True)
+            n_bytes = 0
+            n_removed = 0
+            for _, table, key, size in kept:
+                n_bytes += size
+                if n_bytes <= max_bytes:
+                    continue
+                if table == "spec":
+                    self._db.execute(
+                        "DELETE FROM spec WHERE spec_key = ?", (key, ))
+                else:
+                    self._db.execute(
+                        "DELETE FROM image_region WHERE spec_hash = ?",
+                        (key, ))
+                    self._db.execute(
+                        "DELETE FROM image WHERE spec_hash = ?", (key, ))
+                n_removed += 1
+        return n_removed
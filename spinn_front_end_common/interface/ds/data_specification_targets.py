@@ -86,6 +86,14 @@ class DataSpecificationTargets(MutableMapping):
     def write_data_spec(self, x, y, p, ds):
         self._db.save_ds(x, y, p, ds)
 
+    def write_data_specs(self, specs):
+        """ Store the data specifications of several cores at once
+
+        :param specs: the (x, y, p, data spec as byte code) of each core
+        :type specs: iterable(tuple(int, int, int, bytearray))
+        """
+        self._db.save_ds_many(specs)
+
     def items(self):
         for key, value in self._db.ds_iteritems():
             yield key, DataRowReader(value)
@@ -53,6 +53,14 @@ class DsAbstractDatabase(object):
         :type ds: bytearray
         """
 
+    @abstractmethod
+    def save_ds_many(self, specs):
+        """ Saves the data specs of several cores in one go
+
+        :param specs: the (x, y, p, data spec as byte code) of each core
+        :type specs: iterable(tuple(int, int, int, bytearray))
+        """
+
     @abstractmethod
     def get_ds(self, x, y, p):
         """
@@ -130,6 +138,16 @@ class DsAbstractDatabase(object):
         :param info: DataWritten
         """
 
+    @abstractmethod
+    def set_write_info_many(self, infos):
+        """
+        Sets the provenance returned by the Data Spec executor for several\
+        cores in one go
+
+        :param infos: the ((x, y, p), DataWritten) of each core
+        :type infos: iterable(tuple(tuple(int, int, int), DataWritten))
+        """
+
     @abstractmethod
     def clear_write_info(self):
         """
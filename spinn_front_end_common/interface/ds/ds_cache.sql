@@ -0,0 +1,48 @@
+-- Copyright (c) 2019 The University of Manchester
+--
+-- This program is free software: you can redistribute it and/or modify
+-- it under the terms of the GNU General Public License as published by
+-- the Free Software Foundation, either version 3 of the License, or
+-- (at your option) any later version.
+--
+-- This program is distributed in the hope that it will be useful,
+-- but WITHOUT ANY WARRANTY; without even the implied warranty of
+-- MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+-- GNU General Public License for more details.
+--
+-- You should have received a copy of the GNU General Public License
+-- along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+-- https://www.sqlite.org/pragma.html#pragma_synchronous
+PRAGMA main.synchronous = OFF;
+
+-- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+-- The data specs generated, by a hash of what they were generated from.
+CREATE TABLE IF NOT EXISTS spec(
+	spec_key TEXT PRIMARY KEY NOT NULL,
+	content BLOB NOT NULL,
+	-- The sizes of the regions reserved, as a JSON list
+	region_sizes TEXT NOT NULL,
+	-- When the data spec was last kept or reused, in seconds since the epoch
+	last_used REAL NOT NULL);
+
+-- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+-- The images of data executed from data specs, by a hash of the data spec.
+CREATE TABLE IF NOT EXISTS image(
+	spec_hash TEXT PRIMARY KEY NOT NULL,
+	-- The number of bytes to allocate for the image
+	memory_used INTEGER NOT NULL,
+	-- The pointer table, relative to the start of the image
+	pointer_table BLOB NOT NULL,
+	-- When the image was last kept or reused, in seconds since the epoch
+	last_used REAL NOT NULL);
+
+-- The data of the regions of each image that have anything written.
+CREATE TABLE IF NOT EXISTS image_region(
+	spec_hash TEXT NOT NULL
+		REFERENCES image(spec_hash) ON DELETE CASCADE,
+	-- Where the data goes, relative to the start of the image
+	offset INTEGER NOT NULL,
+	content BLOB NOT NULL);
+CREATE INDEX IF NOT EXISTS imageRegionSanity ON image_region(
+	spec_hash ASC);
@@ -37,6 +37,11 @@ class DsPretendDatabase(DsAbstractDatabase):
         # In the database map the core to the ethernet
         self._ds_temp[core_x, core_y, core_p] = ds
 
+    @overrides(DsAbstractDatabase.save_ds_many)
+    def save_ds_many(self, specs):
+        for core_x, core_y, core_p, ds in specs:
+            self.save_ds(core_x, core_y, core_p, ds)
+
     @overrides(DsAbstractDatabase.get_ds)
     def get_ds(self, x, y, p):
         return self._ds_temp[(x, y, p)]
@@ -70,6 +75,11 @@ class DsPretendDatabase(DsAbstractDatabase):
                                info["memory_written"])
         self._info_temp[(x, y, p)] = info
 
+    @overrides(DsAbstractDatabase.set_write_info_many)
+    def set_write_info_many(self, infos):
+        for (x, y, p), info in infos:
+            self.set_write_info(x, y, p, info)
+
     @overrides(DsAbstractDatabase.clear_write_info)
     def clear_write_info(self):
         self._info_temp = dict()
@@ -30,6 +30,8 @@ class DsSqlliteDatabase(DsAbstractDatabase):
     __slots__ = [
         # the database holding the data to store, if used
         "_db",
+        # The ethernet ids by (ethernet_x, ethernet_y), once read
+        "_ethernet_ids",
         # The machine cached for getting the "ethernet"s
         "_machine",
         # The root ethernet id if required
@@ -38,6 +40,7 @@ class DsSqlliteDatabase(DsAbstractDatabase):
 
     def __init__(self, machine, report_folder, init=None):
         self._machine = machine
+        self._ethernet_ids = None
         database_file = os.path.join(report_folder, DB_NAME)
 
         if init is None:
@@ -90,13 +93,22 @@ class DsSqlliteDatabase(DsAbstractDatabase):
             self._db = None
 
     def __get_ethernet(self, ethernet_x, ethernet_y):
-        with self._db:
-            for row in self._db.execute(
-                    "SELECT ethernet_id FROM ethernet "
-                    + "WHERE ethernet_x = ? AND ethernet_y = ?",
-                    (ethernet_x, ethernet_y)):
-                return row["ethernet_id"]
-        return self._root_ethernet_id
+        if self._ethernet_ids is None:
+            with self._db:
+                self._ethernet_ids = {
+                    (row["ethernet_x"], row["ethernet_y"]): row["ethernet_id"]
+                    for row in self._db.execute(
+                        "SELECT ethernet_id, ethernet_x, ethernet_y "
+                        + "FROM ethernet")}
+        ethernet_id = self._ethernet_ids.get((ethernet_x, ethernet_y))
+        if ethernet_id is None:
+            return self._root_ethernet_id
+        return ethernet_id
+
+    def __get_core_ethernet(self, x, y):
+        chip = self._machine.get_chip_at(x, y)
+        return self.__get_ethernet(
+            chip.nearest_ethernet_x, chip.nearest_ethernet_y)
 
     @overrides(DsAbstractDatabase.clear_ds)
     def clear_ds(self):
@@ -106,15 +118,23 @@ class DsSqlliteDatabase(DsAbstractDatabase):
 
     @overrides(DsAbstractDatabase.save_ds)
     def save_ds(self, core_x, core_y, core_p, ds):
-        chip = self._machine.get_chip_at(core_x, core_y)
-        ethernet_id = self.__get_ethernet(
-            chip.nearest_ethernet_x, chip.nearest_ethernet_y)
+        ethernet_id = self.__get_core_ethernet(core_x, core_y)
         with self._db:
             self._db.execute(
                 "INSERT INTO core(x, y, processor, ethernet_id, content) "
                 + "VALUES(?, ?, ?, ?, ?) ",
                 (core_x, core_y, core_p, ethernet_id, sqlite3.Binary(ds)))
 
+    @overrides(DsAbstractDatabase.save_ds_many)
+    def save_ds_many(self, specs):
+        # Find the ethernets first, as doing so may use the database
+        rows = [(x, y, p, self.__get_core_ethernet(x, y), sqlite3.Binary(ds))
+                for x, y, p, ds in specs]
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO core(x, y, processor, ethernet_id, content) "
+                + "VALUES(?, ?, ?, ?, ?) ", rows)
+
     @overrides(DsAbstractDatabase.get_ds)
     def get_ds(self, x, y, p):
         with self._db:
@@ -172,10 +192,9 @@ class DsSqlliteDatabase(DsAbstractDatabase):
     @overrides(DsAbstractDatabase.ds_mark_as_system)
     def ds_mark_as_system(self, core_list):
         with self._db:
-            for xyp in core_list:
-                self._db.execute(
-                    "UPDATE core SET is_system = 1 "
-                    "WHERE x = ? AND y = ? AND processor = ?", xyp)
+            self._db.executemany(
+                "UPDATE core SET is_system = 1 "
+                "WHERE x = ? AND y = ? AND processor = ?", core_list)
 
     def _row_to_info(self, row):
         return DataWritten(start_address=row["start_address"],
@@ -202,14 +221,7 @@ class DsSqlliteDatabase(DsAbstractDatabase):
         :param info: DataWritten or dict() with the keys
             'start_address', 'memory_used' and 'memory_written'
         """
-        if isinstance(info, DataWritten):
-            start = info.start_address
-            used = info.memory_used
-            written = info.memory_written
-        else:
-            start = info["start_address"]
-            used = info["memory_used"]
-            written = info["memory_written"]
+        start, used, written = self.__info_values(info)
         with self._db:
             cursor = self._db.cursor()
             cursor.execute(
@@ -218,14 +230,53 @@ class DsSqlliteDatabase(DsAbstractDatabase):
                 + "WHERE x = ? AND y = ? AND processor = ? ",
                 (start, used, written, x, y, p))
             if cursor.rowcount == 0:
-                chip = self._machine.get_chip_at(x, y)
-                ethernet_id = self.__get_ethernet(
-                    chip.nearest_ethernet_x, chip.nearest_ethernet_y)
                 cursor.execute(
                     "INSERT INTO core(x, y, processor, ethernet_id, "
                     + "start_address, memory_used, memory_written) "
                     + "VALUES(?, ?, ?, ?, ?, ?, ?) ",
-                    (x, y, p, ethernet_id, start, used, written))
+                    (x, y, p, self.__get_core_ethernet(x, y),
+                     start, used, written))
+
+    @overrides(DsAbstractDatabase.set_write_info_many)
+    def set_write_info_many(self, infos):
+        updates = list()
+        inserts = list()
+        with self._db:
+            existing = set(
+                (row["x"], row["y"], row["processor"])
+                for row in self._db.execute(
+                    "SELECT x, y, processor FROM core"))
+            for (x, y, p), info in infos:
+                start, used, written = self.__info_values(info)
+                if (x, y, p) in existing:
+                    updates.append((start, used, written, x, y, p))
+                else:
+                    existing.add((x, y, p))
+                    inserts.append((
+                        x, y, p, self.__get_core_ethernet(x, y),
+                        start, used, written))
+            self._db.executemany(
+                "UPDATE core SET "
+                + "start_address = ?, memory_used = ?, memory_written = ? "
+                + "WHERE x = ? AND y = ? AND processor = ? ", updates)
+            self._db.executemany(
+                "INSERT INTO core(x, y, processor, ethernet_id, "
+                + "start_address, memory_used, memory_written) "
+                + "VALUES(?, ?, ?, ?, ?, ?, ?) ", inserts)
+
+    @staticmethod
+    def __info_values(info):
+        """ Get the start address, memory used and memory written of some\
+            write info
+
+        :param info: DataWritten or dict() with the keys
+            'start_address', 'memory_used' and 'memory_written'
+        :rtype: tuple(int, int, int)
+        """
+        if isinstance(info, DataWritten):
+            return info.start_address, info.memory_used, info.memory_written
+        return (info["start_address"], info["memory_used"],
+                info["memory_written"])
 
     @overrides(DsAbstractDatabase.clear_write_info)
     def clear_write_info(self):
@@ -71,6 +71,16 @@ class DsWriteInfo(MutableMapping):
         """
         self._db.set_write_info(x, y, p, info)
 
+    def set_infos(self, infos):
+        """
+        Sets the info for several cores in one go
+
+        :param infos: the ((x, y, p), info) of each core, where each info is\
+            a DataWritten or a dict() with the keys\
+            'start_address', 'memory_used' and 'memory_written'
+        """
+        self._db.set_write_info_many(infos)
+
     def clear_write_info(self):
         """
         Clears the info for all cores
@@ -18,6 +18,10 @@ from spinn_front_end_common.interface.buffer_management import BufferManager
 from spinn_front_end_common.interface.buffer_management.buffer_models \
     import (
         AbstractSendsBuffersFromHost, AbstractReceiveBuffersToHost)
+from spinn_front_end_common.interface.buffer_management.storage_objects.\
+    write_behind_queue import DEFAULT_MAX_QUEUED_BYTES
+from spinn_front_end_common.utilities.scp.read_memories_process import (
+    DEFAULT_CHANNELS_PER_BOARD)
 
 
 class BufferManagerCreator(object):
@@ -28,7 +32,10 @@ class BufferManagerCreator(object):
             uses_advanced_monitors, report_folder, extra_monitor_cores=None,
             extra_monitor_to_chip_mapping=None,
             packet_gather_cores_to_ethernet_connection_map=None, machine=None,
-            fixed_routes=None, java_caller=None):
+            fixed_routes=None, java_caller=None, max_parallel_extractions=1,
+            max_scp_reads_per_board=DEFAULT_CHANNELS_PER_BOARD,
+            lazy_extraction=False,
+            max_bytes_waiting_to_store=DEFAULT_MAX_QUEUED_BYTES):
         """
         :param placements:
         :param tags:
@@ -43,6 +50,18 @@ class BufferManagerCreator(object):
             the SQLite database holding the data will be placed, \
             and where any java provenance can be written.
         :type report_folder: str
+        :param max_parallel_extractions: \
+            The most boards to extract recorded data from at the same time
+        :type max_parallel_extractions: int
+        :param max_scp_reads_per_board: \
+            The most SCP reads of recorded data in flight on each board
+        :type max_scp_reads_per_board: int
+        :param lazy_extraction: \
+            Whether to only extract recorded data when it is needed
+        :type lazy_extraction: bool
+        :param max_bytes_waiting_to_store: \
+            The most bytes of extracted data that may wait to be stored
+        :type max_bytes_waiting_to_store: int
         :return:
         """
         # pylint: disable=too-many-arguments
@@ -57,7 +76,11 @@ class BufferManagerCreator(object):
             extra_monitor_to_chip_mapping=extra_monitor_to_chip_mapping,
             machine=machine, uses_advanced_monitors=uses_advanced_monitors,
             fixed_routes=fixed_routes, report_folder=report_folder,
-            java_caller=java_caller)
+            java_caller=java_caller,
+            max_parallel_extractions=max_parallel_extractions,
+            max_scp_reads_per_board=max_scp_reads_per_board,
+            lazy_extraction=lazy_extraction,
+            max_bytes_waiting_to_store=max_bytes_waiting_to_store)
 
         for placement in progress.over(placements.placements):
             if isinstance(placement.vertex, AbstractSendsBuffersFromHost):
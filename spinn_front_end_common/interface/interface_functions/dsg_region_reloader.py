@@ -14,20 +14,17 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
-import struct
 from spinn_utilities.progress_bar import ProgressBar
 from spinn_machine import SDRAM
 from spinn_storage_handlers import FileDataReader
 from data_specification import DataSpecificationExecutor
-from data_specification.constants import MAX_MEM_REGIONS
 from data_specification.utility_calls import (
-    get_region_base_address_offset, get_data_spec_and_file_writer_filename)
+    get_data_spec_and_file_writer_filename)
 from spinn_front_end_common.abstract_models import (
     AbstractRewritesDataSpecification)
 from spinn_front_end_common.utilities.helpful_functions import (
-    generate_unique_folder_name)
-
-REGION_STRUCT = struct.Struct("<{}I".format(MAX_MEM_REGIONS))
+    generate_unique_folder_name, get_region_addresses,
+    invalidate_region_addresses)
 
 
 class DSGRegionReloader(object):
@@ -132,15 +129,11 @@ class DSGRegionReloader(object):
             # Ignore the deletion of files as non-critical
             pass
 
-        # Read the region table for the placement
-        regions_base_address = self._txrx.get_cpu_information_from_core(
-            placement.x, placement.y, placement.p).user[0]
-        start_region = get_region_base_address_offset(regions_base_address, 0)
-        table_size = get_region_base_address_offset(
-            regions_base_address, MAX_MEM_REGIONS) - start_region
-        offsets = REGION_STRUCT.unpack_from(
-            self._txrx.read_memory(
-                placement.x, placement.y, start_region, table_size))
+        # Read the region table for the placement; the data is being
+        # reloaded, so anything known about it before is forgotten
+        invalidate_region_addresses(placement.x, placement.y, placement.p)
+        offsets = get_region_addresses(
+            placement.x, placement.y, placement.p, self._txrx)
 
         # Write the regions to the machine
         for i, region in enumerate(data_spec_executor.dsef.mem_regions):
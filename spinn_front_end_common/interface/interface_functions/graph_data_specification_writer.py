@@ -13,19 +13,149 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import hashlib
+import logging
+import multiprocessing
+import os
 try:
     from collections.abc import defaultdict
 except ImportError:
     from collections import defaultdict
+from six import iteritems, text_type
+from spinn_utilities.log import FormatAdapter
 from spinn_utilities.progress_bar import ProgressBar
 from data_specification import DataSpecificationGenerator
 from data_specification.utility_calls import get_report_writer
 from spinn_front_end_common.abstract_models import (
-    AbstractRewritesDataSpecification, AbstractGeneratesDataSpecification)
+    AbstractCachesDataSpecification, AbstractGeneratesDataSpecification,
+    AbstractGeneratesDataSpecificationInWorker,
+    AbstractRewritesDataSpecification)
 from spinn_front_end_common.utilities.exceptions import ConfigurationException
+from spinn_front_end_common.interface.ds import (
+    DataRowWriter, DataSpecificationCache)
 from spinn_front_end_common.interface.ds.data_specification_targets import (
     DataSpecificationTargets)
 
+logger = FormatAdapter(logging.getLogger(__name__))
+
+# How worker processes are made; they have to be forked, as they use the
+# vertices and the items injected into them without these being sent over
+try:
+    _FORK = multiprocessing.get_context("fork")
+except AttributeError:
+    # Python 2 forks wherever it can
+    _FORK = multiprocessing if hasattr(os, "fork") else None
+except ValueError:
+    _FORK = None
+
+# The number of vertices sent to a worker process at a time
+_VERTICES_PER_TASK = 16
+
+# The most data specifications, and the most bytes of them, generated in this
+# process that are held before being stored together
+_SPECS_PER_BATCH = 1000
+_BYTES_PER_BATCH = 64 * 1024 * 1024
+
+# The (placement, vertex) pairs to generate data specifications for, and the
+# (hostname, report folder, write text specs) to generate them with; set
+# before the worker processes are forked so that they inherit them
+_worker_jobs = None
+_worker_args = None
+
+
+def _generate(placement, vertex, targets, hostname, report_dir, write_text):
+    """ Generate the data specification of a vertex
+
+    :param placement: where the vertex is placed
+    :param vertex: the vertex to generate the data specification of
+    :param targets: where to write the data specification
+    :return: the sizes of the regions reserved
+    :rtype: list(int)
+    """
+    # pylint: disable=too-many-arguments
+    pl = placement
+    with targets.create_data_spec(pl.x, pl.y, pl.p) as data_writer:
+        report_writer = get_report_writer(
+            pl.x, pl.y, pl.p, hostname, report_dir, write_text)
+        spec = DataSpecificationGenerator(data_writer, report_writer)
+
+        # generate the DSG file
+        vertex.generate_data_specification(spec, pl)
+    return spec.region_sizes
+
+
+def _generate_in_worker(index):
+    """ Generate the data specification of one of the jobs, in a worker\
+        process
+
+    :param index: the index of the job in _worker_jobs
+    :return: the index, the data specification and the region sizes
+    :rtype: tuple(int, bytearray, list(int))
+    """
+    placement, vertex = _worker_jobs[index]
+    holder = _SpecHolder()
+    region_sizes = _generate(placement, vertex, holder, *_worker_args)
+    return index, holder.spec, region_sizes
+
+
+class _SpecHolder(object):
+    """ Stands in for the data specification targets, holding on to the\
+        data specification written rather than storing it.
+    """
+
+    __slots__ = [
+        # The data specification written
+        "spec"
+    ]
+
+    def __init__(self):
+        self.spec = None
+
+    def create_data_spec(self, x, y, p):
+        return DataRowWriter(x, y, p, self)
+
+    def write_data_spec(self, x, y, p, ds):
+        # pylint: disable=unused-argument
+        self.spec = ds
+
+
+class _SpecBatch(object):
+    """ Stands in for the data specification targets, gathering the data\
+        specifications written so that many are stored at once.
+    """
+
+    __slots__ = [
+        # The data specification targets to store the data specifications in
+        "_targets",
+        # The (x, y, p, data spec) of each data specification gathered
+        "_specs",
+        # The number of bytes of the data specifications gathered
+        "_n_bytes"
+    ]
+
+    def __init__(self, targets):
+        self._targets = targets
+        self._specs = list()
+        self._n_bytes = 0
+
+    def create_data_spec(self, x, y, p):
+        return DataRowWriter(x, y, p, self)
+
+    def write_data_spec(self, x, y, p, ds):
+        self._specs.append((x, y, p, ds))
+        self._n_bytes += len(ds)
+        if (len(self._specs) >= _SPECS_PER_BATCH or
+                self._n_bytes >= _BYTES_PER_BATCH):
+            self.flush()
+
+    def flush(self):
+        """ Store the data specifications gathered
+        """
+        if self._specs:
+            self._targets.write_data_specs(self._specs)
+            self._specs = list()
+            self._n_bytes = 0
+
 
 class GraphDataSpecificationWriter(object):
     """ Executes the data specification generation step.
@@ -46,6 +176,8 @@ class GraphDataSpecificationWriter(object):
         "_report_dir",
         # bool for writing texts
         "_write_text",
+        # The cache of data specs generated in earlier runs, or None
+        "_cache",
     )
 
     def __init__(self):
@@ -57,7 +189,7 @@ class GraphDataSpecificationWriter(object):
             self, placements, hostname,
             report_default_directory, write_text_specs,
             machine, data_n_timesteps, graph_mapper=None,
-            placement_order=None):
+            placement_order=None, n_processes=1, cache_file=None):
         """
         :param placements: placements of machine graph to cores
         :param hostname: SpiNNaker machine name
@@ -71,6 +203,12 @@ class GraphDataSpecificationWriter(object):
             the mapping between application and machine graph
         :param placement:\
             the optional order in which placements should be examined
+        :param n_processes:\
+            the number of processes to generate data specifications in;\
+            system vertices are always generated in this process
+        :param cache_file:\
+            the file of the cache of data specs to reuse and to add to, or\
+            None if data specs are not to be cached
         :return: DSG targets (map of placement tuple and filename)
         """
         # pylint: disable=too-many-arguments, too-many-locals
@@ -87,13 +225,41 @@ class GraphDataSpecificationWriter(object):
         if placement_order is None:
             placement_order = placements.placements
 
+        self._cache = None
+        if cache_file is not None:
+            self._cache = DataSpecificationCache(cache_file)
+        try:
+            self.__generate(
+                placements, placement_order, graph_mapper, targets,
+                data_n_timesteps, n_processes)
+        finally:
+            if self._cache is not None:
+                self._cache.close()
+        return targets
+
+    def __generate(
+            self, placements, placement_order, graph_mapper, targets,
+            data_n_timesteps, n_processes):
+        # pylint: disable=too-many-arguments
+        if n_processes is not None and n_processes > 1 and _FORK is None:
+            logger.warning(
+                "Processes cannot be forked on this platform, so data "
+                "specifications will be generated in this process only")
+        elif n_processes is not None and n_processes > 1:
+            self.__generate_in_parallel(
+                placements.n_placements, placement_order, graph_mapper,
+                targets, data_n_timesteps, n_processes)
+            return
+
         progress = ProgressBar(
             placements.n_placements, "Generating data specifications")
         vertices_to_reset = list()
+        # Store the data specs a batch at a time
+        batch = _SpecBatch(targets)
         for placement in progress.over(placement_order):
             # Try to generate the data spec for the placement
             generated = self.__generate_data_spec_for_vertices(
-                placement, placement.vertex, targets, data_n_timesteps)
+                placement, placement.vertex, batch, data_n_timesteps)
 
             if generated and isinstance(
                     placement.vertex, AbstractRewritesDataSpecification):
@@ -105,23 +271,143 @@ class GraphDataSpecificationWriter(object):
                 associated_vertex = graph_mapper.get_application_vertex(
                     placement.vertex)
                 generated = self.__generate_data_spec_for_vertices(
-                    placement, associated_vertex, targets, data_n_timesteps)
+                    placement, associated_vertex, batch, data_n_timesteps)
                 if generated and isinstance(
                         associated_vertex, AbstractRewritesDataSpecification):
                     vertices_to_reset.append(associated_vertex)
+        batch.flush()
 
         # Ensure that the vertices know their regions have been reloaded
         for vertex in vertices_to_reset:
             vertex.mark_regions_reloaded()
 
-        return targets
+    def __generate_in_parallel(
+            self, n_placements, placement_order, graph_mapper, targets,
+            data_n_timesteps, n_processes):
+        """ Generate the data specifications in a pool of forked worker\
+            processes, storing them all at once at the end
+
+        :param n_placements: the number of placements
+        :param placement_order: the placements in the order to examine them
+        :param graph_mapper:\
+            the mapping between application and machine graph
+        :param targets: DataSpecificationTargets
+        :param data_n_timesteps: The number of timesteps for which data space\
+            will been reserved
+        :param n_processes: the number of worker processes
+        """
+        # pylint: disable=too-many-arguments, global-statement
+        global _worker_jobs, _worker_args
+        progress = ProgressBar(
+            n_placements, "Generating data specifications")
+
+        # Find the vertex to generate for each placement, if any
+        jobs = list()
+        for placement in placement_order:
+            vertex = self.__find_generating_vertex(placement, graph_mapper)
+            if vertex is None:
+                progress.update()
+            else:
+                jobs.append((placement, vertex))
+
+        # Reuse the data specs that were kept, and remember where to keep
+        # the others that can be
+        results = dict()
+        cache_keys = dict()
+        for index, (placement, vertex) in enumerate(jobs):
+            cache_key = self.__cache_key(placement, vertex, data_n_timesteps)
+            if cache_key is not None:
+                kept = self._cache.get_spec(cache_key)
+                if kept is None:
+                    cache_keys[index] = cache_key
+                else:
+                    results[index] = kept
+                    progress.update()
+
+        in_workers = [
+            index for index, (_, vertex) in enumerate(jobs)
+            if index not in results and self.__can_generate_in_worker(vertex)]
+        in_this_process = sorted(
+            set(range(len(jobs))).difference(in_workers).difference(results))
+
+        _worker_jobs = jobs
+        _worker_args = (self._hostname, self._report_dir, self._write_text)
+        pool = _FORK.Pool(n_processes)
+        try:
+            generated = pool.imap_unordered(
+                _generate_in_worker, in_workers, _VERTICES_PER_TASK)
+
+            # Generate the rest while the workers are busy
+            for index in in_this_process:
+                placement, vertex = jobs[index]
+                holder = _SpecHolder()
+                region_sizes = _generate(
+                    placement, vertex, holder, self._hostname,
+                    self._report_dir, self._write_text)
+                results[index] = (holder.spec, region_sizes)
+                progress.update()
+
+            for index, spec, region_sizes in generated:
+                results[index] = (spec, region_sizes)
+                progress.update()
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+            _worker_jobs = None
+            _worker_args = None
+        progress.end()
+        for index, cache_key in iteritems(cache_keys):
+            self._cache.set_spec(cache_key, *results[index])
+
+        # Check the memory usage in the order the placements were examined
+        vertices_to_reset = list()
+        for index, (placement, vertex) in enumerate(jobs):
+            self.__check_sdram_usage(
+                placement, results[index][1], data_n_timesteps)
+            if isinstance(vertex, AbstractRewritesDataSpecification):
+                vertices_to_reset.append(vertex)
+
+        targets.write_data_specs(
+            (placement.x, placement.y, placement.p, results[index][0])
+            for index, (placement, _) in enumerate(jobs))
+
+        # Ensure that the vertices know their regions have been reloaded
+        for vertex in vertices_to_reset:
+            vertex.mark_regions_reloaded()
+
+    @staticmethod
+    def __find_generating_vertex(placement, graph_mapper):
+        """ Find the vertex that generates the data specification of a\
+            placement; the vertex placed if it can, or else its application\
+            vertex
+
+        :return: the vertex, or None if neither can
+        """
+        if isinstance(placement.vertex, AbstractGeneratesDataSpecification):
+            return placement.vertex
+        if graph_mapper is not None:
+            vertex = graph_mapper.get_application_vertex(placement.vertex)
+            if isinstance(vertex, AbstractGeneratesDataSpecification):
+                return vertex
+        return None
+
+    @staticmethod
+    def __can_generate_in_worker(vertex):
+        """ Whether a vertex can generate its data specification in a worker\
+            process. Anything a vertex changes while generating is lost\
+            there, so only those that say they change nothing can.
+
+        :rtype: bool
+        """
+        return isinstance(vertex, AbstractGeneratesDataSpecificationInWorker)
 
     def __generate_data_spec_for_vertices(
             self, pl, vertex, targets, data_n_timesteps):
         """
         :param pl: placement of machine graph to cores
         :param vertex: the specific vertex to write DSG for.
-        :param targets: DataSpecificationTargets
+        :param targets: where to write the data specification
         :return: True if the vertex was data spec-able, False otherwise
         :rtype: bool
         """
@@ -129,22 +415,79 @@ class GraphDataSpecificationWriter(object):
         if not isinstance(vertex, AbstractGeneratesDataSpecification):
             return False
 
-        with targets.create_data_spec(pl.x, pl.y, pl.p) as data_writer:
-            report_writer = get_report_writer(
-                pl.x, pl.y, pl.p, self._hostname,
-                self._report_dir, self._write_text)
-            spec = DataSpecificationGenerator(data_writer, report_writer)
-
-            # generate the DSG file
-            vertex.generate_data_specification(spec, pl)
-
-            # Check the memory usage
-            self._region_sizes[pl.vertex] = spec.region_sizes
-            self._vertices_by_chip[pl.x, pl.y].append(pl.vertex)
-            self._sdram_usage[pl.x, pl.y] += sum(spec.region_sizes)
-            if (self._sdram_usage[pl.x, pl.y] <=
-                    self._machine.get_chip_at(pl.x, pl.y).sdram.size):
-                return True
+        cache_key = self.__cache_key(pl, vertex, data_n_timesteps)
+        if cache_key is None:
+            region_sizes = _generate(
+                pl, vertex, targets, self._hostname, self._report_dir,
+                self._write_text)
+        else:
+            region_sizes = self.__generate_cached(
+                pl, vertex, targets, cache_key)
+        self.__check_sdram_usage(pl, region_sizes, data_n_timesteps)
+        return True
+
+    def __generate_cached(self, pl, vertex, targets, cache_key):
+        """ Reuse the kept data spec of a placement, or generate it and keep\
+            it if there is none
+
+        :param pl: placement of machine graph to cores
+        :param vertex: the specific vertex to write DSG for.
+        :param targets: where to write the data specification
+        :param cache_key: the key of the data spec in the cache
+        :return: the sizes of the regions reserved
+        :rtype: list(int)
+        """
+        kept = self._cache.get_spec(cache_key)
+        if kept is not None:
+            spec, region_sizes = kept
+        else:
+            holder = _SpecHolder()
+            region_sizes = _generate(
+                pl, vertex, holder, self._hostname, self._report_dir,
+                self._write_text)
+            spec = holder.spec
+            self._cache.set_spec(cache_key, spec, region_sizes)
+        targets.write_data_spec(pl.x, pl.y, pl.p, spec)
+        return region_sizes
+
+    def __cache_key(self, pl, vertex, data_n_timesteps):
+        """ Get the key of the data spec of a placement in the cache, made\
+            from the key the vertex gives and everything else the data spec\
+            is generated from
+
+        :param pl: placement of machine graph to cores
+        :param vertex: the specific vertex to write DSG for.
+        :return: the key, or None if the data spec is not to be cached
+        :rtype: str or None
+        """
+        if self._cache is None or not isinstance(
+                vertex, AbstractCachesDataSpecification):
+            return None
+        vertex_key = vertex.get_data_specification_cache_key(pl)
+        if vertex_key is None:
+            return None
+        if not isinstance(vertex_key, bytes):
+            vertex_key = text_type(vertex_key).encode("utf-8")
+        digest = hashlib.sha256("{}.{}:{}:{}:{}:{}:".format(
+            type(vertex).__module__, type(vertex).__name__,
+            pl.x, pl.y, pl.p, data_n_timesteps).encode("utf-8"))
+        digest.update(vertex_key)
+        return digest.hexdigest()
+
+    def __check_sdram_usage(self, pl, region_sizes, data_n_timesteps):
+        """ Add the regions of a placement to the SDRAM used on its chip,\
+            checking that the chip has enough
+
+        :param pl: placement of machine graph to cores
+        :param region_sizes: the sizes of the regions of the placement
+        :raises ConfigurationException: if the chip has too little SDRAM
+        """
+        self._region_sizes[pl.vertex] = region_sizes
+        self._vertices_by_chip[pl.x, pl.y].append(pl.vertex)
+        self._sdram_usage[pl.x, pl.y] += sum(region_sizes)
+        if (self._sdram_usage[pl.x, pl.y] <=
+                self._machine.get_chip_at(pl.x, pl.y).sdram.size):
+            return
 
         # creating the error message which contains the memory usage of
         #  what each core within the chip uses and its original
@@ -23,11 +23,12 @@ class GraphProvenanceGatherer(object):
 
     def __call__(
             self, machine_graph, application_graph=None,
-            provenance_data_objects=None):
+            provenance_data_objects=None, buffer_manager=None):
         """
         :param machine_graph: The machine graph to inspect
         :param application_graph: The optional application graph
         :param provenance_data_objects: Any existing objects to append to
+        :param buffer_manager: The optional buffer manager
         """
 
         if provenance_data_objects is not None:
@@ -61,4 +62,7 @@ class GraphProvenanceGatherer(object):
                     if isinstance(edge, AbstractProvidesLocalProvenanceData):
                         prov_items.extend(edge.get_local_provenance_data())
 
+        if buffer_manager is not None:
+            prov_items.extend(buffer_manager.get_local_provenance_data())
+
         return prov_items
@@ -13,28 +13,46 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import logging
 import struct
+import threading
 import numpy
 from six import iteritems, itervalues
 from spinn_utilities.progress_bar import ProgressBar
 from spinn_utilities.log import FormatAdapter
 from spinn_machine import CoreSubsets
 from data_specification import DataSpecificationExecutor
-from data_specification.constants import MAX_MEM_REGIONS
+from data_specification.constants import (
+    APPDATA_MAGIC_NUM, DSE_VERSION, MAX_MEM_REGIONS)
 from data_specification.exceptions import DataSpecificationException
+from spinn_front_end_common.interface.ds import (
+    DataRowReader, DataSpecificationCache)
 from spinn_front_end_common.interface.ds.ds_write_info import DsWriteInfo
 from spinn_front_end_common.utilities.helpful_functions import (
-    write_address_to_user0)
+    cache_region_addresses, write_address_to_user0)
 from spinn_front_end_common.utilities.utility_objs import (
     ExecutableType, DataWritten)
 from spinn_front_end_common.utilities.helpful_functions import (
     emergency_recover_states_from_failure)
+from spinn_front_end_common.utility_models import (
+    DataSpeedUpPacketGatherMachineVertex)
 
 logger = FormatAdapter(logging.getLogger(__name__))
 _ONE_WORD = struct.Struct("<I")
 _MEM_REGIONS = range(MAX_MEM_REGIONS)
+_HEADER = numpy.array([APPDATA_MAGIC_NUM, DSE_VERSION], dtype="<u4")
+
+# The largest gap between blocks of data written to a core that is filled in
+# so that the blocks are written together; each separate write has a cost
+# that is about that of writing this many more bytes
+_MAX_GAP_TO_FILL = 32 * 1024
+
+# The default number of data specs executed ahead of being loaded
+_DEFAULT_EXECUTION_QUEUE_DEPTH = 4
 
 
 def system_cores(exec_targets):
@@ -61,6 +79,31 @@ def filter_out_app_executables(dsg_targets, executable_targets):
         if core in syscores)
 
 
+def coalesce_writes(blocks, max_gap=_MAX_GAP_TO_FILL):
+    """ Join up blocks of data to be written to memory that are close\
+        together, filling the gaps between them with zeros, so that they can\
+        be written with fewer writes.
+
+    :param blocks: the (address, data) of each block; they must not overlap
+    :type blocks: iterable(tuple(int, bytes or bytearray))
+    :param max_gap: the largest gap, in bytes, between blocks to fill
+    :type max_gap: int
+    :return: the (address, data) of each write to do, in address order
+    :rtype: list(tuple(int, bytearray))
+    """
+    writes = list()
+    end = None
+    for address, data in sorted(blocks, key=lambda block: block[0]):
+        if end is not None and address - end <= max_gap:
+            image = writes[-1][1]
+            image.extend(bytearray(address - end))
+            image.extend(data)
+        else:
+            writes.append((address, bytearray(data)))
+        end = address + len(data)
+    return writes
+
+
 class HostExecuteDataSpecification(object):
     """ Executes the host based data specification.
     """
@@ -68,7 +111,15 @@ class HostExecuteDataSpecification(object):
     __slots__ = [
         # the application ID of the simulation
         "_app_id",
+        # The cache of images executed from data specs in earlier runs, or
+        # None
+        "_cache",
+        # whether to measure where SDP stops being better than data speed up
+        # on each board the first time it is loaded
+        "_calibrate_thresholds",
         "_core_to_conn_map",
+        # The most data specs executed ahead of being loaded
+        "_execution_queue_depth",
         # The path where the SQLite database holding the data will be placed,
         # and where any java provenance can be written.
         "_db_folder",
@@ -76,10 +127,16 @@ class HostExecuteDataSpecification(object):
         "_java",
         # The python representation of the SpiNNaker machine.
         "_machine",
+        # The most boards to load at once when using advanced monitors
+        "_max_parallel_loads",
         "_monitors",
         "_placements",
+        # The file to keep the measured thresholds in, or None
+        "_thresholds_file",
         # The spinnman instance.
         "_txrx",
+        # whether to compare checksums of data sent by advanced monitors
+        "_verify_checksums",
         # The write info; a dict of cores to a dict of
         # 'start_address', 'memory_used', 'memory_written'
         "_write_info_map"]
@@ -88,20 +145,28 @@ class HostExecuteDataSpecification(object):
 
     def __init__(self):
         self._app_id = None
+        self._cache = None
+        self._calibrate_thresholds = False
         self._core_to_conn_map = None
         self._db_folder = None
+        self._execution_queue_depth = _DEFAULT_EXECUTION_QUEUE_DEPTH
         self._java = None
         self._machine = None
+        self._max_parallel_loads = 1
         self._monitors = None
         self._placements = None
+        self._thresholds_file = None
         self._txrx = None
+        self._verify_checksums = False
         self._write_info_map = None
 
     # Is this method unused now?
     def __call__(
             self, transceiver, machine, app_id, dsg_targets,
             report_folder=None, java_caller=None,
-            processor_to_app_data_base_address=None):
+            processor_to_app_data_base_address=None,
+            execution_queue_depth=_DEFAULT_EXECUTION_QUEUE_DEPTH,
+            cache_file=None):
         """ Does the Data Specification Execution and loading
 
         :param transceiver: the spinnman instance
@@ -125,6 +190,13 @@ class HostExecuteDataSpecification(object):
         :param processor_to_app_data_base_address: The write info which is a
             dict of cores to a dict of
                 'start_address', 'memory_used', 'memory_written'
+        :param execution_queue_depth: \
+            the most data specs to execute ahead of them being loaded
+        :type execution_queue_depth: int
+        :param cache_file: \
+            the file of the cache of images executed from data specs to\
+            reuse and to add to, or None if they are not to be cached
+        :type cache_file: str
         :return: map of of cores to a dict of \
                 'start_address', 'memory_used', 'memory_written'
             Note: If using python the return type is an actual dict object.
@@ -138,12 +210,14 @@ class HostExecuteDataSpecification(object):
             processor_to_app_data_base_address = dict()
         self._app_id = app_id
         self._db_folder = report_folder
+        self._execution_queue_depth = execution_queue_depth
         self._java = java_caller
         self._machine = machine
         self._txrx = transceiver
         self._write_info_map = processor_to_app_data_base_address
         impl_method = self.__java_all if java_caller else self.__python_all
-        return impl_method(dsg_targets)
+        with self.__using_cache(cache_file):
+            return impl_method(dsg_targets)
 
     def __java_all(self, dsg_targets):
         """ Does the Data Specification Execution and loading using Java
@@ -164,8 +238,7 @@ class HostExecuteDataSpecification(object):
         dw_write_info = DsWriteInfo(dsg_targets.get_database())
         dw_write_info.clear_write_info()
         if self._write_info_map is not None:
-            for core, info in iteritems(self._write_info_map):
-                dw_write_info[core] = info
+            dw_write_info.set_infos(iteritems(self._write_info_map))
 
         progress.update()
 
@@ -200,9 +273,11 @@ class HostExecuteDataSpecification(object):
             dsg_targets.n_targets(),
             "Executing data specifications and loading data")
 
-        for core, reader in progress.over(iteritems(dsg_targets)):
-            results[core] = self.__execute(
-                core, reader, self._txrx.write_memory)
+        for core, write_info in self.__execute_pipelined(
+                iteritems(dsg_targets), self.__txrx_writer):
+            results[core] = write_info
+            progress.update()
+        progress.end()
 
         return results
 
@@ -213,7 +288,11 @@ class HostExecuteDataSpecification(object):
             extra_monitor_cores_to_ethernet_connection_map=None,
             report_folder=None, java_caller=None,
             processor_to_app_data_base_address=None,
-            disable_advanced_monitor_usage=False):
+            disable_advanced_monitor_usage=False,
+            calibrate_thresholds=False, thresholds_file=None,
+            max_parallel_loads=1, verify_checksums=False,
+            execution_queue_depth=_DEFAULT_EXECUTION_QUEUE_DEPTH,
+            cache_file=None):
         """ Execute the data specs for all non-system targets.
 
         :param machine: the python representation of the SpiNNaker machine
@@ -230,6 +309,25 @@ class HostExecuteDataSpecification(object):
             map of placement and DSG data
         :param disable_advanced_monitor_usage: \
             whether to avoid using advanced monitors even if they're available
+        :param calibrate_thresholds: \
+            whether to measure the sizes from which data speed up is better\
+            than SCP on each board the first time it is loaded using advanced\
+            monitors
+        :param thresholds_file: \
+            a file to keep the measured sizes in, so later runs reuse them,\
+            or None to measure them in each run
+        :param max_parallel_loads: \
+            the most boards to load at the same time, each from a thread of\
+            its own, when using advanced monitors
+        :param verify_checksums: \
+            whether to check data sent using advanced monitors by comparing\
+            checksums computed on the machine and on the host
+        :param execution_queue_depth: \
+            the most data specs to execute ahead of them being loaded, each\
+            holding the image of the data of its core in memory
+        :param cache_file: \
+            the file of the cache of images executed from data specs to\
+            reuse and to add to, or None if they are not to be cached
         :return: map of placement and DSG data
         """
         # pylint: disable=too-many-arguments
@@ -244,6 +342,11 @@ class HostExecuteDataSpecification(object):
         self._monitors = extra_monitor_cores
         self._placements = placements
         self._core_to_conn_map = extra_monitor_cores_to_ethernet_connection_map
+        self._calibrate_thresholds = calibrate_thresholds
+        self._thresholds_file = thresholds_file
+        self._max_parallel_loads = max(1, max_parallel_loads)
+        self._verify_checksums = verify_checksums
+        self._execution_queue_depth = execution_queue_depth
 
         # Allow override to disable
         if disable_advanced_monitor_usage:
@@ -251,8 +354,9 @@ class HostExecuteDataSpecification(object):
 
         impl_method = self.__java_app if java_caller else self.__python_app
         try:
-            return impl_method(
-                dsg_targets, executable_targets, uses_advanced_monitors)
+            with self.__using_cache(cache_file):
+                return impl_method(
+                    dsg_targets, executable_targets, uses_advanced_monitors)
         except:  # noqa: E722
             if uses_advanced_monitors:
                 emergency_recover_states_from_failure(
@@ -274,12 +378,41 @@ class HostExecuteDataSpecification(object):
         # reset router timeouts
         receiver.unset_cores_for_data_streaming(
             self._txrx, self._monitors, self._placements)
+        # the load is over, so the connections to the gatherers, kept open
+        # between writes, are no longer needed
+        for gatherer in itervalues(self._core_to_conn_map):
+            gatherer.close_connection()
+
+    def __calibrate_thresholds(self):
+        """ Set where SDP stops being better than data speed up on the\
+            boards that it is not yet known for, from the thresholds file or\
+            by measuring it.
+        """
+        gatherers = list(itervalues(self._core_to_conn_map))
+        if self._thresholds_file is not None:
+            DataSpeedUpPacketGatherMachineVertex.read_thresholds(
+                gatherers, self._thresholds_file)
+        uncalibrated = [
+            gatherer for gatherer in gatherers
+            if not gatherer.thresholds_calibrated]
+        if not uncalibrated:
+            return
+        progress = ProgressBar(
+            uncalibrated, "Measuring data transfer speeds of boards")
+        for gatherer in progress.over(uncalibrated):
+            gatherer.calibrate_thresholds(self._txrx, self._placements)
+        if self._thresholds_file is not None:
+            DataSpeedUpPacketGatherMachineVertex.write_thresholds(
+                gatherers, self._thresholds_file)
 
     def __select_writer(self, x, y):
         chip = self._machine.get_chip_at(x, y)
         ethernet_chip = self._machine.get_chip_at(
             chip.nearest_ethernet_x, chip.nearest_ethernet_y)
         gatherer = self._core_to_conn_map[ethernet_chip.x, ethernet_chip.y]
+        if self._verify_checksums:
+            return functools.partial(
+                gatherer.send_data_into_spinnaker, verify=True)
         return gatherer.send_data_into_spinnaker
 
     def __python_app(self, dsg_targets, executable_targets, use_monitors):
@@ -288,6 +421,8 @@ class HostExecuteDataSpecification(object):
 
         if use_monitors:
             receiver = self.__set_router_timeouts()
+            if self._calibrate_thresholds:
+                self.__calibrate_thresholds()
 
         # create a progress bar for end users
         progress = ProgressBar(
@@ -295,18 +430,59 @@ class HostExecuteDataSpecification(object):
             "Executing data specifications and loading data for "
             "application vertices")
 
-        for core, reader in progress.over(iteritems(dsg_targets)):
-            x, y, _ = core
-            # write information for the memory map report
-            self._write_info_map[core] = self.__execute(
-                core, reader,
-                self.__select_writer(x, y)
-                if use_monitors else self._txrx.write_memory)
+        if (use_monitors and self._max_parallel_loads > 1 and
+                len(self._core_to_conn_map) > 1):
+            self.__python_app_by_board(dsg_targets, progress)
+        else:
+            for core, write_info in self.__execute_pipelined(
+                    iteritems(dsg_targets),
+                    self.__select_writer if use_monitors
+                    else self.__txrx_writer):
+                # write information for the memory map report
+                self._write_info_map[core] = write_info
+                progress.update()
+            progress.end()
 
         if use_monitors:
             self.__reset_router_timeouts(receiver)
         return self._write_info_map
 
+    def __python_app_by_board(self, dsg_targets, progress):
+        """ Execute and load the data specs of the cores of each board\
+            from a thread of its own, with several boards loaded at once.\
+            Each board is loaded through its own gatherer, which has its own\
+            connection.
+        """
+        cores_by_board = OrderedDict()
+        for core, reader in iteritems(dsg_targets):
+            chip = self._machine.get_chip_at(core[0], core[1])
+            cores_by_board.setdefault(
+                (chip.nearest_ethernet_x, chip.nearest_ethernet_y),
+                list()).append((core, reader))
+
+        # The progress bar and results are shared by all the boards
+        lock = threading.Lock()
+
+        def load_board(cores):
+            for core, write_info in self.__execute_pipelined(
+                    cores, self.__select_writer):
+                with lock:
+                    # write information for the memory map report
+                    self._write_info_map[core] = write_info
+                    progress.update()
+
+        pool = ThreadPoolExecutor(max_workers=min(
+            self._max_parallel_loads, len(cores_by_board)))
+        try:
+            futures = [
+                pool.submit(load_board, cores)
+                for cores in itervalues(cores_by_board)]
+            for future in futures:
+                future.result()
+        finally:
+            pool.shutdown()
+        progress.end()
+
     def __java_app(self, dsg_targets, executable_targets, use_monitors):
         # create a progress bar for end users
         progress = ProgressBar(
@@ -320,8 +496,7 @@ class HostExecuteDataSpecification(object):
         dw_write_info = DsWriteInfo(dsg_targets.get_database())
         dw_write_info.clear_write_info()
         if self._write_info_map is not None:
-            for core, info in iteritems(self._write_info_map):
-                dw_write_info[core] = info
+            dw_write_info.set_infos(iteritems(self._write_info_map))
 
         progress.update()
 
@@ -336,12 +511,15 @@ class HostExecuteDataSpecification(object):
         self._java.execute_app_data_specification(use_monitors)
 
         progress.end()
+        self.__cache_base_addresses(dw_write_info)
         return dw_write_info
 
     def execute_system_data_specs(
             self, transceiver, machine, app_id, dsg_targets,
             executable_targets, report_folder=None, java_caller=None,
-            processor_to_app_data_base_address=None):
+            processor_to_app_data_base_address=None,
+            execution_queue_depth=_DEFAULT_EXECUTION_QUEUE_DEPTH,
+            cache_file=None):
         """ Execute the data specs for all system targets.
 
         :param machine: the python representation of the spinnaker machine
@@ -355,6 +533,13 @@ class HostExecuteDataSpecification(object):
         :param executable_targets: \
             the map between binaries and locations and executable types
         :type executable_targets: ?
+        :param execution_queue_depth: \
+            the most data specs to execute ahead of them being loaded
+        :type execution_queue_depth: int
+        :param cache_file: \
+            the file of the cache of images executed from data specs to\
+            reuse and to add to, or None if they are not to be cached
+        :type cache_file: str
         :return: map of placement and DSG data, and loaded data flag.
         :rtype: dict(tuple(int,int,int),DataWritten)
         """
@@ -367,9 +552,11 @@ class HostExecuteDataSpecification(object):
         self._txrx = transceiver
         self._app_id = app_id
         self._db_folder = report_folder
+        self._execution_queue_depth = execution_queue_depth
         self._java = java_caller
         impl_method = self.__java_sys if java_caller else self.__python_sys
-        return impl_method(dsg_targets, executable_targets)
+        with self.__using_cache(cache_file):
+            return impl_method(dsg_targets, executable_targets)
 
     def __java_sys(self, dsg_targets, executable_targets):
         """ Does the Data Specification Execution and loading using Java
@@ -394,8 +581,7 @@ class HostExecuteDataSpecification(object):
         dw_write_info = DsWriteInfo(dsg_targets.get_database())
         dw_write_info.clear_write_info()
         if self._write_info_map is not None:
-            for core, info in iteritems(self._write_info_map):
-                dw_write_info[core] = info
+            dw_write_info.set_infos(iteritems(self._write_info_map))
 
         progress.update()
 
@@ -408,8 +594,21 @@ class HostExecuteDataSpecification(object):
         self._java.execute_system_data_specification()
 
         progress.end()
+        self.__cache_base_addresses(dw_write_info)
         return dw_write_info
 
+    @staticmethod
+    def __cache_base_addresses(write_info):
+        """ Remember where the data of each core loaded by Java starts, so\
+            that finding its regions later does not have to ask the core.
+
+        :param write_info: map of cores to what was written to them
+        :type write_info: \
+            :py:class:`spinn_front_end_common.interface.ds.ds_write_info.DsWriteInfo`
+        """
+        for (x, y, p), info in iteritems(write_info):
+            cache_region_addresses(x, y, p, info.start_address)
+
     def __python_sys(self, dsg_targets, executable_targets):
         """ Does the Data Specification Execution and loading using Python
 
@@ -429,14 +628,93 @@ class HostExecuteDataSpecification(object):
             len(sys_targets), "Executing data specifications and loading data "
             "for system vertices")
 
-        for core, reader in progress.over(iteritems(sys_targets)):
-            self._write_info_map[core] = self.__execute(
-                core, reader, self._txrx.write_memory)
+        for core, write_info in self.__execute_pipelined(
+                iteritems(sys_targets), self.__txrx_writer):
+            self._write_info_map[core] = write_info
+            progress.update()
+        progress.end()
 
         return self._write_info_map
 
-    def __execute(self, core, reader, writer_func):
+    @contextmanager
+    def __using_cache(self, cache_file):
+        """ Use the cache in a file, if any, while in the context
+        """
+        if cache_file is None:
+            yield
+            return
+        self._cache = DataSpecificationCache(cache_file)
+        try:
+            yield
+        finally:
+            self._cache.close()
+            self._cache = None
+
+    def __txrx_writer(self, x, y):
+        # pylint: disable=unused-argument
+        return self._txrx.write_memory
+
+    def __execute_pipelined(self, cores, select_writer):
+        """ Execute the data specs of some cores and load them, one at a\
+            time. Up to the execution queue depth of specs are executed\
+            ahead, in another thread, while earlier ones are being loaded.
+
+        :param cores: the (core, reader) of each core
+        :type cores: iterable(tuple(tuple(int, int, int), DataRowReader))
+        :param select_writer: \
+            function from the x and y of a chip to the function to write to\
+            it with
+        :return: the core and what was written to it, as each is loaded
+        :rtype: iterable(tuple(tuple(int, int, int), DataWritten))
+        """
+        if self._execution_queue_depth is None or \
+                self._execution_queue_depth <= 1:
+            for core, reader in cores:
+                yield core, self.__load(
+                    core, self.__execute(core, reader), select_writer)
+            return
+
+        # The cores and the futures of their executors, in order
+        waiting = deque()
+        pool = ThreadPoolExecutor(max_workers=1)
+        try:
+            for core, reader in cores:
+                waiting.append(
+                    (core, pool.submit(self.__execute, core, reader)))
+                if len(waiting) >= self._execution_queue_depth:
+                    core, future = waiting.popleft()
+                    yield core, self.__load(
+                        core, future.result(), select_writer)
+            while waiting:
+                core, future = waiting.popleft()
+                yield core, self.__load(core, future.result(), select_writer)
+        finally:
+            for _, future in waiting:
+                future.cancel()
+            pool.shutdown()
+
+    def __execute(self, core, reader):
+        """ Execute the data spec of a core into an image of its data in\
+            memory, or reuse the image kept in the cache if there is one
+
+        :param core: the core the data spec is for
+        :type core: tuple(int, int, int)
+        :param reader: the data spec
+        :type reader: DataRowReader
+        :return: the number of bytes to allocate for the image, its pointer\
+            table relative to its start, and the (offset, data) of each\
+            region with anything written
+        :rtype: tuple(int, numpy.ndarray, list(tuple(int, bytes)))
+        """
         x, y, p = core
+        spec_hash = None
+        if self._cache is not None:
+            spec = reader.read()
+            spec_hash = DataSpecificationCache.hash_spec(spec)
+            image = self._cache.get_image(spec_hash)
+            if image is not None:
+                return image
+            reader = DataRowReader(spec)
 
         # Maximum available memory.
         # However, system updates the memory available independently, so the
@@ -454,7 +732,39 @@ class HostExecuteDataSpecification(object):
                          x, y, p)
             raise
 
-        bytes_allocated = executor.get_constructed_data_size()
+        # Where each region goes, relative to the start; 0 if not there
+        offsets = executor.get_pointer_table(0)
+        regions = list()
+        for region_id in _MEM_REGIONS:
+            region = executor.get_region(region_id)
+            if region is None:
+                continue
+            max_pointer = region.max_write_pointer
+            if region.unfilled or max_pointer == 0:
+                continue
+
+            # Get the data up to what has been written
+            regions.append((
+                int(offsets[region_id]), region.region_data[:max_pointer]))
+
+        image = (executor.get_constructed_data_size(), offsets, regions)
+        if spec_hash is not None:
+            self._cache.set_image(spec_hash, *image)
+        return image
+
+    def __load(self, core, image, select_writer):
+        """ Load the image of the data of a core onto the machine
+
+        :param core: the core the data is for
+        :type core: tuple(int, int, int)
+        :param image: the image, as from __execute
+        :param select_writer: \
+            function from the x and y of a chip to the function to write to\
+            it with
+        :rtype: DataWritten
+        """
+        x, y, p = core
+        bytes_allocated, offsets, regions = image
 
         # allocate memory where the app data is going to be written; this
         # raises an exception in case there is not enough SDRAM to allocate
@@ -464,30 +774,27 @@ class HostExecuteDataSpecification(object):
         # Do the actual writing ------------------------------------
 
         # Write the header and pointer table
-        header = executor.get_header()
-        pointer_table = executor.get_pointer_table(start_address)
-        data_to_write = numpy.concatenate((header, pointer_table)).tostring()
-        # NB: DSE meta-block is always small (i.e., one SDP write)
-        self._txrx.write_memory(x, y, start_address, data_to_write)
+        pointer_table = numpy.where(
+            offsets != 0, offsets + start_address, 0).astype("<u4")
+        data_to_write = numpy.concatenate((_HEADER, pointer_table)).tostring()
+        blocks = [(start_address, data_to_write)]
         bytes_written = len(data_to_write)
 
-        # Write each region
-        for region_id in _MEM_REGIONS:
-            region = executor.get_region(region_id)
-            if region is None:
-                continue
-            max_pointer = region.max_write_pointer
-            if region.unfilled or max_pointer == 0:
-                continue
-
-            # Get the data up to what has been written
-            data = region.region_data[:max_pointer]
-
-            # Write the data to the position
-            writer_func(x, y, pointer_table[region_id], data)
+        # Add each region
+        for offset, data in regions:
+            blocks.append((start_address + offset, data))
             bytes_written += len(data)
 
+        # Write the whole image in as few goes as possible, as each write has
+        # its own set up and confirmation
+        writer_func = select_writer(x, y)
+        for address, data in coalesce_writes(blocks):
+            writer_func(x, y, address, data)
+
         # set user 0 register appropriately to the application data
         write_address_to_user0(self._txrx, x, y, p, start_address)
 
+        # The regions are now known, so they need not be read back later
+        cache_region_addresses(x, y, p, start_address, pointer_table)
+
         return DataWritten(start_address, bytes_allocated, bytes_written)
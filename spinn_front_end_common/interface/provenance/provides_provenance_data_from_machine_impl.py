@@ -17,12 +17,11 @@ import struct
 from enum import Enum
 from six import add_metaclass
 from spinn_utilities.abstract_base import AbstractBase, abstractproperty
-from data_specification.utility_calls import get_region_base_address_offset
 from .abstract_provides_provenance_data_from_machine import (
     AbstractProvidesProvenanceDataFromMachine)
 from spinn_front_end_common.utilities.utility_objs import ProvenanceDataItem
-
-_ONE_WORD = struct.Struct("<I")
+from spinn_front_end_common.utilities.helpful_functions import (
+    locate_memory_region_for_placement)
 
 
 @add_metaclass(AbstractBase)
@@ -71,17 +70,8 @@ class ProvidesProvenanceDataFromMachineImpl(
              + n_additional_data_items) * 4)
 
     def _get_provenance_region_address(self, transceiver, placement):
-
-        # Get the App Data for the core
-        app_data_base_address = transceiver.get_cpu_information_from_core(
-            placement.x, placement.y, placement.p).user[0]
-
-        # Get the provenance region base address
-        base_address_offset = get_region_base_address_offset(
-            app_data_base_address, self._provenance_region_id)
-        base_address = transceiver.read_memory(
-            placement.x, placement.y, base_address_offset, 4)
-        return _ONE_WORD.unpack(base_address)[0]
+        return locate_memory_region_for_placement(
+            placement, self._provenance_region_id, transceiver)
 
     def _read_provenance_data(self, transceiver, placement):
         provenance_address = self._get_provenance_region_address(
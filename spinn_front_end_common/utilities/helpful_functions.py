@@ -20,6 +20,7 @@ from spinn_utilities.log import FormatAdapter
 from spinn_machine import CoreSubsets
 from spinnman.model.enums import CPUState
 from data_specification import utility_calls
+from data_specification.constants import MAX_MEM_REGIONS
 from spinn_front_end_common.utilities.exceptions import ConfigurationException
 from spinn_front_end_common.utilities.utility_objs import (
     ExecutableTargets, ExecutableType)
@@ -28,6 +29,13 @@ from spinnman.model.cpu_infos import CPUInfos
 
 logger = FormatAdapter(logging.getLogger(__name__))
 _ONE_WORD = struct.Struct("<I")
+_REGION_TABLE = struct.Struct("<{}I".format(MAX_MEM_REGIONS))
+
+# (x, y, p) -> base address of the data specification regions of the core
+_region_base_addresses = dict()
+
+# (x, y, p) -> address of each data specification region of the core
+_region_addresses = dict()
 
 
 def locate_extra_monitor_mc_receiver(
@@ -67,6 +75,77 @@ def write_address_to_user0(txrx, x, y, p, address):
     txrx.write_memory(x, y, user_0_address, _ONE_WORD.pack(address))
 
 
+def cache_region_addresses(x, y, p, base_address, region_addresses=None):
+    """ Remember where the data specification regions of a core are, so\
+        that locating them does not need to ask the machine.
+
+    :param x: Chip coordinate.
+    :param y: Chip coordinate.
+    :param p: Core ID on chip.
+    :param base_address: The address in user_0 of the core
+    :type base_address: int
+    :param region_addresses: \
+        The address of each region, or None if only the base address is\
+        known, in which case the addresses are read once when first needed
+    :type region_addresses: iterable(int) or None
+    """
+    # pylint: disable=too-many-arguments
+    _region_base_addresses[x, y, p] = base_address
+    if region_addresses is None:
+        _region_addresses.pop((x, y, p), None)
+    else:
+        _region_addresses[x, y, p] = tuple(
+            int(address) for address in region_addresses)
+
+
+def invalidate_region_addresses(x, y, p):
+    """ Forget where the data specification regions of a core are, as the\
+        data of the core has been reloaded.
+
+    :param x: Chip coordinate.
+    :param y: Chip coordinate.
+    :param p: Core ID on chip.
+    """
+    _region_base_addresses.pop((x, y, p), None)
+    _region_addresses.pop((x, y, p), None)
+
+
+def clear_region_address_cache():
+    """ Forget where the data specification regions of all cores are.
+    """
+    _region_base_addresses.clear()
+    _region_addresses.clear()
+
+
+def get_region_addresses(x, y, p, transceiver):
+    """ Get the address of each data specification region of a core. These\
+        are only read from the machine if they have not been read or\
+        loaded since the data of the core was last reloaded.
+
+    :param x: Chip coordinate.
+    :param y: Chip coordinate.
+    :param p: Core ID on chip.
+    :param transceiver: the python interface to the SpiNNaker machine
+    :type transceiver: :py:class:`~spinnman.Transceiver`
+    :rtype: tuple(int)
+    """
+    core = (x, y, p)
+    addresses = _region_addresses.get(core)
+    if addresses is None:
+        base_address = _region_base_addresses.get(core)
+        if base_address is None:
+            base_address = transceiver.get_cpu_information_from_core(
+                x, y, p).user[0]
+
+        # Read the whole pointer table at once
+        addresses = _REGION_TABLE.unpack_from(transceiver.read_memory(
+            x, y, utility_calls.get_region_base_address_offset(
+                base_address, 0), _REGION_TABLE.size))
+        _region_base_addresses[core] = base_address
+        _region_addresses[core] = addresses
+    return addresses
+
+
 def locate_memory_region_for_placement(placement, region, transceiver):
     """ Get the address of a region for a placement
 
@@ -77,17 +156,8 @@ def locate_memory_region_for_placement(placement, region, transceiver):
     :param transceiver: the python interface to the SpiNNaker machine
     :type transceiver: :py:class:`~spinnman.Transceiver`
     """
-    regions_base_address = transceiver.get_cpu_information_from_core(
-        placement.x, placement.y, placement.p).user[0]
-
-    # Get the position of the region in the pointer table
-    region_offset = utility_calls.get_region_base_address_offset(
-        regions_base_address, region)
-
-    # Get the actual address of the region
-    region_address = transceiver.read_memory(
-        placement.x, placement.y, region_offset, 4)
-    return _ONE_WORD.unpack_from(region_address)[0]
+    return get_region_addresses(
+        placement.x, placement.y, placement.p, transceiver)[region]
 
 
 def convert_string_into_chip_and_core_subset(cores):
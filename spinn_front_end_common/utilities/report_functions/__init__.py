@@ -18,10 +18,12 @@ from .fixed_route_from_machine_report import FixedRouteFromMachineReport
 from .memory_map_on_host_chip_report import MemoryMapOnHostChipReport
 from .memory_map_on_host_report import MemoryMapOnHostReport
 from .routing_table_from_machine_report import RoutingTableFromMachineReport
+from .transfer_metrics_report import TransferMetricsReport
 
 __all__ = [
     "EnergyReport",
     "FixedRouteFromMachineReport",
     "MemoryMapOnHostChipReport",
     "MemoryMapOnHostReport",
-    "RoutingTableFromMachineReport"]
+    "RoutingTableFromMachineReport",
+    "TransferMetricsReport"]
@@ -0,0 +1,39 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from spinn_front_end_common.utility_models import (
+    DataSpeedUpPacketGatherMachineVertex)
+
+
+class TransferMetricsReport(object):
+    """ Report on each transfer of data to or from the machine.
+    """
+
+    def __call__(
+            self, report_default_directory, machine_graph,
+            buffer_manager=None):
+        """ Appends the transfers measured since the last report to\
+            transfer_metrics.jsonl, one JSON object per transfer.
+
+        :param report_default_directory: the folder where reports are written
+        :param machine_graph: the graph holding the data speed up gatherers
+        :param buffer_manager: the buffer manager, if there is one
+        :rtype: None
+        """
+        for vertex in machine_graph.vertices:
+            if isinstance(vertex, DataSpeedUpPacketGatherMachineVertex):
+                vertex.transfer_metrics.write(report_default_directory)
+        if buffer_manager is not None:
+            buffer_manager.transfer_metrics.write(report_default_directory)
@@ -0,0 +1,89 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import functools
+from spinnman.constants import UDP_MESSAGE_MAX_SIZE
+from spinnman.messages.scp.impl import ReadMemory
+from spinnman.processes import AbstractMultiConnectionProcess
+
+#: The default number of reads outstanding on each board at once
+DEFAULT_CHANNELS_PER_BOARD = 8
+
+
+class ReadMemoriesProcess(AbstractMultiConnectionProcess):
+    """ A process for reading many blocks of memory, possibly from many\
+        chips, with the reads for all of them in flight together. Reads for\
+        each board share a request pipeline, so at most ``n_channels`` are\
+        outstanding on any one board.
+    """
+
+    def __init__(self, connection_selector,
+                 n_channels=DEFAULT_CHANNELS_PER_BOARD):
+        """
+        :param connection_selector: How to choose the connection for a chip
+        :type connection_selector: \
+            :py:class:`spinnman.connections.abstract_classes.AbstractConnectionSelector`
+        :param n_channels: The most reads outstanding on each board
+        :type n_channels: int
+        """
+        n_channels = max(1, n_channels)
+        super(ReadMemoriesProcess, self).__init__(
+            connection_selector, n_channels=n_channels,
+            intermediate_channel_waits=n_channels - 1)
+        self._callback = None
+        self._blocks = dict()
+
+    def _handle_response(self, key, offset, response):
+        data, view, n_outstanding = self._blocks[key]
+        view[offset:offset + response.length] = response.data[
+            response.offset:response.offset + response.length]
+        if n_outstanding > 1:
+            self._blocks[key] = (data, view, n_outstanding - 1)
+        else:
+            del self._blocks[key]
+            self._callback(key, data)
+
+    def read_memories(self, reads, callback):
+        """ Read blocks of memory, calling back as each is completed.
+
+        :param reads: \
+            The blocks to read, each as (x, y, base_address, length, key)\
+            where the key identifies the block to the callback and must be\
+            unique
+        :type reads: iterable(tuple(int, int, int, int, object))
+        :param callback: \
+            Called with (key, data) when all of a block has been read; the\
+            blocks may complete in any order
+        :type callback: callable(object, bytearray)
+        """
+        self._callback = callback
+        self._blocks = dict()
+        for x, y, base_address, length, key in reads:
+            data = bytearray(length)
+            if not length:
+                callback(key, data)
+                continue
+            n_packets = (
+                (length + UDP_MESSAGE_MAX_SIZE - 1) // UDP_MESSAGE_MAX_SIZE)
+            self._blocks[key] = (data, memoryview(data), n_packets)
+            offset = 0
+            while offset < length:
+                n_bytes = min(length - offset, UDP_MESSAGE_MAX_SIZE)
+                self._send_request(
+                    ReadMemory(x, y, base_address + offset, n_bytes),
+                    functools.partial(self._handle_response, key, offset))
+                offset += n_bytes
+        self._finish()
+        self.check_for_error()
@@ -21,7 +21,10 @@ from .executable_type import ExecutableType
 from .live_packet_gather_parameters import LivePacketGatherParameters
 from .provenance_data_item import ProvenanceDataItem
 from .reinjection_status import ReInjectionStatus
+from .transfer_metrics import TransferMetrics
+from .transmission_pacer import TransmissionPacer
 
 __all__ = ["DataWritten", "DPRIFlags", "ExecutableFinder", "ExecutableType",
            "LivePacketGatherParameters", "ProvenanceDataItem",
-           "ReInjectionStatus", "ExecutableTargets"]
+           "ReInjectionStatus", "ExecutableTargets", "TransferMetrics",
+           "TransmissionPacer"]
@@ -13,6 +13,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from .checksum_sdram_message import (
+    ChecksumSDRAMMessage, ChecksumSDRAMMessageResponse)
 from .clear_reinjection_queue_message import ClearReinjectionQueueMessage
 from .get_reinjection_status_message import (
     GetReinjectionStatusMessage, GetReinjectionStatusMessageResponse)
@@ -30,4 +32,5 @@ __all__ = [
     "ResetCountersMessage", "SetReinjectionPacketTypesMessage",
     "SetRouterEmergencyTimeoutMessage", "SetRouterTimeoutMessage",
     "ClearReinjectionQueueMessage", "LoadApplicationMCRoutesMessage",
-    "LoadSystemMCRoutesMessage"]
+    "LoadSystemMCRoutesMessage", "ChecksumSDRAMMessage",
+    "ChecksumSDRAMMessageResponse"]
@@ -0,0 +1,91 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import struct
+from spinnman.exceptions import SpinnmanUnexpectedResponseCodeException
+from spinnman.messages.scp import SCPRequestHeader
+from spinnman.messages.scp.abstract_messages import (
+    AbstractSCPRequest, AbstractSCPResponse)
+from spinnman.messages.scp.enums import SCPResult
+from spinnman.messages.sdp import SDPFlag, SDPHeader
+from spinn_front_end_common.utilities.constants import SDP_PORTS
+from .speedup_in_scp_commands import SpeedupInSCPCommands
+
+_ONE_WORD = struct.Struct("<I")
+
+
+class ChecksumSDRAMMessage(AbstractSCPRequest):
+    """ An SCP Request to sum a block of SDRAM as 32-bit words, so that data\
+        written there can be checked without reading it back
+    """
+
+    __slots__ = []
+
+    def __init__(self, x, y, p, base_address, n_bytes):
+        """
+        :param x: The x-coordinate of a chip, between 0 and 255
+        :type x: int
+        :param y: The y-coordinate of a chip, between 0 and 255
+        :type y: int
+        :param p: The processor running the extra monitor vertex, between\
+            0 and 17
+        :type p: int
+        :param base_address: The address of the block to sum
+        :type base_address: int
+        :param n_bytes: The number of bytes in the block to sum
+        :type n_bytes: int
+        """
+        # pylint: disable=too-many-arguments
+        super(ChecksumSDRAMMessage, self).__init__(
+            SDPHeader(
+                flags=SDPFlag.REPLY_EXPECTED,
+                destination_port=(
+                    SDP_PORTS.EXTRA_MONITOR_CORE_DATA_IN_SPEED_UP.value),
+                destination_cpu=p, destination_chip_x=x,
+                destination_chip_y=y),
+            SCPRequestHeader(command=SpeedupInSCPCommands.CHECKSUM_SDRAM),
+            argument_1=base_address, argument_2=n_bytes)
+
+    def get_scp_response(self):
+        return ChecksumSDRAMMessageResponse(
+            SpeedupInSCPCommands.CHECKSUM_SDRAM)
+
+
+class ChecksumSDRAMMessageResponse(AbstractSCPResponse):
+    """ An SCP response to a request to sum a block of SDRAM
+    """
+
+    def __init__(self, command_code):
+        super(ChecksumSDRAMMessageResponse, self).__init__()
+        self._checksum = None
+        self._command_code = command_code
+
+    def read_data_bytestring(self, data, offset):
+        """ See\
+            :py:meth:`spinnman.messages.scp.abstract_scp_response.AbstractSCPResponse.read_data_bytestring`
+        """
+        result = self.scp_response_header.result
+        if result != SCPResult.RC_OK:
+            raise SpinnmanUnexpectedResponseCodeException(
+                "Checksum SDRAM", self._command_code, result.name)
+        self._checksum, = _ONE_WORD.unpack_from(data, offset)
+
+    @property
+    def checksum(self):
+        """ The sum of the block, modulo 2^32
+
+        :rtype: int
+        """
+        return self._checksum
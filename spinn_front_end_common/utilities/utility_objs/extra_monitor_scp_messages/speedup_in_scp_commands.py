@@ -21,7 +21,8 @@ class SpeedupInSCPCommands(Enum):
     """
     SAVE_APPLICATION_MC_ROUTES = 6,
     LOAD_APPLICATION_MC_ROUTES = 7,
-    LOAD_SYSTEM_MC_ROUTES = 8
+    LOAD_SYSTEM_MC_ROUTES = 8,
+    CHECKSUM_SDRAM = 9
 
     def __new__(cls, value, doc=""):
         # pylint: disable=protected-access, unused-argument
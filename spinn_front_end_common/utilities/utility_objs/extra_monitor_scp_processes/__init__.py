@@ -22,9 +22,10 @@ from .set_router_timeout_process import SetRouterTimeoutProcess
 from .clear_queue_process import ClearQueueProcess
 from .load_application_mc_routes_process import LoadApplicationMCRoutesProcess
 from .load_system_mc_routes_process import LoadSystemMCRoutesProcess
+from .checksum_sdram_process import ChecksumSDRAMProcess
 
 __all__ = [
     "ReadStatusProcess", "ResetCountersProcess", "SetPacketTypesProcess",
     "SetRouterEmergencyTimeoutProcess", "SetRouterTimeoutProcess",
     "ClearQueueProcess", "LoadApplicationMCRoutesProcess",
-    "LoadSystemMCRoutesProcess"]
+    "LoadSystemMCRoutesProcess", "ChecksumSDRAMProcess"]
@@ -0,0 +1,63 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from spinn_front_end_common.utilities.utility_objs.\
+    extra_monitor_scp_messages import (
+        ChecksumSDRAMMessage)
+from spinnman.processes.abstract_multi_connection_process import (
+    AbstractMultiConnectionProcess)
+
+#: The most bytes summed by a single request, so that each is answered well
+#: within the SCP timeout
+MAX_BYTES_PER_CHECKSUM = 1024 * 1024
+
+_CHECKSUM_MASK = 0xFFFFFFFF
+
+
+class ChecksumSDRAMProcess(AbstractMultiConnectionProcess):
+    def __init__(self, connection_selector):
+        super(ChecksumSDRAMProcess, self).__init__(connection_selector)
+        self._checksum = 0
+
+    def _handle_checksum_response(self, response):
+        self._checksum = (self._checksum + response.checksum) & _CHECKSUM_MASK
+
+    def checksum_sdram(self, x, y, p, base_address, n_bytes):
+        """ Sum a block of SDRAM as little-endian 32-bit words, modulo 2^32,\
+            with any bytes after the last whole word zero-padded to a word.\
+            Large blocks are summed in pieces, and the sums of the pieces\
+            added together.
+
+        :param x: The x-coordinate of the chip
+        :param y: The y-coordinate of the chip
+        :param p: The processor running the extra monitor vertex on the chip
+        :param base_address: The address of the block to sum
+        :param n_bytes: The number of bytes in the block to sum
+        :rtype: int
+        """
+        # pylint: disable=too-many-arguments
+        self._checksum = 0
+        offset = 0
+        while offset < n_bytes:
+            # Pieces other than the last are whole words, so no padding is
+            # summed except at the end of the block
+            length = min(n_bytes - offset, MAX_BYTES_PER_CHECKSUM)
+            self._send_request(
+                ChecksumSDRAMMessage(x, y, p, base_address + offset, length),
+                callback=self._handle_checksum_response)
+            offset += length
+        self._finish()
+        self.check_for_error()
+        return self._checksum
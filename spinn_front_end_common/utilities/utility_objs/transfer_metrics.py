@@ -0,0 +1,279 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from .provenance_data_item import ProvenanceDataItem
+
+#: The name of the file, in the report folder, that transfers are written to
+TRANSFER_METRICS_FILE_NAME = "transfer_metrics.jsonl"
+
+#: The most transfers that are kept waiting to be written to the file;
+#: transfers beyond this are still summarised, but not written
+DEFAULT_MAX_PENDING_TRANSFERS = 10000
+
+_BYTES_PER_MEGABYTE = 1024.0 * 1024.0
+
+# Several sources may write the file at once
+_FILE_LOCK = threading.Lock()
+
+
+class _Summary(object):
+    """ The totals of the transfers along one path to or from one board
+    """
+
+    __slots__ = [
+        # The number of transfers
+        "n_transfers",
+
+        # The number of bytes moved
+        "n_bytes",
+
+        # The time during which at least one transfer was in progress
+        "seconds",
+
+        # The latest end of a transfer so far
+        "_end_so_far",
+
+        # The number of rounds of retransmission
+        "retransmit_rounds",
+
+        # The number of times a transfer timed out waiting
+        "timeouts",
+
+        # The time spent waiting for space to store the data
+        "queue_wait"
+    ]
+
+    def __init__(self):
+        self.n_transfers = 0
+        self.n_bytes = 0
+        self.seconds = 0.0
+        self._end_so_far = None
+        self.retransmit_rounds = 0
+        self.timeouts = 0
+        self.queue_wait = 0.0
+
+    def add(self, n_bytes, start, end, retransmit_rounds, timeouts,
+            queue_wait):
+        # pylint: disable=too-many-arguments
+        self.n_transfers += 1
+        self.n_bytes += n_bytes
+        # Transfers are recorded as they finish, so only the part of each
+        # after the end of the ones before it is new busy time
+        if self._end_so_far is None or start > self._end_so_far:
+            self.seconds += end - start
+            self._end_so_far = end
+        elif end > self._end_so_far:
+            self.seconds += end - self._end_so_far
+            self._end_so_far = end
+        self.retransmit_rounds += retransmit_rounds
+        self.timeouts += timeouts
+        self.queue_wait += queue_wait
+
+
+class TransferMetrics(object):
+    """ Measurements of the transfers of data to or from the machine made\
+        by one component. These are summarised per path and per board as\
+        provenance. Each transfer is also kept until :py:meth:`write` adds\
+        it to a file, one transfer per line as JSON, so that slow boards\
+        and cores can be found.
+    """
+
+    __slots__ = [
+        # The name of the component doing the transfers
+        "_source",
+
+        # The totals of the transfers, by (path, board name)
+        "_summaries",
+
+        # The slowest transfer with data, as a dict, by path
+        "_slowest",
+
+        # The transfers recorded since they were last written, as dicts
+        "_transfers",
+
+        # The most transfers kept waiting to be written
+        "_max_pending",
+
+        # The number of transfers not kept, as too many were waiting
+        "_n_not_written",
+
+        # Lock so that transfers can be recorded from several threads
+        "_lock"
+    ]
+
+    def __init__(self, source, max_pending=DEFAULT_MAX_PENDING_TRANSFERS):
+        """
+        :param source: The name of the component doing the transfers
+        :type source: str
+        :param max_pending: \
+            The most transfers kept waiting to be written to the file
+        :type max_pending: int
+        """
+        self._source = source
+        self._summaries = OrderedDict()
+        self._slowest = OrderedDict()
+        self._transfers = list()
+        self._max_pending = max_pending
+        self._n_not_written = 0
+        self._lock = threading.Lock()
+
+    def record(
+            self, path, board, x, y, p, n_bytes, start, end,
+            retransmit_rounds=0, timeouts=0, queue_wait=0.0):
+        """ Record a transfer
+
+        :param path: How the data was moved, e.g. "scp" or "data_in"
+        :type path: str
+        :param board: \
+            The (x, y) of the Ethernet chip of the board, or None if not known
+        :type board: tuple(int, int) or None
+        :param x: The x coordinate of the chip the data was on
+        :type x: int
+        :param y: The y coordinate of the chip the data was on
+        :type y: int
+        :param p: The core the data belongs to, or None if not a core
+        :type p: int or None
+        :param n_bytes: The number of bytes moved
+        :type n_bytes: int
+        :param start: When the transfer started, from time.time()
+        :type start: float
+        :param end: When the transfer ended, from time.time()
+        :type end: float
+        :param retransmit_rounds: How many rounds of retransmission there were
+        :type retransmit_rounds: int
+        :param timeouts: How many times the transfer timed out waiting
+        :type timeouts: int
+        :param queue_wait: \
+            How long, in seconds, was spent waiting for space to store the\
+            data afterwards
+        :type queue_wait: float
+        """
+        # pylint: disable=too-many-arguments
+        transfer = OrderedDict()
+        transfer["source"] = self._source
+        transfer["path"] = path
+        transfer["board"] = list(board) if board is not None else None
+        transfer["x"] = x
+        transfer["y"] = y
+        transfer["p"] = p
+        transfer["bytes"] = n_bytes
+        transfer["start"] = start
+        transfer["seconds"] = end - start
+        transfer["mbs"] = self._megabytes_per_second(n_bytes, end - start)
+        transfer["retransmit_rounds"] = retransmit_rounds
+        transfer["timeouts"] = timeouts
+        transfer["queue_wait"] = queue_wait
+        board_name = (
+            "board{}:{}".format(*board) if board is not None
+            else "unknown_board")
+        with self._lock:
+            summary = self._summaries.get((path, board_name))
+            if summary is None:
+                summary = _Summary()
+                self._summaries[path, board_name] = summary
+            summary.add(
+                n_bytes, start, end, retransmit_rounds, timeouts, queue_wait)
+            if transfer["mbs"] is not None and n_bytes and (
+                    path not in self._slowest or
+                    transfer["mbs"] < self._slowest[path]["mbs"]):
+                self._slowest[path] = transfer
+            if len(self._transfers) < self._max_pending:
+                self._transfers.append(transfer)
+            else:
+                self._n_not_written += 1
+
+    @staticmethod
+    def _megabytes_per_second(n_bytes, seconds):
+        if seconds <= 0:
+            return None
+        return n_bytes / _BYTES_PER_MEGABYTE / seconds
+
+    def get_provenance_data(self):
+        """ Summarise all the transfers recorded, by path and by board. Time\
+            is the time during which at least one transfer was in progress,\
+            so overlapping transfers are not counted twice.
+
+        :rtype: list(ProvenanceDataItem)
+        """
+        with self._lock:
+            summaries = list(self._summaries.items())
+            slowest = list(self._slowest.items())
+            n_not_written = self._n_not_written
+
+        items = list()
+        for (path, board_name), summary in summaries:
+            names = [self._source, "transfers", path, board_name]
+            items.append(ProvenanceDataItem(
+                names + ["n_transfers"], summary.n_transfers, report=False))
+            items.append(ProvenanceDataItem(
+                names + ["bytes"], summary.n_bytes, report=False))
+            items.append(ProvenanceDataItem(
+                names + ["seconds"], summary.seconds, report=False))
+            mbs = self._megabytes_per_second(summary.n_bytes, summary.seconds)
+            if mbs is not None:
+                items.append(ProvenanceDataItem(
+                    names + ["megabytes_per_second"], mbs, report=False))
+            items.append(ProvenanceDataItem(
+                names + ["retransmit_rounds"], summary.retransmit_rounds,
+                report=False))
+            items.append(ProvenanceDataItem(
+                names + ["timeouts"], summary.timeouts, report=False))
+            items.append(ProvenanceDataItem(
+                names + ["queue_wait_seconds"], summary.queue_wait,
+                report=False))
+        for path, transfer in slowest:
+            items.append(ProvenanceDataItem(
+                [self._source, "transfers", path, "slowest_core",
+                 "{}:{}:{}".format(transfer["x"], transfer["y"],
+                                   transfer["p"]),
+                 "megabytes_per_second"],
+                transfer["mbs"], report=False))
+        if n_not_written:
+            items.append(ProvenanceDataItem(
+                [self._source, "transfers", "n_not_written"],
+                n_not_written, report=False))
+        return items
+
+    def write(self, report_folder):
+        """ Append the transfers recorded since they were last written to\
+            the transfer metrics file in a folder, one JSON object per line,\
+            and forget them.
+
+        :param report_folder: The folder to write the file in
+        :type report_folder: str
+        """
+        with self._lock:
+            transfers, self._transfers = self._transfers, list()
+        if not transfers:
+            return
+        with _FILE_LOCK:
+            with open(os.path.join(
+                    report_folder, TRANSFER_METRICS_FILE_NAME), "a") as f:
+                for transfer in transfers:
+                    f.write(json.dumps(transfer))
+                    f.write("\n")
+
+    @property
+    def transfers(self):
+        """ The transfers recorded since they were last written
+
+        :rtype: list(dict)
+        """
+        with self._lock:
+            return list(self._transfers)
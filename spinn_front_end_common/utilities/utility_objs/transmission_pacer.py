@@ -0,0 +1,136 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+
+#: The fraction of packets that may be lost in a round without slowing down
+DEFAULT_LOSS_TOLERANCE = 0.01
+
+
+class TransmissionPacer(object):
+    """ Spaces out the packets sent to a board, adapting the gap between\
+        them to the loss seen. After a round of packets with little loss\
+        the gap is shortened by a fixed step, and after a round with more\
+        loss it is doubled (additive increase, multiplicative decrease of\
+        the rate). The gap is kept between transfers, so each transfer\
+        starts at the rate the previous one found.
+    """
+
+    __slots__ = [
+        # The current gap between packets, in seconds
+        "_gap",
+
+        # The shortest gap allowed, in seconds
+        "_min_gap",
+
+        # The longest gap allowed, in seconds
+        "_max_gap",
+
+        # The amount the gap is shortened by after a round without loss
+        "_gap_step",
+
+        # The fraction of packets that may be lost without slowing down
+        "_loss_tolerance",
+
+        # When the next packet may be sent, from time.time()
+        "_next_send",
+
+        # The number of rounds in which too many packets were lost
+        "_n_lossy_rounds",
+
+        # The number of rounds observed
+        "_n_rounds"
+    ]
+
+    def __init__(self, initial_gap, min_gap, max_gap, gap_step,
+                 loss_tolerance=DEFAULT_LOSS_TOLERANCE):
+        """
+        :param initial_gap: The gap between packets to start with, in seconds
+        :type initial_gap: float
+        :param min_gap: The shortest gap allowed, in seconds
+        :type min_gap: float
+        :param max_gap: The longest gap allowed, in seconds
+        :type max_gap: float
+        :param gap_step: \
+            The amount the gap is shortened by after a round without loss,\
+            and the least it is lengthened to after a round with loss
+        :type gap_step: float
+        :param loss_tolerance: \
+            The fraction of the packets of a round that may be lost without\
+            slowing down
+        :type loss_tolerance: float
+        """
+        # pylint: disable=too-many-arguments
+        self._min_gap = min_gap
+        self._max_gap = max_gap
+        self._gap = min(max(initial_gap, min_gap), max_gap)
+        self._gap_step = gap_step
+        self._loss_tolerance = loss_tolerance
+        self._next_send = 0.0
+        self._n_lossy_rounds = 0
+        self._n_rounds = 0
+
+    def wait(self):
+        """ Wait until the next packet may be sent. Time spent since the\
+            last packet was sent, e.g. building this one, counts towards\
+            the gap.
+        """
+        now = time.time()
+        if self._next_send > now:
+            time.sleep(self._next_send - now)
+            now = self._next_send
+        self._next_send = now + self._gap
+
+    def observe(self, n_sent, n_lost):
+        """ Adapt the gap to how many packets of a round were lost.
+
+        :param n_sent: The number of packets sent in the round
+        :type n_sent: int
+        :param n_lost: The number of those packets that were lost
+        :type n_lost: int
+        """
+        if not n_sent:
+            return
+        self._n_rounds += 1
+        if n_lost > n_sent * self._loss_tolerance:
+            self._n_lossy_rounds += 1
+            self._gap = min(
+                self._max_gap, max(self._gap * 2, self._gap_step))
+        else:
+            self._gap = max(self._min_gap, self._gap - self._gap_step)
+
+    @property
+    def gap(self):
+        """ The current gap between packets, in seconds
+
+        :rtype: float
+        """
+        return self._gap
+
+    @property
+    def n_rounds(self):
+        """ The number of rounds observed
+
+        :rtype: int
+        """
+        return self._n_rounds
+
+    @property
+    def n_lossy_rounds(self):
+        """ The number of rounds in which too many packets were lost
+
+        :rtype: int
+        """
+        return self._n_lossy_rounds
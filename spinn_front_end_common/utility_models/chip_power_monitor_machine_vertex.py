@@ -16,7 +16,6 @@
 import math
 import logging
 from enum import Enum
-import numpy
 from data_specification.enums import DataType
 from pacman.executor.injection_decorator import (
     inject_items, supports_injection)
@@ -277,18 +276,16 @@ class ChipPowerMonitorMachineVertex(
         :param placement: the location on machine to get data from
         :param buffer_manager: the buffer manager that might have data
         :return: results
-        :rtype: numpy array with 1 dimension
+        :rtype: numpy array with 2 dimensions
         """
         # for buffering output info is taken form the buffer manager
-        # get raw data as a byte array
-        record_raw, data_missing = buffer_manager.get_data_by_placement(
-            placement, self.SAMPLE_RECORDING_REGION)
+        # get raw data as an array of samples
+        record_raw, data_missing = buffer_manager.get_region_array(
+            placement, self.SAMPLE_RECORDING_REGION, "uint32", (-1, 18))
         if data_missing:
             logger.warning(
                 "Chip Power monitor has lost data on chip({}, {})",
                 placement.x, placement.y)
 
-        results = (
-            numpy.frombuffer(record_raw, dtype="uint32").reshape(-1, 18) /
-            self.n_samples_per_recording)
+        results = record_raw / self.n_samples_per_recording
         return results
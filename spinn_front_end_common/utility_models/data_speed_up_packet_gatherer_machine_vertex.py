@@ -19,19 +19,29 @@ except ImportError:
     from collections import defaultdict
 import os
 import datetime
+import json
 import logging
 import time
+import select
+import socket
 import struct
 import sys
+import threading
+from collections import deque, OrderedDict
 from enum import Enum
+import numpy
 from six.moves import xrange
-from six import reraise
+from six import raise_from, reraise
 from spinn_utilities.overrides import overrides
 from spinn_utilities.log import FormatAdapter
-from spinnman.exceptions import SpinnmanTimeoutException
+from spinnman.constants import SCP_SCAMP_PORT
+from spinnman.exceptions import SpinnmanIOException, SpinnmanTimeoutException
+from spinnman.messages.scp.enums import SCPResult
 from spinnman.messages.sdp import SDPMessage, SDPHeader, SDPFlag
 from spinnman.messages.scp.impl.iptag_set import IPTagSet
-from spinnman.connections.udp_packet_connections import SCAMPConnection
+from spinnman.connections.udp_packet_connections.utils import (
+    bind_socket, connect_socket, get_socket, resolve_host,
+    set_receive_buffer_size, update_sdp_header_for_udp_send)
 from spinnman.model.enums.cpu_state import CPUState
 from pacman.executor.injection_decorator import inject_items
 from pacman.model.graphs.common import EdgeTrafficType
@@ -47,7 +57,7 @@ from spinn_front_end_common.abstract_models import (
 from spinn_front_end_common.interface.provenance import (
     AbstractProvidesLocalProvenanceData)
 from spinn_front_end_common.utilities.utility_objs import (
-    ExecutableType, ProvenanceDataItem)
+    ExecutableType, ProvenanceDataItem, TransferMetrics, TransmissionPacer)
 from spinn_front_end_common.utilities.constants import (
     SDP_PORTS, SYSTEM_BYTES_REQUIREMENT, SIMULATION_N_BYTES)
 from spinn_front_end_common.utilities.exceptions import SpinnFrontEndException
@@ -88,10 +98,19 @@ SEQUENCE_NUMBER_SIZE_IN_ITEMS = 1
 WORDS_PER_FULL_PACKET_WITH_SEQUENCE_NUM = \
     WORDS_PER_FULL_PACKET - SEQUENCE_NUMBER_SIZE_IN_ITEMS
 
-# points where SDP beats data speed up due to overheads
+# points where SDP beats data speed up due to overheads; used for a board
+# until they have been measured for it
 THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_EXTRACTOR_IN_BYTES = 40000
 THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_INPUT_IN_BYTES = 300
 
+# the sizes of transfer timed with and without data speed up to measure
+# where SDP stops being better on a board
+DATA_OUT_CALIBRATION_SIZES_IN_BYTES = (4096, 16384, 65536, 262144)
+DATA_IN_CALIBRATION_SIZES_IN_BYTES = (64, 256, 1024, 4096)
+
+# the number of times each size is timed; the quickest time is used
+CALIBRATION_REPEATS = 3
+
 # offset where data in starts on first command
 # (command, base_address, x&y, max_seq_number)
 WORDS_FOR_COMMAND_AND_ADDRESS_HEADER = 4
@@ -126,10 +145,14 @@ _DATA_REGIONS = Enum(
            ('CONFIG', 1),
            ('CHIP_TO_KEY_SPACE', 2)])
 
+# the most ranges of memory that can be read in one data out transfer
+MAX_DATA_OUT_RANGES = 16
+
 # command IDs for the SDP packets for data out
 DATA_OUT_COMMANDS = Enum(
     value="DATA_OUT_COMMANDS", names=[
         ("START_SENDING", 100),
+        ("START_SENDING_RANGES", 101),
         ("START_MISSING_SEQ", 1000),
         ("MISSING_SEQ", 1001),
         ("CLEAR", 2000)])
@@ -149,11 +172,41 @@ _ONE_WORD = struct.Struct("<I")
 _TWO_WORDS = struct.Struct("<II")
 _THREE_WORDS = struct.Struct("<III")
 _FOUR_WORDS = struct.Struct("<IIII")
+_TWO_SHORTS = struct.Struct("<2H")
+_TWO_SKIP = struct.Struct("<2x")
 
-# Set to true to check that the data is correct after it has been sent in.
-# This is expensive, and only works in Python 3.5 or later.
+# the receive buffer size of the connection to a gatherer, and the most bytes
+# of a packet that are read from it; as for SpiNNMan's connections
+_RECEIVE_BUFFER_SIZE = 1048576
+_MAX_PACKET_SIZE = 300
+
+# Set to true to check that the data is correct after it has been sent in by
+# reading it all back. This is expensive, and only works in Python 3.5 or
+# later; send_data_into_spinnaker can instead be asked to compare checksums.
 VERIFY_SENT_DATA = False
 
+# Gatherers on different boards may be extracting or loading at the same
+# time, but they share the reports of routers used and of data in speeds
+_REPORT_LOCK = threading.Lock()
+
+
+def _quickest_time(transfer, *args):
+    """ The shortest time taken to do a transfer over several attempts
+
+    :param transfer: the function doing the transfer
+    :param args: the arguments of the function
+    :return: the time in seconds
+    :rtype: float
+    """
+    quickest = None
+    for _ in xrange(CALIBRATION_REPEATS):
+        start = time.time()
+        transfer(*args)
+        taken = time.time() - start
+        if quickest is None or taken < quickest:
+            quickest = taken
+    return quickest
+
 
 def ceildiv(dividend, divisor):
     """ How to divide two possibly-integer numbers and round up.
@@ -163,6 +216,26 @@ def ceildiv(dividend, divisor):
     return int(q) + (r != 0)
 
 
+def data_checksum(data):
+    """ The checksum that an extra monitor computes of data in SDRAM: the\
+        sum of the data as little-endian 32-bit words, modulo 2^32, with any\
+        bytes after the last whole word zero-padded to a word.
+
+    :param data: The data to sum
+    :type data: bytes or bytearray
+    :rtype: int
+    """
+    n_bytes = len(data)
+    n_whole = n_bytes - n_bytes % WORD_SIZE
+    total = int(numpy.frombuffer(
+        data, dtype="<u4", count=n_whole // WORD_SIZE).sum(
+            dtype="uint64"))
+    if n_whole < n_bytes:
+        total += _ONE_WORD.unpack(bytes(data[n_whole:]).ljust(
+            WORD_SIZE, b"\0"))[0]
+    return total & 0xFFFFFFFF
+
+
 # SDRAM requirement for storing missing SDP packets seq nums
 SDRAM_FOR_MISSING_SDP_SEQ_NUMS = ceildiv(
     120.0 * 1024 * 1024,
@@ -175,6 +248,8 @@ class DataSpeedUpPacketGatherMachineVertex(
     __slots__ = [
         "_x", "_y",
         "_app_id",
+        # the connection to the gatherer, kept open and tagged between
+        # transfers; None if not open
         "_connection",
         # store of the extra monitors to location. helpful in data in
         "_extra_monitors_by_chip",
@@ -203,6 +278,22 @@ class DataSpeedUpPacketGatherMachineVertex(
         # tracker for expected missing seq nums
         "_total_expected_missing_seq_packets",
         "_write_data_speed_up_reports",
+        # measurements of the transfers done
+        "_transfer_metrics",
+        # the pacing of data in packets
+        "_data_in_pacer",
+        # the pacing of the packets asking for missing data out
+        "_data_out_pacer",
+        # the number of data in packets sent in the last round
+        "_n_data_in_packets_sent",
+        # the number of missing sequence numbers last asked for, or None
+        "_n_seq_nums_requested",
+        # the size from which data out uses data speed up on this board
+        "_data_out_threshold",
+        # the size from which data in uses data speed up on this board
+        "_data_in_threshold",
+        # whether the thresholds have been measured or read for this board
+        "_thresholds_calibrated",
         # data holder for output
         "_view"]
 
@@ -220,6 +311,16 @@ class DataSpeedUpPacketGatherMachineVertex(
 
     # throttle on the transmission
     TRANSMISSION_THROTTLE_TIME = 0.000001
+    # the shortest gap between data in packets, which they also start with.
+    # Sleeping for TRANSMISSION_THROTTLE_TIME really takes this long on a
+    # Linux host (measured at 50-60 us), so this was the gap between
+    # packets before they were paced
+    MIN_TRANSMISSION_THROTTLE_TIME = 0.00005
+    # the amount the gap between data in packets shrinks by after a round
+    # without loss
+    TRANSMISSION_THROTTLE_STEP = 0.000005
+    # the longest gap between data in packets
+    MAX_TRANSMISSION_THROTTLE_TIME = 0.001
 
     # TRAFFIC_TYPE = EdgeTrafficType.MULTICAST
     TRAFFIC_TYPE = EdgeTrafficType.FIXED_ROUTE
@@ -235,14 +336,15 @@ class DataSpeedUpPacketGatherMachineVertex(
 
     # time outs used by the protocol for separate bits
     TIMEOUT_PER_RECEIVE_IN_SECONDS = 1
+    # the gap the pacing of missing sequence number requests starts with
     TIME_OUT_FOR_SENDING_IN_SECONDS = 0.01
+    # the shortest and longest gaps between missing sequence number requests
+    MIN_TIME_OUT_FOR_SENDING_IN_SECONDS = 0.0005
+    MAX_TIME_OUT_FOR_SENDING_IN_SECONDS = 0.1
 
     # end flag for missing seq nums
     MISSING_SEQ_NUMS_END_FLAG = 0xFFFFFFFF
 
-    _ADDRESS_PACKET_BYTE_FORMAT = struct.Struct(
-        "<{}B".format(BYTES_IN_FULL_PACKET_WITH_ADDRESS))
-
     # Router timeouts, in mantissa,exponent form. See datasheet for details
     LONG_TIMEOUT = (14, 14)
     SHORT_TIMEOUT = (1, 1)
@@ -291,20 +393,70 @@ class DataSpeedUpPacketGatherMachineVertex(
         self._in_report_path = \
             os.path.join(report_default_directory, self.IN_REPORT_NAME)
         self._write_data_speed_up_reports = write_data_speed_up_reports
+        self._transfer_metrics = TransferMetrics(self.label)
+
+        # The pacing of packets to this board, kept between transfers
+        self._data_in_pacer = TransmissionPacer(
+            self.MIN_TRANSMISSION_THROTTLE_TIME,
+            self.MIN_TRANSMISSION_THROTTLE_TIME,
+            self.MAX_TRANSMISSION_THROTTLE_TIME,
+            self.TRANSMISSION_THROTTLE_STEP)
+        self._data_out_pacer = TransmissionPacer(
+            self.TIME_OUT_FOR_SENDING_IN_SECONDS,
+            self.MIN_TIME_OUT_FOR_SENDING_IN_SECONDS,
+            self.MAX_TIME_OUT_FOR_SENDING_IN_SECONDS,
+            self.MIN_TIME_OUT_FOR_SENDING_IN_SECONDS)
+        self._n_data_in_packets_sent = 0
+        self._n_seq_nums_requested = None
+
+        # Where SDP stops being better, until measured for this board
+        self._data_out_threshold = \
+            THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_EXTRACTOR_IN_BYTES
+        self._data_in_threshold = \
+            THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_INPUT_IN_BYTES
+        self._thresholds_calibrated = False
 
         # Stored reinjection status for resetting timeouts
         self._last_status = None
 
+    def __get_connection(self):
+        """ Get the connection to the gatherer, opening it and pointing the\
+            IP tag at it if it is not already open. Anything left from an\
+            earlier transfer is thrown away.
+
+        :rtype: _GathererConnection
+        """
+        if self._connection is None:
+            # Update the IP Tag to work through a NAT firewall
+            connection = _GathererConnection(
+                self._x, self._y, self._ip_address)
+            try:
+                self.__reprogram_tag(connection)
+            except Exception:
+                connection.close()
+                raise
+            self._connection = connection
+        else:
+            while self._connection.is_ready_to_receive(0):
+                self._connection.receive()
+        return self._connection
+
+    def close_connection(self):
+        """ Close the connection to the gatherer if it is open. It is opened\
+            again, and the IP tag pointed at it, when next needed.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
     def __throttled_send(self, message):
         """ slows down transmissions to allow spinnaker to keep up.
 
         :param message: message to send
-        :param connection: the connection to send down
         :rtype: None
         """
-        # send first message
+        self._data_in_pacer.wait()
         self._connection.send_sdp_message(message)
-        time.sleep(self.TRANSMISSION_THROTTLE_TIME)
 
     @property
     @overrides(MachineVertex.resources_required)
@@ -484,8 +636,200 @@ class DataSpeedUpPacketGatherMachineVertex(
                 n_times, report=True, message=_MAJOR_LOSS_MESSAGE.format(
                     chip, n_times)))
         self._provenance_data_items = defaultdict(list)
+        for name, pacer in (("data_in_pacing", self._data_in_pacer),
+                            ("data_out_pacing", self._data_out_pacer)):
+            names = [self._label, name]
+            prov_items.append(ProvenanceDataItem(
+                names + ["gap_seconds"], pacer.gap, report=False))
+            prov_items.append(ProvenanceDataItem(
+                names + ["n_rounds"], pacer.n_rounds, report=False))
+            prov_items.append(ProvenanceDataItem(
+                names + ["n_lossy_rounds"], pacer.n_lossy_rounds,
+                report=False))
+        prov_items.append(ProvenanceDataItem(
+            [self._label, "data_out_threshold_bytes"],
+            self._data_out_threshold, report=False))
+        prov_items.append(ProvenanceDataItem(
+            [self._label, "data_in_threshold_bytes"],
+            self._data_in_threshold, report=False))
+        prov_items.extend(self._transfer_metrics.get_provenance_data())
         return prov_items
 
+    @property
+    def transfer_metrics(self):
+        """ The measurements of the transfers done by this gatherer
+
+        :rtype: TransferMetrics
+        """
+        return self._transfer_metrics
+
+    @property
+    def thresholds(self):
+        """ The sizes, in bytes, from which data out and data in use data\
+            speed up on this board, rather than SCP
+
+        :rtype: tuple(int, int)
+        """
+        return self._data_out_threshold, self._data_in_threshold
+
+    @property
+    def thresholds_calibrated(self):
+        """ Whether the thresholds have been measured for this board, or\
+            read from a file
+
+        :rtype: bool
+        """
+        return self._thresholds_calibrated
+
+    def set_thresholds(self, data_out_threshold, data_in_threshold):
+        """ Set the sizes from which data speed up is used on this board
+
+        :param data_out_threshold: \
+            the size, in bytes, from which data out uses data speed up
+        :type data_out_threshold: int
+        :param data_in_threshold: \
+            the size, in bytes, from which data in uses data speed up
+        :type data_in_threshold: int
+        """
+        self._data_out_threshold = data_out_threshold
+        self._data_in_threshold = data_in_threshold
+        self._thresholds_calibrated = True
+
+    def calibrate_thresholds(self, transceiver, placements):
+        """ Measure the sizes from which data speed up is quicker than SCP on\
+            this board, by timing transfers of a few sizes both ways to and\
+            from the SDRAM of the Ethernet chip, and use them from now on.\
+            The cores must be set for data streaming. If the measurement\
+            fails, the thresholds are left as they were.
+
+        :param transceiver: spinnman instance
+        :param placements: where the extra monitors are placed
+        :type placements: ~pacman.model.placements.Placements
+        :return: the data out and data in thresholds
+        :rtype: tuple(int, int)
+        """
+        sender = placements.get_placement_of_vertex(
+            self._extra_monitors_by_chip[self._x, self._y])
+        n_bytes = max(DATA_OUT_CALIBRATION_SIZES_IN_BYTES[-1],
+                      DATA_IN_CALIBRATION_SIZES_IN_BYTES[-1])
+        data = bytearray(n_bytes)
+        address = transceiver.malloc_sdram(
+            self._x, self._y, n_bytes, self._app_id)
+        try:
+            data_in_threshold = self._calibrated_threshold(
+                DATA_IN_CALIBRATION_SIZES_IN_BYTES,
+                [_quickest_time(
+                    transceiver.write_memory, self._x, self._y, address,
+                    data, size)
+                 for size in DATA_IN_CALIBRATION_SIZES_IN_BYTES],
+                [_quickest_time(
+                    self._send_data_via_extra_monitors, transceiver, self._x,
+                    self._y, address, data[:size])
+                 for size in DATA_IN_CALIBRATION_SIZES_IN_BYTES])
+            data_out_threshold = self._calibrated_threshold(
+                DATA_OUT_CALIBRATION_SIZES_IN_BYTES,
+                [_quickest_time(
+                    transceiver.read_memory, self._x, self._y, address, size)
+                 for size in DATA_OUT_CALIBRATION_SIZES_IN_BYTES],
+                [_quickest_time(
+                    self.__read_via_data_out, transceiver, sender, address,
+                    size)
+                 for size in DATA_OUT_CALIBRATION_SIZES_IN_BYTES])
+        except Exception:  # pylint: disable=broad-except
+            log.exception(
+                "Failed to measure where SDP stops being better than data "
+                "speed up on the board at {}; using the default thresholds",
+                self._ip_address)
+            # The connection is in an unknown state, so start afresh
+            self.close_connection()
+            return self.thresholds
+        finally:
+            transceiver.free_sdram(self._x, self._y, address, self._app_id)
+        log.info(
+            "Board at {} uses data speed up from {} bytes out and {} bytes "
+            "in", self._ip_address, data_out_threshold, data_in_threshold)
+        self.set_thresholds(data_out_threshold, data_in_threshold)
+        return self.thresholds
+
+    def __read_via_data_out(self, transceiver, placement, address, n_bytes):
+        transfer = self._start_data_out(placement, address, n_bytes, 0)
+        self._receive_data(transceiver, transfer)
+        self.__stop_data_out(transfer)
+
+    @staticmethod
+    def _calibrated_threshold(sizes, scp_times, speed_up_times):
+        """ Work out the size from which data speed up is quicker than SCP
+
+        :param sizes: the sizes timed, in increasing order
+        :type sizes: list(int)
+        :param scp_times: the time taken by SCP for each size
+        :type scp_times: list(float)
+        :param speed_up_times: the time taken by data speed up for each size
+        :type speed_up_times: list(float)
+        :return: the smallest size from which data speed up was quicker for\
+            all the sizes timed, or twice the largest if it was not quicker\
+            even for that
+        :rtype: int
+        """
+        threshold = 2 * sizes[-1]
+        for size, scp_time, speed_up_time in reversed(list(zip(
+                sizes, scp_times, speed_up_times))):
+            if speed_up_time >= scp_time:
+                break
+            threshold = size
+        return threshold
+
+    @staticmethod
+    def read_thresholds(gatherers, thresholds_file):
+        """ Set the thresholds of the boards of some gatherers that are in a\
+            file written by :py:meth:`write_thresholds`
+
+        :param gatherers: the gatherers of the boards
+        :type gatherers: iterable(DataSpeedUpPacketGatherMachineVertex)
+        :param thresholds_file: \
+            the file to read; nothing is done if it does not exist
+        :type thresholds_file: str
+        """
+        if not os.path.isfile(thresholds_file):
+            return
+        try:
+            with open(thresholds_file) as f:
+                thresholds = json.load(f)
+        except ValueError:
+            log.warning("Ignoring unreadable data transfer thresholds in {}",
+                        thresholds_file)
+            return
+        for gatherer in gatherers:
+            board = thresholds.get(gatherer._ip_address)
+            if board is not None:
+                gatherer.set_thresholds(board["data_out"], board["data_in"])
+
+    @staticmethod
+    def write_thresholds(gatherers, thresholds_file):
+        """ Save the measured thresholds of the boards of some gatherers in a\
+            file, by IP address of the board, so that later runs can reuse\
+            them. Those of other boards already in the file are kept.
+
+        :param gatherers: the gatherers of the boards
+        :type gatherers: iterable(DataSpeedUpPacketGatherMachineVertex)
+        :param thresholds_file: the file to write
+        :type thresholds_file: str
+        """
+        thresholds = dict()
+        if os.path.isfile(thresholds_file):
+            try:
+                with open(thresholds_file) as f:
+                    thresholds = json.load(f)
+            except ValueError:
+                pass
+        for gatherer in gatherers:
+            if gatherer.thresholds_calibrated:
+                data_out, data_in = gatherer.thresholds
+                thresholds[gatherer._ip_address] = {
+                    "data_out": data_out, "data_in": data_in}
+        with open(thresholds_file, "w") as f:
+            json.dump(thresholds, f, indent=4, sort_keys=True)
+
     @staticmethod
     def locate_correct_write_data_function_for_chip_location(
             uses_advanced_monitors, machine, x, y, transceiver,
@@ -529,16 +873,6 @@ class DataSpeedUpPacketGatherMachineVertex(
             the set of missing sequence numbers per data transmission attempt
         :rtype: None
         """
-        if not os.path.isfile(self._in_report_path):
-            with open(self._in_report_path, "w") as writer:
-                writer.write(
-                    "x\t\t y\t\t SDRAM address\t\t size in bytes\t\t\t"
-                    " time took \t\t\t Mb/s \t\t\t missing sequence numbers\n")
-                writer.write(
-                    "------------------------------------------------"
-                    "------------------------------------------------"
-                    "-------------------------------------------------\n")
-
         time_took_ms = float(time_diff.microseconds +
                              time_diff.total_seconds() * 1000000)
         megabits = (data_size * 8.0) / (1024.0 * 1024.0)
@@ -547,15 +881,27 @@ class DataSpeedUpPacketGatherMachineVertex(
         else:
             mbs = megabits / (float(time_took_ms) / 100000.0)
 
-        with open(self._in_report_path, "a") as writer:
-            writer.write(
-                "{}\t\t {}\t\t {}\t\t {}\t\t\t\t {}\t\t\t {}\t\t {}\n".format(
-                    x, y, address_written_to, data_size, time_took_ms,
-                    mbs, missing_seq_nums))
+        with _REPORT_LOCK:
+            if not os.path.isfile(self._in_report_path):
+                with open(self._in_report_path, "w") as writer:
+                    writer.write(
+                        "x\t\t y\t\t SDRAM address\t\t size in bytes\t\t\t"
+                        " time took \t\t\t Mb/s \t\t\t missing sequence "
+                        "numbers\n")
+                    writer.write(
+                        "------------------------------------------------"
+                        "------------------------------------------------"
+                        "-------------------------------------------------\n")
+
+            with open(self._in_report_path, "a") as writer:
+                writer.write(
+                    "{}\t\t {}\t\t {}\t\t {}\t\t\t\t {}\t\t\t {}\t\t {}\n"
+                    .format(x, y, address_written_to, data_size, time_took_ms,
+                            mbs, missing_seq_nums))
 
     def send_data_into_spinnaker(
             self, x, y, base_address, data, n_bytes=None, offset=0,
-            cpu=0, is_filename=False):
+            cpu=0, is_filename=False, verify=False):
         """ sends a block of data into SpiNNaker to a given chip
 
         :param x: chip x for data
@@ -566,7 +912,13 @@ class DataSpeedUpPacketGatherMachineVertex(
         :param offset: where in the data to start from
         :param is_filename: whether data is actually a file.
         :type is_filename: bool
+        :param verify: \
+            whether to check data sent by the Data In protocol by comparing\
+            a checksum computed by the extra monitor of the chip with one\
+            computed here
+        :type verify: bool
         :rtype: None
+        :raises SpinnFrontEndException: if the checksums differ
         """
         # if file, read in and then process as normal
         if is_filename:
@@ -584,6 +936,7 @@ class DataSpeedUpPacketGatherMachineVertex(
         transceiver = get_simulator().transceiver
 
         # if not worth using extra monitors, send via SCP
+        start_time = time.time()
         if not self._worse_via_scp(n_bytes):
             # start time recording
             start = datetime.datetime.now()
@@ -594,16 +947,34 @@ class DataSpeedUpPacketGatherMachineVertex(
             # record when finished
             end = datetime.datetime.now()
             self._missing_seq_nums_data_in = [[]]
+            path = "data_in_scp"
+            timeouts = 0
         else:
             log.debug("sending {} bytes to {},{} via Data In protocol",
                       n_bytes, x, y)
             # start time recording
             start = datetime.datetime.now()
             # send data
-            self._send_data_via_extra_monitors(
-                transceiver, x, y, base_address, data[offset:n_bytes + offset])
+            try:
+                timeouts = self._send_data_via_extra_monitors(
+                    transceiver, x, y, base_address,
+                    data[offset:n_bytes + offset])
+            except Exception:
+                # The connection is in an unknown state, so start afresh
+                self.close_connection()
+                raise
             # end time recording
             end = datetime.datetime.now()
+            path = "data_in"
+            if verify:
+                self.__verify_checksum(
+                    transceiver, x, y, base_address,
+                    data[offset:n_bytes + offset])
+        self._transfer_metrics.record(
+            path, (self._x, self._y), x, y, None, n_bytes, start_time,
+            time.time(), retransmit_rounds=sum(
+                1 for missing in self._missing_seq_nums_data_in if missing),
+            timeouts=timeouts)
         if VERIFY_SENT_DATA:
             original_data = bytes(data[offset:n_bytes + offset])
             verified_data = bytes(transceiver.read_memory(
@@ -627,10 +998,24 @@ class DataSpeedUpPacketGatherMachineVertex(
                 data_size=n_bytes, address_written_to=base_address,
                 missing_seq_nums=self._missing_seq_nums_data_in)
 
-    @staticmethod
-    def _worse_via_scp(n_bytes):
-        return (n_bytes is None or
-                n_bytes >= THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_INPUT_IN_BYTES)
+    def __verify_checksum(self, transceiver, x, y, base_address, data):
+        """ Check that data sent in arrived intact by having the extra\
+            monitor of the chip sum what is now in SDRAM
+
+        :raises SpinnFrontEndException: if the sums differ
+        """
+        # pylint: disable=too-many-arguments
+        expected = data_checksum(data)
+        actual = self._extra_monitors_by_chip[x, y].checksum_sdram(
+            transceiver, base_address, len(data))
+        if actual != expected:
+            raise SpinnFrontEndException(
+                "Data sent to chip {}, {} at 0x{:08x} ({} bytes) was "
+                "corrupted: checksum is 0x{:08x} instead of 0x{:08x}".format(
+                    x, y, base_address, len(data), actual, expected))
+
+    def _worse_via_scp(self, n_bytes):
+        return n_bytes is None or n_bytes >= self._data_in_threshold
 
     @staticmethod
     def __make_sdp_message(placement, port, payload):
@@ -653,41 +1038,45 @@ class DataSpeedUpPacketGatherMachineVertex(
         :param destination_chip_y: chip y
         :param start_address: start address in sdram to write data to
         :param data_to_write: the data to write
-        :rtype: None
+        :return: the number of times that the machine did not respond in time
+        :rtype: int
         """
+        self._missing_seq_nums_data_in = [[]]
+        total_timeouts = 0
+
         # how many packets after first one we need to send
-        number_of_packets = ceildiv(
+        number_of_packets = max(0, ceildiv(
             len(data_to_write) - BYTES_IN_FULL_PACKET_WITH_ADDRESS,
-            BYTES_IN_FULL_PACKET_WITHOUT_ADDRESS)
+            BYTES_IN_FULL_PACKET_WITHOUT_ADDRESS))
 
         # determine board chip IDs, as the LPG does not know machine scope IDs
         machine = transceiver.get_machine_details()
         chip = machine.get_chip_at(destination_chip_x, destination_chip_y)
         dest_x, dest_y = machine.get_local_xy(chip)
 
-        # send first packet to lpg, stating where to send it to
-        data = bytearray(WORDS_PER_FULL_PACKET * WORD_SIZE)
+        # send first packet to lpg, stating where to send it to; the data
+        # lasts to the end of the packet, which is short if the data is
+        first_length = min(
+            len(data_to_write), BYTES_IN_FULL_PACKET_WITH_ADDRESS)
+        data = bytearray(BYTES_FOR_COMMAND_AND_ADDRESS_HEADER + first_length)
 
         _FOUR_WORDS.pack_into(
             data, 0, DATA_IN_COMMANDS.SEND_DATA_TO_LOCATION.value,
             start_address, (dest_x << 16) | dest_y, number_of_packets)
-        self._ADDRESS_PACKET_BYTE_FORMAT.pack_into(
-            data, BYTES_FOR_COMMAND_AND_ADDRESS_HEADER,
-            *data_to_write[0:BYTES_IN_FULL_PACKET_WITH_ADDRESS])
+        data[BYTES_FOR_COMMAND_AND_ADDRESS_HEADER:] = \
+            data_to_write[0:first_length]
 
         # debug
         # self._print_out_packet_data(data)
 
         # send first message
-        self._connection = SCAMPConnection(
-            chip_x=self._x, chip_y=self._y, remote_host=self._ip_address)
-        self.__reprogram_tag(self._connection)
-        self._connection.send_sdp_message(self.__make_sdp_message(
+        self.__get_connection().send_sdp_message(self.__make_sdp_message(
             self._placement, SDP_PORTS.EXTRA_MONITOR_CORE_DATA_IN_SPEED_UP,
             data))
-        log.debug("sent initial {} bytes", BYTES_IN_FULL_PACKET_WITH_ADDRESS)
+        log.debug("sent initial {} bytes", first_length)
 
         # send initial attempt at sending all the data
+        self._n_data_in_packets_sent = number_of_packets + 1
         self._send_all_data_based_packets(number_of_packets, data_to_write)
 
         # verify completed
@@ -703,6 +1092,9 @@ class DataSpeedUpPacketGatherMachineVertex(
                 # check which message type we have received
                 received_confirmation = self._outgoing_process_packet(
                     data, data_to_write)
+                if received_confirmation:
+                    self._data_in_pacer.observe(
+                        self._n_data_in_packets_sent, 0)
 
             except SpinnmanTimeoutException:  # if time out, keep trying
                 # if the timeout has not occurred x times, keep trying
@@ -712,21 +1104,19 @@ class DataSpeedUpPacketGatherMachineVertex(
                     raise SpinnFrontEndException(
                         TIMEOUT_MESSAGE.format(time_out_count))
 
-                # reopen the connection and try again
+                # reopen the connection, with the tag pointed at it again,
+                # and try again
                 time_out_count += 1
-                remote_port = self._connection.remote_port
-                local_port = self._connection.local_port
-                local_ip = self._connection.local_ip_address
-                remote_ip = self._connection.remote_ip_address
-                self._connection.close()
-                self._connection = SCAMPConnection(
-                    local_port=local_port, remote_port=remote_port,
-                    local_host=local_ip, remote_host=remote_ip)
+                total_timeouts += 1
+                self.close_connection()
+                self.__get_connection()
 
                 # if we have not received confirmation of finish, try to
                 # retransmit missing seq nums
                 if not received_confirmation:
-                    self._outgoing_retransmit_missing_seq_nums(data_to_write)
+                    self._outgoing_retransmit_missing_seq_nums(
+                        data_to_write, timed_out=True)
+        return total_timeouts
 
     def _read_in_missing_seq_nums(self, data, data_to_write, position):
         """ handles a missing seq num packet from spinnaker
@@ -787,14 +1177,22 @@ class DataSpeedUpPacketGatherMachineVertex(
         # process the confirmation of all data received
         return command_id == DATA_IN_COMMANDS.RECEIVE_FINISHED.value
 
-    def _outgoing_retransmit_missing_seq_nums(self, data_to_write):
+    def _outgoing_retransmit_missing_seq_nums(
+            self, data_to_write, timed_out=False):
         """ Transmits back into SpiNNaker the missing data based off missing\
             sequence numbers
 
         :param data_to_write: the data to write.
+        :param timed_out: \
+            whether this is because nothing was heard from the machine
         :rtype: None
         """
-        for missing_seq_num in self._missing_seq_nums_data_in[-1]:
+        missing = self._missing_seq_nums_data_in[-1]
+        self._data_in_pacer.observe(
+            self._n_data_in_packets_sent,
+            self._n_data_in_packets_sent if timed_out else len(missing))
+        self._n_data_in_packets_sent = len(missing)
+        for missing_seq_num in missing:
             message, _length = self._calculate_data_in_data_from_seq_number(
                 data_to_write, missing_seq_num,
                 DATA_IN_COMMANDS.SEND_SEQ_DATA.value, None)
@@ -882,6 +1280,11 @@ class DataSpeedUpPacketGatherMachineVertex(
         :param data_to_write: the data to send
         :rtype: None
         """
+        # if it all fitted in the first packet, there is only the end to say
+        if not number_of_packets:
+            self._send_end_flag()
+            return
+
         # where in the data we are currently up to
         position_in_data = BYTES_IN_FULL_PACKET_WITH_ADDRESS
         # send rest of data
@@ -1066,44 +1469,239 @@ class DataSpeedUpPacketGatherMachineVertex(
             return data
 
         transceiver = get_simulator().transceiver
-        if (length_in_bytes <
-                THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_EXTRACTOR_IN_BYTES):
+        if not self._uses_data_out_protocol(length_in_bytes):
             data = transceiver.read_memory(
                 placement.x, placement.y, memory_address, length_in_bytes)
             end = float(time.time())
             self._provenance_data_items[
                 placement, memory_address,
                 length_in_bytes].append((end - start, [0]))
+            self._transfer_metrics.record(
+                "data_out_scp", (self._x, self._y), placement.x, placement.y,
+                placement.p, length_in_bytes, start, end)
             return data
 
-        # Update the IP Tag to work through a NAT firewall
-        connection = SCAMPConnection(
-            chip_x=self._x, chip_y=self._y, remote_host=self._ip_address)
-        self.__reprogram_tag(connection)
+        transfer = self._start_data_out(
+            placement, memory_address, length_in_bytes, start)
+        try:
+            self._receive_data(transceiver, transfer)
+        except Exception:
+            # The connection is in an unknown state, so start afresh next
+            self.close_connection()
+            raise
+        return self._finish_data_out(transceiver, transfer, fixed_routes)
+
+    def get_data_multi(self, placement, ranges, fixed_routes=None):
+        """ Gets data from several ranges of memory of the chip of a given\
+            core, reading them in one transfer rather than one each, e.g.\
+            both parts of the data in a ring buffer that has wrapped around.
+
+        :param placement: placement object for where to get data from
+        :param ranges: \
+            the (address in SDRAM, length in bytes) of each range to read
+        :type ranges: list(tuple(int, int))
+        :param fixed_routes: the fixed routes, used in the report of which\
+            chips were used by the speed up process
+        :return: the data of each range, in the order asked for
+        :rtype: list(bytearray)
+        """
+        results = [bytearray(0) for _ in ranges]
+        to_read = [
+            (index, address, length)
+            for index, (address, length) in enumerate(ranges) if length]
+        if not self._uses_data_out_protocol(
+                sum(length for _, _, length in to_read)):
+            for index, address, length in to_read:
+                results[index] = self.get_data(
+                    placement, address, length, fixed_routes)
+            return results
+
+        transceiver = get_simulator().transceiver
+        for first in xrange(0, len(to_read), MAX_DATA_OUT_RANGES):
+            reads = to_read[first:first + MAX_DATA_OUT_RANGES]
+            transfer, offsets = self._start_data_out_ranges(
+                placement, [(address, length) for _, address, length in reads],
+                float(time.time()))
+            try:
+                self._receive_data(transceiver, transfer)
+            except Exception:
+                # The connection is in an unknown state, so start afresh next
+                self.close_connection()
+                raise
+            data = self._finish_data_out(transceiver, transfer, fixed_routes)
+            for (index, _, length), offset in zip(reads, offsets):
+                results[index] = data[offset:offset + length]
+        return results
+
+    def _start_data_out(
+            self, placement, memory_address, length_in_bytes, start):
+        """ Ask for data to be sent by the fast data out protocol. The\
+            gatherer can only do one such transfer at a time.
 
+        :param placement: placement object for where to get data from
+        :param memory_address: the address in SDRAM to start reading from
+        :param length_in_bytes: the length of data to read in bytes
+        :param start: when the transfer was asked for, from time.time()
+        :return: the state of the transfer
+        :rtype: _DataOutTransfer
+        """
+        return self.__start_data_out(
+            placement, _THREE_WORDS.pack(
+                DATA_OUT_COMMANDS.START_SENDING.value,
+                memory_address, length_in_bytes),
+            memory_address, length_in_bytes, start)
+
+    def _start_data_out_ranges(self, placement, ranges, start):
+        """ Ask for several ranges of memory to be sent in one transfer by\
+            the fast data out protocol.
+
+        :param placement: placement object for where to get data from
+        :param ranges: \
+            the (address in SDRAM, length in bytes) of each range, of which\
+            there are at most MAX_DATA_OUT_RANGES, none empty
+        :type ranges: list(tuple(int, int))
+        :param start: when the transfer was asked for, from time.time()
+        :return: the state of the transfer, and where the data of each range\
+            starts in the data of the transfer
+        :rtype: tuple(_DataOutTransfer, list(int))
+        """
+        offsets, lengths = self._ranges_layout(
+            [length for _, length in ranges])
+        words = [DATA_OUT_COMMANDS.START_SENDING_RANGES.value, len(ranges)]
+        for (address, _), length in zip(ranges, lengths):
+            words.extend((address, length))
+        transfer = self.__start_data_out(
+            placement, struct.pack("<{}I".format(len(words)), *words),
+            ranges[0][0], offsets[-1] + lengths[-1], start)
+        return transfer, offsets
+
+    @staticmethod
+    def _ranges_layout(lengths):
+        """ Work out where the data of each of several ranges read in one\
+            transfer is in the data of the transfer. Each range is read as\
+            whole words, and starts at the start of a packet.
+
+        :param lengths: the length in bytes of each range
+        :type lengths: list(int)
+        :return: the offset of the data of each range, and the number of\
+            bytes read for each range
+        :rtype: tuple(list(int), list(int))
+        """
+        packet_bytes = WORDS_PER_FULL_PACKET_WITH_SEQUENCE_NUM * WORD_SIZE
+        offsets = list()
+        read_lengths = list()
+        offset = 0
+        for length in lengths:
+            read_length = ceildiv(length, WORD_SIZE) * WORD_SIZE
+            offsets.append(offset)
+            read_lengths.append(read_length)
+            offset += ceildiv(read_length, packet_bytes) * packet_bytes
+        return offsets, read_lengths
+
+    def __start_data_out(
+            self, placement, payload, memory_address, length_in_bytes, start):
+        """ Send the message that starts a transfer and prepare to receive\
+            its data.
+
+        :param placement: placement object for where to get data from
+        :param payload: the message asking for the data
+        :type payload: bytes
+        :param memory_address: the address in SDRAM the data starts at
+        :param length_in_bytes: the length of the data of the transfer
+        :param start: when the transfer was asked for, from time.time()
+        :rtype: _DataOutTransfer
+        """
+        # pylint: disable=too-many-arguments
         # send
+        connection = self.__get_connection()
         connection.send_sdp_message(self.__make_sdp_message(
-            placement, SDP_PORTS.EXTRA_MONITOR_CORE_DATA_SPEED_UP,
-            _THREE_WORDS.pack(
-                DATA_OUT_COMMANDS.START_SENDING.value,
-                memory_address, length_in_bytes)))
+            placement, SDP_PORTS.EXTRA_MONITOR_CORE_DATA_SPEED_UP, payload))
 
-        # receive
+        # prepare to receive
         self._output = bytearray(length_in_bytes)
         self._view = memoryview(self._output)
         self._max_seq_num = self.calculate_max_seq_num()
-        lost_seq_nums = self._receive_data(transceiver, placement, connection)
+        self._n_seq_nums_requested = None
+        return _DataOutTransfer(
+            placement, memory_address, length_in_bytes, start, connection,
+            self._max_seq_num)
 
-        # Stop anything else getting through (and reduce traffic)
-        connection.send_sdp_message(self.__make_sdp_message(
-            placement, SDP_PORTS.EXTRA_MONITOR_CORE_DATA_SPEED_UP,
-            _ONE_WORD.pack(DATA_OUT_COMMANDS.CLEAR.value)))
-        connection.close()
+    def _receive_data(self, transceiver, transfer):
+        """ Receive the data of a transfer, waiting on its connection.
+
+        :param transceiver: spinnman instance
+        :param transfer: the transfer to receive the data of
+        :type transfer: _DataOutTransfer
+        """
+        while not transfer.finished:
+            try:
+                data = transfer.connection.receive(
+                    timeout=self.TIMEOUT_PER_RECEIVE_IN_SECONDS)
+            except SpinnmanTimeoutException:
+                self._data_out_timed_out(transceiver, transfer)
+            else:
+                self._data_out_received(transceiver, transfer, data)
+
+    def _data_out_received(self, transceiver, transfer, data):
+        """ Handle a packet of a transfer.
+
+        :param transceiver: spinnman instance
+        :param transfer: the transfer the packet is for
+        :type transfer: _DataOutTransfer
+        :param data: the packet data
+        """
+        transfer.n_timeouts_in_row = 0
+        _, transfer.finished = self._process_data(
+            data, transfer.seq_nums, transfer.finished, transfer.placement,
+            transceiver, transfer.lost_seq_nums)
+
+    def _data_out_timed_out(self, transceiver, transfer):
+        """ Handle nothing being heard about a transfer for a while, by\
+            asking for what is missing again.
+
+        :param transceiver: spinnman instance
+        :param transfer: the transfer that has timed out
+        :type transfer: _DataOutTransfer
+        """
+        if transfer.n_timeouts_in_row > TIMEOUT_RETRY_LIMIT:
+            raise SpinnFrontEndException(
+                "Failed to hear from the machine during {} attempts. "
+                "Please try removing firewalls".format(
+                    transfer.n_timeouts_in_row))
+
+        transfer.n_timeouts_in_row += 1
+        transfer.n_timeouts += 1
+        # self.__reset_connection()
+        if not transfer.finished:
+            transfer.finished = \
+                self._determine_and_retransmit_missing_seq_nums(
+                    transfer.seq_nums, transceiver, transfer.placement,
+                    transfer.lost_seq_nums)
+
+    def _finish_data_out(self, transceiver, transfer, fixed_routes):
+        """ Stop a finished transfer and record how it went.
+
+        :param transceiver: spinnman instance
+        :param transfer: the finished transfer
+        :type transfer: _DataOutTransfer
+        :param fixed_routes: the fixed routes, used in the report of which\
+            chips were used by the speed up process
+        :return: byte array of the data
+        """
+        placement = transfer.placement
+        self.__stop_data_out(transfer)
 
         end = float(time.time())
         self._provenance_data_items[
-            placement, memory_address, length_in_bytes].append(
-                (end - start, lost_seq_nums))
+            placement, transfer.memory_address,
+            transfer.length_in_bytes].append(
+                (end - transfer.start, transfer.lost_seq_nums))
+        self._transfer_metrics.record(
+            "data_out", (self._x, self._y), placement.x, placement.y,
+            placement.p, transfer.length_in_bytes, transfer.start, end,
+            retransmit_rounds=sum(
+                1 for lost in transfer.lost_seq_nums if lost),
+            timeouts=transfer.n_timeouts)
 
         # create report elements
         if self._write_data_speed_up_reports:
@@ -1114,31 +1712,47 @@ class DataSpeedUpPacketGatherMachineVertex(
 
         return self._output
 
-    def _receive_data(self, transceiver, placement, connection):
-        seq_nums = set()
-        lost_seq_nums = list()
-        timeoutcount = 0
-        finished = False
-        while not finished:
-            try:
-                data = connection.receive(
-                    timeout=self.TIMEOUT_PER_RECEIVE_IN_SECONDS)
-                timeoutcount = 0
-                seq_nums, finished = self._process_data(
-                    data, seq_nums, finished, placement, transceiver,
-                    lost_seq_nums)
-            except SpinnmanTimeoutException:
-                if timeoutcount > TIMEOUT_RETRY_LIMIT:
-                    raise SpinnFrontEndException(
-                        "Failed to hear from the machine during {} attempts. "
-                        "Please try removing firewalls".format(timeoutcount))
+    def __stop_data_out(self, transfer):
+        """ Stop anything else getting through (and reduce traffic); the\
+            connection is kept for the next transfer
 
-                timeoutcount += 1
-                # self.__reset_connection()
-                if not finished:
-                    finished = self._determine_and_retransmit_missing_seq_nums(
-                        seq_nums, transceiver, placement, lost_seq_nums)
-        return lost_seq_nums
+        :param transfer: the finished transfer
+        :type transfer: _DataOutTransfer
+        """
+        transfer.connection.send_sdp_message(self.__make_sdp_message(
+            transfer.placement, SDP_PORTS.EXTRA_MONITOR_CORE_DATA_SPEED_UP,
+            _ONE_WORD.pack(DATA_OUT_COMMANDS.CLEAR.value)))
+
+    def _uses_data_out_protocol(self, length_in_bytes):
+        return length_in_bytes >= self._data_out_threshold
+
+    @staticmethod
+    def get_data_concurrently(
+            reads, callback, fixed_routes=None, max_concurrent=None):
+        """ Gets data from many cores, with the transfers of different\
+            gatherers in progress at the same time, all from this thread.\
+            The reads of each gatherer are done in order, one at a time.
+
+        :param reads: \
+            The reads to do, each as (gatherer, placement, memory_address,\
+            length_in_bytes, key), where the placement is where to get the\
+            data from and the key identifies the read to the callback
+        :type reads: iterable(tuple(DataSpeedUpPacketGatherMachineVertex,\
+            ~pacman.model.placements.Placement, int, int, object))
+        :param callback: \
+            Called with (key, data) as each read completes; reads of\
+            different gatherers may complete in any order
+        :type callback: callable(object, bytearray)
+        :param fixed_routes: the fixed routes, used in the report of which\
+            chips were used by the speed up process
+        :param max_concurrent: \
+            The most gatherers with transfers in progress at once, or None\
+            for no limit
+        :type max_concurrent: int or None
+        """
+        _ConcurrentDataOut(
+            get_simulator().transceiver, fixed_routes, callback,
+            max_concurrent).run(reads)
 
     @staticmethod
     def _determine_which_routers_were_used(placement, fixed_routes, machine):
@@ -1176,22 +1790,26 @@ class DataSpeedUpPacketGatherMachineVertex(
         :param placement: the first placement used
         :rtype: None
         """
-        writer_behaviour = "w"
-        if os.path.isfile(report_path):
-            writer_behaviour = "a"
+        with _REPORT_LOCK:
+            writer_behaviour = "w"
+            if os.path.isfile(report_path):
+                writer_behaviour = "a"
 
-        with open(report_path, writer_behaviour) as writer:
-            writer.write("[{}:{}:{}] = {}\n".format(
-                placement.x, placement.y, placement.p, routers_been_in_use))
+            with open(report_path, writer_behaviour) as writer:
+                writer.write("[{}:{}:{}] = {}\n".format(
+                    placement.x, placement.y, placement.p,
+                    routers_been_in_use))
 
     def _calculate_missing_seq_nums(self, seq_nums):
         """ Determine which sequence numbers we've missed
 
-        :param seq_nums: the set already acquired
-        :return: list of missing sequence numbers
+        :param seq_nums: whether each sequence number has been received
+        :type seq_nums: numpy.ndarray(bool)
+        :return: the missing sequence numbers, in order
+        :rtype: numpy.ndarray(uint32)
         """
-        return [sn for sn in xrange(0, self._max_seq_num)
-                if sn not in seq_nums]
+        return numpy.flatnonzero(
+            ~seq_nums[:self._max_seq_num]).astype("<u4")
 
     def _determine_and_retransmit_missing_seq_nums(
             self, seq_nums, transceiver, placement, lost_seq_nums):
@@ -1199,19 +1817,24 @@ class DataSpeedUpPacketGatherMachineVertex(
             retransmits the missing sequence numbers back to the core for\
             retransmission.
 
-        :param seq_nums: the sequence numbers already received
+        :param seq_nums: whether each sequence number has been received
+        :type seq_nums: numpy.ndarray(bool)
         :param transceiver: spinnman instance
         :param placement: placement instance
         :return: whether all packets are transmitted
         :rtype: bool
         """
-        # pylint: disable=too-many-locals
-
         # locate missing sequence numbers from pile
         missing_seq_nums = self._calculate_missing_seq_nums(seq_nums)
         lost_seq_nums.append(len(missing_seq_nums))
+
+        # Any still missing from the last request were lost again
+        if self._n_seq_nums_requested is not None:
+            self._data_out_pacer.observe(
+                self._n_seq_nums_requested, len(missing_seq_nums))
+        self._n_seq_nums_requested = len(missing_seq_nums)
         # self._print_missing(missing_seq_nums)
-        if not missing_seq_nums:
+        if not len(missing_seq_nums):
             return True
 
         # figure n packets given the 2 formats
@@ -1223,74 +1846,51 @@ class DataSpeedUpPacketGatherMachineVertex(
                 length_via_format2, WORDS_PER_FULL_PACKET - 1)
 
         # transmit missing sequence as a new SDP packet
-        first = True
-        seq_num_offset = 0
-        for _ in xrange(n_packets):
-            length_left_in_packet = WORDS_PER_FULL_PACKET
-            offset = 0
-
-            # if first, add n packets to list
-            if first:
-
-                # get left over space / data size
-                size_of_data_left_to_transmit = min(
-                    length_left_in_packet - 2,
-                    len(missing_seq_nums) - seq_num_offset)
-
-                # build data holder accordingly
-                data = bytearray(
-                    (size_of_data_left_to_transmit + 2) * WORD_SIZE)
-
-                # pack flag and n packets
-                _ONE_WORD.pack_into(
-                    data, offset, DATA_OUT_COMMANDS.START_MISSING_SEQ.value)
-                _ONE_WORD.pack_into(data, WORD_SIZE, n_packets)
-
-                # update state
-                offset += 2 * WORD_SIZE
-                length_left_in_packet -= 2
-                first = False
-
-            else:  # just add data
-                # get left over space / data size
-                size_of_data_left_to_transmit = min(
-                    WORDS_PER_FULL_PACKET_WITH_SEQUENCE_NUM,
-                    len(missing_seq_nums) - seq_num_offset)
-
-                # build data holder accordingly
-                data = bytearray(
-                    (size_of_data_left_to_transmit + 1) * WORD_SIZE)
-
-                # pack flag
-                _ONE_WORD.pack_into(
-                    data, offset, DATA_OUT_COMMANDS.MISSING_SEQ.value)
-                offset += 1 * WORD_SIZE
-                length_left_in_packet -= 1
-
-            # fill data field
-            struct.pack_into(
-                "<{}I".format(size_of_data_left_to_transmit), data, offset,
-                *missing_seq_nums[
-                    seq_num_offset:
-                    seq_num_offset + size_of_data_left_to_transmit])
-            seq_num_offset += length_left_in_packet
+        for data in self._missing_seq_nums_packets(
+                missing_seq_nums, n_packets):
+            # space out the requests so the core doesn't lose packets
+            self._data_out_pacer.wait()
 
             # build SDP message and send it to the core
             transceiver.send_sdp_message(self.__make_sdp_message(
                 placement, SDP_PORTS.EXTRA_MONITOR_CORE_DATA_SPEED_UP, data))
-
-            # sleep for ensuring core doesn't lose packets
-            time.sleep(self.TIME_OUT_FOR_SENDING_IN_SECONDS)
             # self._print_packet_num_being_sent(packet_count, n_packets)
         return False
 
+    @staticmethod
+    def _missing_seq_nums_packets(missing_seq_nums, n_packets):
+        """ Build the payloads of the packets asking for the missing\
+            sequence numbers, straight from the array of them. The first\
+            packet also says how many packets there are.
+
+        :param missing_seq_nums: the missing sequence numbers
+        :type missing_seq_nums: numpy.ndarray(uint32)
+        :param n_packets: the number of packets
+        :type n_packets: int
+        :return: the payload of each packet
+        :rtype: iterable(bytes)
+        """
+        first_size = WORDS_PER_FULL_PACKET - 2
+        yield numpy.concatenate((
+            numpy.array([DATA_OUT_COMMANDS.START_MISSING_SEQ.value,
+                         n_packets], dtype="<u4"),
+            missing_seq_nums[:first_size])).tobytes()
+        header = numpy.array(
+            [DATA_OUT_COMMANDS.MISSING_SEQ.value], dtype="<u4")
+        for offset in xrange(
+                first_size, len(missing_seq_nums),
+                WORDS_PER_FULL_PACKET_WITH_SEQUENCE_NUM):
+            yield numpy.concatenate((header, missing_seq_nums[
+                offset:offset + WORDS_PER_FULL_PACKET_WITH_SEQUENCE_NUM])
+            ).tobytes()
+
     def _process_data(
             self, data, seq_nums, finished, placement, transceiver,
             lost_seq_nums):
         """ Take a packet and processes it see if we're finished yet
 
         :param data: the packet data
-        :param seq_nums: the list of sequence numbers received so far
+        :param seq_nums: whether each sequence number has been received
         :param finished: bool which states if finished or not
         :param placement: placement object for location on machine
         :param transceiver: spinnman instance
@@ -1325,8 +1925,8 @@ class DataSpeedUpPacketGatherMachineVertex(
                 offset, true_data_length, data, WORD_SIZE,
                 length_of_data, seq_num, length_of_data, False)
 
-        # add seq num to list
-        seq_nums.add(seq_num)
+        # mark seq num as received
+        seq_nums[seq_num] = True
 
         # if received a last flag on its own, its during retransmission.
         #  check and try again if required
@@ -1371,16 +1971,12 @@ class DataSpeedUpPacketGatherMachineVertex(
     def _check(self, seq_nums):
         """ Verify if the sequence numbers are correct.
 
-        :param seq_nums: the received sequence numbers
+        :param seq_nums: whether each sequence number has been received
+        :type seq_nums: numpy.ndarray(bool)
         :return: Whether all the sequence numbers have been received
         :rtype: bool
         """
-        # hand back
-        seq_nums = sorted(seq_nums)
-        max_needed = self.calculate_max_seq_num()
-        if len(seq_nums) > max_needed + 1:
-            raise Exception("I've received more data than I was expecting!!")
-        return len(seq_nums) == max_needed + 1
+        return bool(seq_nums.all())
 
     def calculate_max_seq_num(self):
         """ Deduce the max sequence number expected to be received
@@ -1437,6 +2033,272 @@ class DataSpeedUpPacketGatherMachineVertex(
                  packet_count + 1, n_packets)
 
 
+class _DataOutTransfer(object):
+    """ The state of a transfer by the fast data out protocol.
+    """
+    __slots__ = [
+        # placement object for where the data is from
+        "placement",
+        # the address in SDRAM the data starts at
+        "memory_address",
+        # the length of the data in bytes
+        "length_in_bytes",
+        # when the transfer was asked for, from time.time()
+        "start",
+        # the connection the data arrives on
+        "connection",
+        # whether each sequence number has been received, including that of
+        # the end flag
+        "seq_nums",
+        # the number of sequence numbers lost in each round
+        "lost_seq_nums",
+        # the number of times nothing has been heard since data last was
+        "n_timeouts_in_row",
+        # the total number of times nothing was heard for a while
+        "n_timeouts",
+        # whether all the data has been received
+        "finished",
+        # when data was last heard, from time.time()
+        "last_heard"]
+
+    def __init__(
+            self, placement, memory_address, length_in_bytes, start,
+            connection, max_seq_num):
+        # pylint: disable=too-many-arguments
+        self.placement = placement
+        self.memory_address = memory_address
+        self.length_in_bytes = length_in_bytes
+        self.start = start
+        self.connection = connection
+        self.seq_nums = numpy.zeros(max_seq_num + 1, dtype=bool)
+        self.lost_seq_nums = list()
+        self.n_timeouts_in_row = 0
+        self.n_timeouts = 0
+        self.finished = False
+        self.last_heard = time.time()
+
+
+class _GathererConnection(object):
+    """ A UDP connection to SCAMP on the board of a gatherer. This is made\
+        here rather than by SpiNNMan so that it has a socket that can be\
+        waited on along with the connections to other gatherers.
+    """
+    __slots__ = [
+        # the coordinates of the chip of the gatherer
+        "_chip_x",
+        "_chip_y",
+        # the socket, connected to SCAMP on the board
+        "_socket"]
+
+    def __init__(self, chip_x, chip_y, remote_host, remote_port=None):
+        """
+        :param chip_x: the x-coordinate of the chip of the gatherer
+        :param chip_y: the y-coordinate of the chip of the gatherer
+        :param remote_host: the host name or IP address of the board
+        :param remote_port: the port to send to, or None for SCAMP's
+        :raise ~spinnman.exceptions.SpinnmanIOException: \
+            If there is an error setting up the communication channel
+        """
+        self._chip_x = chip_x
+        self._chip_y = chip_y
+        self._socket = get_socket()
+        try:
+            set_receive_buffer_size(self._socket, _RECEIVE_BUFFER_SIZE)
+            bind_socket(self._socket, "", 0)
+            connect_socket(
+                self._socket, resolve_host(remote_host),
+                SCP_SCAMP_PORT if remote_port is None else remote_port)
+        except Exception:
+            self._socket.close()
+            raise
+
+    def fileno(self):
+        """ The file descriptor of the socket, so that it can be waited on\
+            with select
+
+        :rtype: int
+        """
+        return self._socket.fileno()
+
+    def is_ready_to_receive(self, timeout=0):
+        return bool(select.select([self._socket], [], [], timeout)[0])
+
+    def receive(self, timeout=None):
+        """ Receive a packet
+
+        :param timeout: The timeout in seconds, or None to wait forever
+        :type timeout: None or float
+        :rtype: bytes
+        :raise ~spinnman.exceptions.SpinnmanTimeoutException: \
+            If a timeout occurs before any data is received
+        :raise ~spinnman.exceptions.SpinnmanIOException: \
+            If an error occurs receiving the data
+        """
+        try:
+            self._socket.settimeout(timeout)
+            return self._socket.recv(_MAX_PACKET_SIZE)
+        except socket.timeout as e:
+            raise_from(SpinnmanTimeoutException("receive", timeout), e)
+        except Exception as e:  # pylint: disable=broad-except
+            raise_from(SpinnmanIOException(str(e)), e)
+
+    def send(self, data):
+        """ Send a packet
+
+        :param data: the packet
+        :type data: bytes
+        :raise ~spinnman.exceptions.SpinnmanIOException: \
+            If there is an error sending the data
+        """
+        try:
+            self._socket.send(data)
+        except Exception as e:  # pylint: disable=broad-except
+            raise_from(SpinnmanIOException(str(e)), e)
+
+    def send_sdp_message(self, sdp_message):
+        if sdp_message.sdp_header.flags == SDPFlag.REPLY_EXPECTED:
+            update_sdp_header_for_udp_send(
+                sdp_message.sdp_header, self._chip_x, self._chip_y)
+        else:
+            update_sdp_header_for_udp_send(sdp_message.sdp_header, 0, 0)
+        self.send(_TWO_SKIP.pack() + sdp_message.bytestring)
+
+    def get_scp_data(self, scp_request):
+        update_sdp_header_for_udp_send(
+            scp_request.sdp_header, self._chip_x, self._chip_y)
+        return _TWO_SKIP.pack() + scp_request.bytestring
+
+    def receive_scp_response(self, timeout=1.0):
+        data = self.receive(timeout)
+        result, sequence = _TWO_SHORTS.unpack_from(data, 10)
+        return SCPResult(result), sequence, data, 2
+
+    def close(self):
+        try:
+            self._socket.shutdown(socket.SHUT_WR)
+        except Exception:  # pylint: disable=broad-except
+            pass
+        self._socket.close()
+
+
+class _ConcurrentDataOut(object):
+    """ Runs fast data out transfers from many gatherers from one thread,\
+        by waiting on the connections of all of them at once.
+    """
+    __slots__ = [
+        # spinnman instance
+        "_txrx",
+        # the fixed routes, for reports
+        "_fixed_routes",
+        # called with (key, data) as each read completes
+        "_callback",
+        # the most gatherers with transfers in progress at once
+        "_max_concurrent",
+        # gatherer -> deque of (placement, address, length, key) to read
+        "_queues",
+        # transfer in progress -> (gatherer, key of the read)
+        "_active"]
+
+    def __init__(self, transceiver, fixed_routes, callback, max_concurrent):
+        self._txrx = transceiver
+        self._fixed_routes = fixed_routes
+        self._callback = callback
+        self._max_concurrent = max_concurrent
+        self._queues = OrderedDict()
+        self._active = OrderedDict()
+
+    def run(self, reads):
+        """ Do the reads.
+
+        :param reads: (gatherer, placement, address, length, key) of each
+        """
+        for gatherer, placement, address, length, key in reads:
+            self._queues.setdefault(gatherer, deque()).append(
+                (placement, address, length, key))
+        waiting = deque(self._queues)
+        try:
+            self.__start_more(waiting)
+            while self._active:
+                self.__receive()
+                self.__check_transfers(waiting)
+        finally:
+            # Connections of transfers that did not finish are in an
+            # unknown state, so start afresh next time
+            for gatherer, _read_key in list(self._active.values()):
+                gatherer.close_connection()
+            self._active.clear()
+
+    def __start_more(self, waiting):
+        """ Start transfers on waiting gatherers while allowed.
+        """
+        while waiting and (
+                self._max_concurrent is None or
+                len(self._active) < self._max_concurrent):
+            self.__start_next(waiting.popleft())
+
+    def __start_next(self, gatherer):
+        """ Start the next transfer of a gatherer, doing any reads that are\
+            too small for the fast protocol directly.
+
+        :return: whether a transfer was started
+        """
+        reads = self._queues[gatherer]
+        while reads:
+            placement, address, length, key = reads.popleft()
+            # pylint: disable=protected-access
+            if not gatherer._uses_data_out_protocol(length):
+                self._callback(key, gatherer.get_data(
+                    placement, address, length, self._fixed_routes))
+                continue
+            transfer = gatherer._start_data_out(
+                placement, address, length, float(time.time()))
+            self._active[transfer] = (gatherer, key)
+            return True
+        return False
+
+    def __receive(self):
+        """ Handle all the packets waiting for the transfers in progress,\
+            waiting for one if there are none.
+        """
+        # pylint: disable=protected-access
+        connections = {
+            transfer.connection.fileno(): transfer
+            for transfer in self._active if not transfer.finished}
+        if not connections:
+            return
+        ready, _, _ = select.select(
+            list(connections), [], [],
+            DataSpeedUpPacketGatherMachineVertex.
+            TIMEOUT_PER_RECEIVE_IN_SECONDS)
+        for fileno in ready:
+            transfer = connections[fileno]
+            gatherer, _read_key = self._active[transfer]
+            while (not transfer.finished and
+                   transfer.connection.is_ready_to_receive(0)):
+                gatherer._data_out_received(
+                    self._txrx, transfer, transfer.connection.receive())
+            transfer.last_heard = time.time()
+
+    def __check_transfers(self, waiting):
+        """ Handle transfers that have finished or timed out.
+        """
+        # pylint: disable=protected-access
+        timeout = (
+            DataSpeedUpPacketGatherMachineVertex.
+            TIMEOUT_PER_RECEIVE_IN_SECONDS)
+        for transfer, (gatherer, read_key) in list(self._active.items()):
+            if (not transfer.finished and
+                    time.time() - transfer.last_heard >= timeout):
+                gatherer._data_out_timed_out(self._txrx, transfer)
+                transfer.last_heard = time.time()
+            if transfer.finished:
+                del self._active[transfer]
+                self._callback(read_key, gatherer._finish_data_out(
+                    self._txrx, transfer, self._fixed_routes))
+                waiting.appendleft(gatherer)
+        self.__start_more(waiting)
+
+
 class _StreamingContextManager(object):
     """ The implementation of the context manager object for streaming \
     configuration control.
@@ -1458,4 +2320,5 @@ class _StreamingContextManager(object):
         for gatherer in self._gatherers:
             gatherer.unset_cores_for_data_streaming(
                 self._txrx, self._monitors, self._placements)
+            gatherer.close_connection()
         return False
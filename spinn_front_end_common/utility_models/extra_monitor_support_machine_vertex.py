@@ -31,7 +31,7 @@ from spinn_front_end_common.utilities.utility_objs.\
         ReadStatusProcess, ResetCountersProcess, SetPacketTypesProcess,
         SetRouterEmergencyTimeoutProcess, SetRouterTimeoutProcess,
         ClearQueueProcess, LoadApplicationMCRoutesProcess,
-        LoadSystemMCRoutesProcess)
+        LoadSystemMCRoutesProcess, ChecksumSDRAMProcess)
 from spinn_front_end_common.utilities.constants import (
     SARK_PER_MALLOC_SDRAM_USAGE, DATA_SPECABLE_BASIC_SETUP_INFO_N_BYTES)
 from .data_speed_up_packet_gatherer_machine_vertex import (
@@ -408,6 +408,27 @@ class ExtraMonitorSupportMachineVertex(
                 transceiver, self._app_id, self, placement)
             raise
 
+    def checksum_sdram(self, transceiver, base_address, n_bytes):
+        """ Get this extra monitor to sum a block of the SDRAM of its chip,\
+            as computed by\
+            :py:func:`~spinn_front_end_common.utility_models.data_speed_up_packet_gatherer_machine_vertex.data_checksum`
+
+        :param transceiver: the spinnMan interface
+        :param base_address: the address of the block to sum
+        :param n_bytes: the number of bytes in the block to sum
+        :return: the sum of the block, modulo 2^32
+        :rtype: int
+        """
+        process = ChecksumSDRAMProcess(transceiver.scamp_connection_selector)
+        try:
+            return process.checksum_sdram(
+                self._placement.x, self._placement.y, self._placement.p,
+                base_address, n_bytes)
+        except:  # noqa: E722
+            emergency_recover_state_from_failure(
+                transceiver, self._app_id, self, self._placement)
+            raise
+
     def get_reinjection_status_for_vertices(
             self, placements, extra_monitor_cores_for_data, transceiver):
         """ Get the reinjection status from a set of extra monitor cores
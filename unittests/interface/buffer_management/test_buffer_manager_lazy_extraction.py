@@ -0,0 +1,104 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import shutil
+import tempfile
+import unittest
+from spinn_utilities.overrides import overrides
+from pacman.model.graphs.machine import SimpleMachineVertex
+from pacman.model.placements import Placement, Placements
+from pacman.model.resources import ResourceContainer
+from spinn_front_end_common.interface.buffer_management import BufferManager
+from spinn_front_end_common.interface.buffer_management.buffer_models import (
+    AbstractReceiveBuffersToHost)
+
+
+class _RecordingVertex(SimpleMachineVertex, AbstractReceiveBuffersToHost):
+    def __init__(self):
+        super(_RecordingVertex, self).__init__(ResourceContainer())
+
+    @overrides(AbstractReceiveBuffersToHost.get_recorded_region_ids)
+    def get_recorded_region_ids(self):
+        return [0, 1, 2]
+
+    @overrides(
+        AbstractReceiveBuffersToHost.get_recording_region_base_address)
+    def get_recording_region_base_address(self, txrx, placement):
+        return 0
+
+
+class _Transceiver(object):
+    scamp_connection_selector = None
+
+
+class _NoMachineBufferManager(BufferManager):
+    """ Records which regions are read, rather than reading the machine
+    """
+
+    def __init__(self, report_folder):
+        super(_NoMachineBufferManager, self).__init__(
+            placements=Placements(), tags=None, transceiver=_Transceiver(),
+            extra_monitor_cores=None,
+            packet_gather_cores_to_ethernet_connection_map=None,
+            extra_monitor_to_chip_mapping=None, machine=None,
+            fixed_routes=None, uses_advanced_monitors=False,
+            report_folder=report_folder, lazy_extraction=True)
+        self.read = list()
+
+    def _read_recording_metadata(self, placements):
+        pass
+
+    def _get_reads_for_region(self, placement, recording_region_id):
+        self.read.append(recording_region_id)
+        return []
+
+
+class TestBufferManagerLazyExtraction(unittest.TestCase):
+
+    def test_lazy_extraction(self):
+        d = tempfile.mkdtemp()
+        try:
+            vertex = _RecordingVertex()
+            placement = Placement(vertex, 0, 0, 1)
+            bm = _NoMachineBufferManager(d)
+            bm.set_extraction_priority(vertex, 2, 1)
+            bm.set_extraction_priority(vertex, 1, 5)
+
+            # Only the prioritised regions are read after the run
+            bm.get_data_for_placements([placement])
+            self.assertEqual(bm.read, [1, 2])
+
+            # Others are read when asked for, and only once
+            data, _ = bm.get_data_by_placement(placement, 0)
+            self.assertEqual(bytes(data), b"")
+            bm.get_data_by_placement(placement, 0)
+            self.assertEqual(bm.read, [1, 2, 0])
+
+            # Nothing left to read before the next run
+            bm.resume()
+            self.assertEqual(bm.read, [1, 2, 0])
+
+            # Everything left is read before the next run
+            bm.set_extraction_priority(vertex, 1, None)
+            bm.get_data_for_placements([placement])
+            self.assertEqual(bm.read, [1, 2, 0, 2])
+            bm.resume()
+            self.assertEqual(bm.read, [1, 2, 0, 2, 0, 1])
+        finally:
+            shutil.rmtree(d, True)
+
+
+if __name__ == "__main__":
+    unittest.main()
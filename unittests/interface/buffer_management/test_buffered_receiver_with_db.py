@@ -17,6 +17,8 @@ import unittest
 import tempfile
 import os
 import shutil
+import sqlite3
+import numpy
 from spinn_front_end_common.interface.buffer_management.storage_objects \
     import BufferedReceivingData
 from spinn_front_end_common.interface.buffer_management.storage_objects\
@@ -44,9 +46,123 @@ class TestBufferedReceivingDataWithDB(unittest.TestCase):
             brd.store_end_buffering_state(0, 0, 0, 0, "LOLWUT")
             data, missing = brd.get_region_data(0, 0, 0, 0)
 
-            self.assertIsNone(missing, "data shouldn't be 'missing'")
+            self.assertFalse(missing, "data shouldn't be 'missing'")
             self.assertEqual(bytes(data), b"abcdef")
 
             self.assertTrue(os.path.isfile(f), "DB still exists")
         finally:
             shutil.rmtree(d, True)
+
+    def test_many_appends(self):
+        d = tempfile.mkdtemp()
+        try:
+            brd = BufferedReceivingData(d)
+            pieces = [bytes(bytearray([i] * (i + 1))) for i in range(50)]
+            for piece in pieces:
+                brd.store_data_in_region_buffer(0, 0, 1, 2, piece)
+            brd.flushing_data_from_region(0, 0, 1, 2, b"end")
+            brd.store_data_in_region_buffer(0, 0, 1, 3, b"other")
+
+            data, missing = brd.get_region_data(0, 0, 1, 2)
+            self.assertFalse(missing, "data shouldn't be 'missing'")
+            self.assertEqual(bytes(data), b"".join(pieces) + b"end")
+
+            chunks, _ = brd.get_region_data_chunks(0, 0, 1, 2)
+            self.assertEqual(len(chunks), len(pieces) + 1)
+            self.assertEqual([bytes(c) for c in chunks], pieces + [b"end"])
+
+            data, _ = brd.get_region_data(0, 0, 1, 3)
+            self.assertEqual(bytes(data), b"other")
+            data, _ = brd.get_region_data(0, 0, 1, 4)
+            self.assertEqual(bytes(data), b"")
+
+            # Other readers of the view see the chunks as one piece
+            db = sqlite3.connect(os.path.join(d, DB_FILE_NAME))
+            try:
+                contents = dict(db.execute(
+                    "SELECT local_region_index, content FROM region_view "
+                    "WHERE x = 0 AND y = 0 AND processor = 1"))
+            finally:
+                db.close()
+            self.assertEqual(
+                bytes(contents[2]), b"".join(pieces) + b"end")
+            self.assertEqual(bytes(contents[3]), b"other")
+        finally:
+            shutil.rmtree(d, True)
+
+    def test_region_array(self):
+        d = tempfile.mkdtemp()
+        try:
+            brd = BufferedReceivingData(d)
+            values = numpy.arange(36, dtype="uint32")
+            brd.store_data_in_region_buffer(
+                0, 0, 1, 2, values[:5].tobytes())
+            brd.flushing_data_from_region(
+                0, 0, 1, 2, values[5:].tobytes())
+            brd.flushing_data_from_region(
+                0, 0, 1, 3, values.tobytes())
+
+            array, missing = brd.get_region_array(0, 0, 1, 2, "uint32")
+            self.assertFalse(missing, "data shouldn't be 'missing'")
+            self.assertTrue(numpy.array_equal(array, values))
+
+            array, _ = brd.get_region_array(0, 0, 1, 3, "uint32", (-1, 18))
+            self.assertEqual(array.shape, (2, 18))
+            self.assertTrue(numpy.array_equal(array.ravel(), values))
+
+            array, _ = brd.get_region_array(0, 0, 1, 4, "uint32", (-1, 18))
+            self.assertEqual(array.shape, (0, 18))
+        finally:
+            shutil.rmtree(d, True)
+
+    def test_missing(self):
+        d = tempfile.mkdtemp()
+        try:
+            brd = BufferedReceivingData(d)
+            values = numpy.arange(10, dtype="uint32")
+            brd.store_data_in_region_buffer(
+                0, 0, 1, 2, values[:5].tobytes())
+            brd.flushing_data_from_region(
+                0, 0, 1, 2, values[5:].tobytes())
+            brd.mark_region_missing(0, 0, 1, 2)
+            brd.mark_region_missing(0, 0, 1, 3)
+
+            data, missing = brd.get_region_data(0, 0, 1, 2)
+            self.assertTrue(missing, "data should be 'missing'")
+            self.assertEqual(bytes(data), values.tobytes())
+            array, missing = brd.get_region_array(0, 0, 1, 2, "uint32")
+            self.assertTrue(missing, "data should be 'missing'")
+            self.assertTrue(numpy.array_equal(array, values))
+            chunks, missing = brd.get_region_data_chunks(0, 0, 1, 2)
+            self.assertTrue(missing, "data should be 'missing'")
+            self.assertEqual(len(chunks), 2)
+
+            # A region with no data at all can be missing data too
+            data, missing = brd.get_region_data(0, 0, 1, 3)
+            self.assertTrue(missing, "data should be 'missing'")
+            self.assertEqual(bytes(data), b"")
+            data, missing = brd.get_region_data(0, 0, 1, 4)
+            self.assertFalse(missing, "data shouldn't be 'missing'")
+        finally:
+            shutil.rmtree(d, True)
+
+    def test_write_behind(self):
+        d = tempfile.mkdtemp()
+        try:
+            brd = BufferedReceivingData(d)
+            pieces = [bytes(bytearray([i] * (i + 1))) for i in range(100)]
+            for piece in pieces[:50]:
+                brd.queue_data_in_region_buffer(0, 0, 1, 2, piece)
+            # A direct store must come after everything already queued
+            brd.store_data_in_region_buffer(0, 0, 1, 2, pieces[50])
+            for piece in pieces[51:]:
+                brd.queue_data_in_region_buffer(0, 0, 1, 2, piece)
+
+            data, missing = brd.get_region_data(0, 0, 1, 2)
+            self.assertFalse(missing, "data shouldn't be 'missing'")
+            self.assertEqual(bytes(data), b"".join(pieces))
+            self.assertEqual(brd.write_behind.n_stored, 99)
+            self.assertGreater(brd.write_behind.n_commits, 0)
+            self.assertLessEqual(brd.write_behind.n_commits, 99)
+        finally:
+            shutil.rmtree(d, True)
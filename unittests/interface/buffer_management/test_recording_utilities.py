@@ -0,0 +1,46 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import struct
+import unittest
+from spinn_front_end_common.interface.buffer_management.recording_utilities \
+    import (
+        decode_recording_header, get_recording_header_array,
+        get_recording_header_read_size, get_recording_header_size)
+
+
+class TestRecordingUtilities(unittest.TestCase):
+
+    def test_decode_recording_header(self):
+        sizes = [100, 200, 0]
+        header = get_recording_header_array(sizes)
+
+        # Fill in what the C code would
+        header[6] = 1234
+        header[7:10] = [0x60000000, 0x60001000, 0x60002000]
+        data = bytearray(struct.pack("<{}I".format(len(header)), *header))
+        self.assertEqual(len(data), get_recording_header_size(len(sizes)))
+
+        n_regions = 2
+        size = get_recording_header_read_size(n_regions)
+        self.assertLess(size, len(data))
+        last_sequence_number, pointers = decode_recording_header(
+            data[:size], n_regions)
+        self.assertEqual(last_sequence_number, 1234)
+        self.assertEqual(pointers, [0x60000000, 0x60001000])
+
+
+if __name__ == "__main__":
+    unittest.main()
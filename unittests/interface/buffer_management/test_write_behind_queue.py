@@ -0,0 +1,76 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import unittest
+from spinn_front_end_common.interface.buffer_management.storage_objects \
+    import WriteBehindQueue
+
+
+class _SlowDatabase(object):
+    def __init__(self):
+        self.stored = list()
+        self.queue = None
+        self.max_queued_bytes = 0
+        self.fail = False
+
+    def store_data_in_region_buffers(self, items):
+        self.max_queued_bytes = max(
+            self.max_queued_bytes, self.queue.queued_bytes)
+        time.sleep(0.01)
+        if self.fail:
+            raise ValueError("failed")
+        self.stored.extend(items)
+
+
+class TestWriteBehindQueue(unittest.TestCase):
+
+    def test_bytes_limit(self):
+        db = _SlowDatabase()
+        queue = WriteBehindQueue(db, max_queued_bytes=100)
+        db.queue = queue
+        pieces = [bytes(bytearray([i] * 30)) for i in range(20)]
+        for piece in pieces:
+            queue.put(0, 0, 1, 2, piece)
+        # A piece bigger than the limit still gets through
+        queue.put(0, 0, 1, 2, b"x" * 500)
+        queue.flush()
+        self.assertEqual(
+            [item[4] for item in db.stored], pieces + [b"x" * 500])
+        self.assertLessEqual(db.max_queued_bytes, 500)
+        self.assertEqual(queue.queued_bytes, 0)
+        queue.close()
+
+    def test_error_on_flush(self):
+        db = _SlowDatabase()
+        queue = WriteBehindQueue(db)
+        db.queue = queue
+        db.fail = True
+        queue.put(0, 0, 1, 2, b"abc")
+        with self.assertRaises(ValueError):
+            queue.flush()
+
+        # The error is reported until the queue is replaced, as the data
+        # stored after it is incomplete
+        db.fail = False
+        queue.put(0, 0, 1, 2, b"def")
+        with self.assertRaises(ValueError):
+            queue.flush()
+        self.assertEqual([item[4] for item in db.stored], [b"def"])
+        queue.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import numpy
+from spinn_front_end_common.interface.ds import DataSpecificationCache
+
+
+class TestDataSpecificationCache(unittest.TestCase):
+
+    def setUp(self):
+        self._folder = tempfile.mkdtemp()
+        self._file = os.path.join(self._folder, "cache.sqlite3")
+
+    def tearDown(self):
+        shutil.rmtree(self._folder)
+
+    def test_specs(self):
+        cache = DataSpecificationCache(self._file)
+        self.assertIsNone(cache.get_spec("a"))
+        cache.set_spec("a", bytearray(b"spec a"), [12, 0, 4])
+        cache.set_spec("b", b"spec b", [])
+        cache.close()
+
+        # Kept for later
+        cache = DataSpecificationCache(self._file)
+        self.assertEqual(cache.get_spec("a"), (b"spec a", [12, 0, 4]))
+        self.assertEqual(cache.get_spec("b"), (b"spec b", []))
+        cache.close()
+
+    def test_images(self):
+        cache = DataSpecificationCache(self._file)
+        spec_hash = DataSpecificationCache.hash_spec(b"spec")
+        self.assertNotEqual(
+            spec_hash, DataSpecificationCache.hash_spec(b"other spec"))
+        self.assertIsNone(cache.get_image(spec_hash))
+        table = numpy.array([136, 0, 236], dtype="<u4")
+        regions = [(236, bytearray(b"second")), (136, b"first")]
+        cache.set_image(spec_hash, 400, table, regions)
+
+        # Keeping it again changes nothing
+        cache.set_image(spec_hash, 400, table, regions)
+        cache.close()
+
+        cache = DataSpecificationCache(self._file)
+        memory_used, kept_table, kept_regions = cache.get_image(spec_hash)
+        self.assertEqual(memory_used, 400)
+        self.assertEqual(list(kept_table), [136, 0, 236])
+        self.assertEqual(
+            kept_regions, [(136, b"first"), (236, b"second")])
+        cache.close()
+
+    def test_prune(self):
+        cache = DataSpecificationCache(self._file)
+        table = numpy.array([0], dtype="<u4")
+        # Far enough apart that the times they are used differ
+        for use in (
+                lambda: cache.set_spec("a", b"a" * 100, []),
+                lambda: cache.set_image("b", 200, table, [(0, b"b" * 100)]),
+                lambda: cache.set_spec("c", b"c" * 100, []),
+                lambda: cache.get_spec("a")):
+            use()
+            time.sleep(0.05)
+
+        # Using one makes it the last to go
+        self.assertEqual(cache.prune(1000), 0)
+        self.assertEqual(cache.prune(250), 1)
+        self.assertIsNone(cache.get_image("b"))
+        self.assertIsNotNone(cache.get_spec("a"))
+        self.assertIsNotNone(cache.get_spec("c"))
+        self.assertEqual(cache.prune(0), 2)
+        self.assertIsNone(cache.get_spec("a"))
+        self.assertIsNone(cache.get_spec("c"))
+        cache.close()
+
+    def test_not_opened(self):
+        # Nothing is left to close if the database cannot be opened
+        missing = os.path.join(self._folder, "missing", "cache.sqlite3")
+        with self.assertRaises(Exception):
+            DataSpecificationCache(missing)
+        DataSpecificationCache.__new__(DataSpecificationCache).__del__()
+
+
+if __name__ == "__main__":
+    unittest.main()
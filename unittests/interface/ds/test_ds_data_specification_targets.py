@@ -55,6 +55,56 @@ class TestDataSpecificationTargets(unittest.TestCase):
         for key, value in iteritems(asDict):
             self.assertEqual(check[key], value)
 
+    def test_write_data_specs(self):
+        testdir = tempfile.mkdtemp()
+        targets = DataSpecificationTargets(self.machine, testdir)
+        specs = [(x, y, p, bytearray([x, y, p]))
+                 for x in range(2) for y in range(2) for p in range(3)]
+        targets.write_data_specs(specs)
+        self.assertEqual(len(specs), len(targets))
+        for x, y, p, ds in specs:
+            self.assertEqual(DataRowReader(ds), targets[x, y, p])
+
+        targets.mark_system_cores([_Subset(1, 0, [0, 2])])
+        database = targets.get_database()
+        self.assertEqual(
+            {(1, 0, 0), (1, 0, 2)},
+            {(row["x"], row["y"], row["processor"])
+             for row in database._db.execute(
+                 "SELECT x, y, processor FROM core WHERE is_system = 1")})
+
+    def test_many_writes(self):
+        testdir = tempfile.mkdtemp()
+        targets = DataSpecificationTargets(self.machine, testdir)
+        check = bytearray()
+        with targets.create_data_spec(1, 1, 1) as writer:
+            for i in range(10000):
+                data = bytearray([i % 256]) * (i % 13)
+                writer.write(data)
+                check += data
+                # Changing what was written must not change the spec
+                data[:] = bytearray(len(data))
+            big = bytearray(b"big") * 100000
+            writer.write(big)
+            check += big
+            big[:3] = b"xxx"
+            writer.write(b"end")
+            check += b"end"
+        with targets.create_data_spec(1, 1, 2):
+            pass
+        self.assertEqual(DataRowReader(check), targets[1, 1, 1])
+        self.assertEqual(DataRowReader(b""), targets[1, 1, 2])
+
+
+class _Subset(object):
+    """ Stands in for a CoreSubset
+    """
+
+    def __init__(self, x, y, processor_ids):
+        self.x = x
+        self.y = y
+        self.processor_ids = processor_ids
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -51,6 +51,29 @@ class TestDsWriteInfo(unittest.TestCase):
         for key, value in iteritems(asDict):
             self.assertEqual(check[key], value)
 
+    def test_set_infos(self):
+        machine = virtual_machine(2, 2)
+        tempdir = tempfile.mkdtemp()
+        dst = DataSpecificationTargets(machine, tempdir)
+        dst.write_data_specs([(0, 0, 1, b"foo"), (1, 0, 2, b"bar")])
+        asDict = DsWriteInfo(dst.get_database())
+
+        # Some of the cores have data specs and some do not
+        check = {
+            (0, 0, 1): DataWritten(100, 10, 5),
+            (1, 0, 2): DataWritten(200, 20, 10),
+            (1, 1, 3): {"start_address": 300, "memory_used": 30,
+                        "memory_written": 15}}
+        asDict.set_infos(iteritems(check))
+        self.assertEqual(3, len(asDict))
+        self.assertEqual(DataWritten(300, 30, 15), asDict[1, 1, 3])
+        self.assertEqual(check[0, 0, 1], asDict[0, 0, 1])
+
+        # Setting again updates rather than adds
+        asDict.set_infos([((1, 1, 3), DataWritten(400, 40, 20))])
+        self.assertEqual(3, len(asDict))
+        self.assertEqual(DataWritten(400, 40, 20), asDict[1, 1, 3])
+
 
 if __name__ == "__main__":
     unittest.main()
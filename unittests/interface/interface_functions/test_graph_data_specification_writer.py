@@ -0,0 +1,146 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import shutil
+import tempfile
+import unittest
+from spinn_machine.virtual_machine import virtual_machine
+from pacman.model.graphs.machine import SimpleMachineVertex
+from pacman.model.placements import Placement, Placements
+from pacman.model.resources import ResourceContainer
+from spinn_front_end_common.abstract_models import (
+    AbstractCachesDataSpecification, AbstractGeneratesDataSpecification,
+    AbstractGeneratesDataSpecificationInWorker, AbstractHasAssociatedBinary)
+from spinn_front_end_common.interface.interface_functions import (
+    GraphDataSpecificationWriter)
+from spinn_front_end_common.utilities.exceptions import ConfigurationException
+from spinn_front_end_common.utilities.utility_objs import ExecutableType
+
+
+class _Vertex(SimpleMachineVertex, AbstractGeneratesDataSpecification,
+              AbstractHasAssociatedBinary):
+    """ Vertex that writes a region of a given size and remembers which\
+        process generated it
+    """
+
+    def __init__(self, label, size=100):
+        super(_Vertex, self).__init__(ResourceContainer(), label)
+        self._size = size
+        self.generated_by = None
+
+    def generate_data_specification(self, spec, placement):
+        self.generated_by = os.getpid()
+        spec.reserve_memory_region(0, self._size)
+        spec.switch_write_focus(0)
+        spec.write_value(placement.p)
+        spec.end_specification()
+
+    def get_binary_file_name(self):
+        return "test.aplx"
+
+    def get_binary_start_type(self):
+        return ExecutableType.USES_SIMULATION_INTERFACE
+
+
+class _WorkerVertex(_Vertex, AbstractGeneratesDataSpecificationInWorker):
+    """ Vertex that can be generated in a worker process
+    """
+
+
+class _CachedVertex(_WorkerVertex, AbstractCachesDataSpecification):
+    """ Vertex whose data spec is made from its size only
+    """
+
+    def get_data_specification_cache_key(self, placement):
+        return "size={}".format(self._size)
+
+
+class TestGraphDataSpecificationWriter(unittest.TestCase):
+
+    def setUp(self):
+        self._report_dir = tempfile.mkdtemp()
+        self._machine = virtual_machine(2, 2)
+
+    def tearDown(self):
+        shutil.rmtree(self._report_dir)
+
+    def _write(self, placements, n_processes, cache_file=None):
+        writer = GraphDataSpecificationWriter()
+        return writer(
+            placements, "localhost", self._report_dir, False, self._machine,
+            10, n_processes=n_processes, cache_file=cache_file)
+
+    def _specs(self, targets):
+        return {core: bytes(targets[core].read())
+                for core in targets.keys()}
+
+    def test_parallel_matches_serial(self):
+        vertices = [_Vertex("v0")] + [
+            _WorkerVertex("v{}".format(i)) for i in range(1, 20)]
+        placements = Placements(
+            Placement(vertex, 0, 0, i + 1) if i < 17
+            else Placement(vertex, 1, 0, i - 16)
+            for i, vertex in enumerate(vertices))
+        serial = self._specs(self._write(placements, 1))
+        for vertex in vertices:
+            vertex.generated_by = None
+        parallel = self._specs(self._write(placements, 3))
+        self.assertEqual(serial, parallel)
+        self.assertEqual(len(parallel), 20)
+
+        # Only vertices that opt in are generated in the workers
+        self.assertEqual(vertices[0].generated_by, os.getpid())
+        self.assertIsNone(vertices[1].generated_by)
+
+    def test_parallel_too_much_sdram(self):
+        size = self._machine.get_chip_at(0, 0).sdram.size // 2
+        placements = Placements(
+            Placement(_WorkerVertex("v{}".format(i), size=size), 0, 0, i + 1)
+            for i in range(3))
+        with self.assertRaises(ConfigurationException):
+            self._write(placements, 2)
+
+    def test_cache(self):
+        cache_file = os.path.join(self._report_dir, "cache.sqlite3")
+        for n_processes in (1, 3):
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+            vertices = [_CachedVertex("v{}".format(i)) for i in range(5)]
+            vertices.append(_WorkerVertex("uncached"))
+            placements = Placements(
+                Placement(vertex, 0, 0, i + 1)
+                for i, vertex in enumerate(vertices))
+            first = self._specs(
+                self._write(placements, n_processes, cache_file))
+
+            # Only the vertex that cannot be cached is generated again
+            for vertex in vertices:
+                vertex.generated_by = None
+            again = self._specs(
+                self._write(placements, n_processes, cache_file))
+            self.assertEqual(first, again)
+            self.assertEqual(
+                [vertex.generated_by is None for vertex in vertices],
+                [True] * 5 + [n_processes > 1])
+
+            # A change in the key generates again
+            vertices[0]._size = 200
+            changed = self._specs(self._write(placements, 1, cache_file))
+            self.assertIsNotNone(vertices[0].generated_by)
+            self.assertNotEqual(changed[0, 0, 1], first[0, 0, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
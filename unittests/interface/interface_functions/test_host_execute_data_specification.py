@@ -13,6 +13,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
+import sqlite3
+import struct
 import tempfile
 import unittest
 from spinn_machine.virtual_machine import virtual_machine
@@ -21,6 +24,8 @@ from data_specification.data_specification_generator import (
     DataSpecificationGenerator)
 from spinn_front_end_common.interface.interface_functions import (
     HostExecuteDataSpecification)
+from spinn_front_end_common.interface.interface_functions.\
+    host_execute_data_specification import coalesce_writes
 from spinn_front_end_common.utilities.utility_objs import (
     ExecutableTargets, ExecutableType)
 from spinn_front_end_common.interface.ds import DataSpecificationTargets
@@ -108,39 +113,111 @@ class TestHostExecuteDataSpecification(unittest.TestCase):
         # Test regions - although 3 are created, only 2 should be uploaded
         # (0 and 2), and only the data written should be uploaded
         # The space between regions should be as allocated regardless of
-        # how much data is written
+        # how much data is written; as the regions are close together, they
+        # are written with the header and table in one go
         header_and_table_size = (MAX_MEM_REGIONS + 2) * 4
         regions = transceiver.regions_written
-        self.assertEqual(len(regions), 4)
+        self.assertEqual(len(regions), 2)
 
-        # Base address for header and table
+        # Base address for header, table and regions
         self.assertEqual(regions[0][0], 0)
 
-        # Base address for region 0 (after header and table)
-        self.assertEqual(regions[1][0], header_and_table_size)
+        # Size of header, table, region 0 and its space, and region 2
+        image = regions[0][1]
+        self.assertEqual(len(image), header_and_table_size + 200 + 4)
 
-        # Base address for region 2
-        self.assertEqual(regions[2][0], header_and_table_size + 200)
+        # Data of region 0 (after header and table)
+        self.assertEqual(
+            struct.unpack_from("<3I", image, header_and_table_size),
+            (0, 1, 2))
 
-        # User 0 write address
-        self.assertEqual(regions[3][0], 1000)
-
-        # Size of header and table
-        self.assertEqual(len(regions[0][1]), header_and_table_size)
+        # Data of region 2
+        self.assertEqual(
+            struct.unpack_from("<I", image, header_and_table_size + 200),
+            (3, ))
 
-        # Size of region 0
-        self.assertEqual(len(regions[1][1]), 12)
-
-        # Size of region 2
-        self.assertEqual(len(regions[2][1]), 4)
+        # User 0 write address
+        self.assertEqual(regions[1][0], 1000)
 
         # Size of user 0
-        self.assertEqual(len(regions[3][1]), 4)
+        self.assertEqual(len(regions[1][1]), 4)
 
         info = infos[(0, 0, 0)]
         self.assertEqual(info.memory_used, 372)
         self.assertEqual(info.memory_written, 88)
 
+    def _execute_several(self, execution_queue_depth, cache_file=None):
+        n_cores = 10
+        executor = HostExecuteDataSpecification()
+        transceiver = _MockTransceiver(user_0_addresses={
+            p: 1000 + p for p in range(1, n_cores + 1)})
+        machine = virtual_machine(2, 2)
+        tempdir = tempfile.mkdtemp()
+
+        dsg_targets = DataSpecificationTargets(machine, tempdir)
+        targets = ExecutableTargets()
+        for p in range(1, n_cores + 1):
+            with dsg_targets.create_data_spec(0, 0, p) as spec_writer:
+                spec = DataSpecificationGenerator(spec_writer)
+                spec.reserve_memory_region(0, 100)
+                spec.switch_write_focus(0)
+                spec.write_value(p)
+                spec.end_specification()
+            targets.add_processor("text.aplx", 0, 0, p,
+                                  ExecutableType.USES_SIMULATION_INTERFACE)
+
+        infos = executor.execute_application_data_specs(
+            transceiver, machine, 30, dsg_targets, False, targets,
+            report_folder=tempdir,
+            execution_queue_depth=execution_queue_depth,
+            cache_file=cache_file)
+        return infos, transceiver.regions_written
+
+    def test_execution_queue_depth(self):
+        infos, regions = self._execute_several(1)
+        for depth in (2, 4, 20):
+            infos_ahead, regions_ahead = self._execute_several(depth)
+            self.assertEqual(regions_ahead, regions)
+            self.assertEqual(infos_ahead, infos)
+
+    def test_cache(self):
+        infos, regions = self._execute_several(1)
+        cache_file = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+
+        # The first time, the images are made and kept
+        infos_first, regions_first = self._execute_several(4, cache_file)
+        self.assertEqual(regions_first, regions)
+        self.assertEqual(infos_first, infos)
+
+        # Change what is kept, to see that it is what is used next time
+        db = sqlite3.connect(cache_file)
+        with db:
+            self.assertEqual(
+                db.execute("SELECT COUNT(*) FROM image").fetchone()[0], 10)
+            db.execute("UPDATE image_region SET content = ?",
+                       (sqlite3.Binary(b"\xff" * 4), ))
+        db.close()
+        infos_again, regions_again = self._execute_several(4, cache_file)
+        self.assertEqual(infos_again, infos)
+        self.assertEqual(len(regions_again), len(regions))
+        for (address, data), (address_again, data_again) in zip(
+                regions, regions_again):
+            self.assertEqual(address, address_again)
+            self.assertEqual(len(data), len(data_again))
+            if len(data) > 4:
+                # The image; the region data is at the end
+                self.assertEqual(data_again[:-4], data[:-4])
+                self.assertEqual(data_again[-4:], b"\xff" * 4)
+
+    def test_coalesce_writes(self):
+        writes = coalesce_writes(
+            [(100, b"\x01\x02"), (0, b"\x03"), (104, b"\x04"),
+             (2000, b"\x05")], max_gap=1000)
+        self.assertEqual(writes, [
+            (0, bytearray(b"\x03") + bytearray(99) + bytearray(
+                b"\x01\x02\x00\x00\x04")),
+            (2000, bytearray(b"\x05"))])
+
 
 if __name__ == "__main__":
     unittest.main()
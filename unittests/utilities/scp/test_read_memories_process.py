@@ -0,0 +1,92 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import struct
+import unittest
+from spinnman.connections.udp_packet_connections import (
+    update_sdp_header_for_udp_send)
+from spinnman.messages.scp.enums import SCPResult
+from spinn_front_end_common.utilities.scp import ReadMemoriesProcess
+
+_TWO_SHORTS = struct.Struct("<2H")
+
+
+def _memory(x, y, address, length):
+    return bytes(bytearray(
+        (x + y + address + i) % 256 for i in range(length)))
+
+
+class _MockConnection(object):
+    """ Answers read requests from fake memory, newest request first, so\
+        that blocks complete out of order.
+    """
+
+    def __init__(self):
+        self.pending = list()
+        self.max_in_flight = 0
+
+    def get_scp_data(self, scp_request):
+        update_sdp_header_for_udp_send(scp_request.sdp_header, 0, 0)
+        return scp_request
+
+    def send(self, request):
+        self.pending.append(request)
+        self.max_in_flight = max(self.max_in_flight, len(self.pending))
+
+    def receive_scp_response(self, timeout=1.0):  # @UnusedVariable
+        request = self.pending.pop()
+        sequence = request.scp_request_header.sequence
+        data = (b"\0\0" + request.sdp_header.bytestring +
+                _TWO_SHORTS.pack(SCPResult.RC_OK.value, sequence) +
+                _memory(request.sdp_header.destination_chip_x,
+                        request.sdp_header.destination_chip_y,
+                        request.argument_1, request.argument_2))
+        return SCPResult.RC_OK, sequence, data, 2
+
+
+class _MockSelector(object):
+    def __init__(self):
+        self.connection = _MockConnection()
+
+    def get_next_connection(self, message):  # @UnusedVariable
+        return self.connection
+
+
+class TestReadMemoriesProcess(unittest.TestCase):
+
+    def test_read_memories(self):
+        selector = _MockSelector()
+        reads = [
+            (0, 0, 0x1000, 1000, "a"),
+            (1, 0, 0x2000, 0, "b"),
+            (0, 1, 0x3000, 256, "c"),
+            (1, 1, 0x4000, 10, "d")]
+        results = dict()
+
+        def callback(key, data):
+            self.assertNotIn(key, results)
+            results[key] = data
+
+        ReadMemoriesProcess(selector, n_channels=3).read_memories(
+            reads, callback)
+        self.assertEqual(len(results), len(reads))
+        for x, y, address, length, key in reads:
+            self.assertEqual(
+                bytes(results[key]), _memory(x, y, address, length))
+        self.assertLessEqual(selector.connection.max_in_flight, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
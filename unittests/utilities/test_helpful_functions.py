@@ -13,11 +13,39 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import struct
 import unittest
+from data_specification.constants import MAX_MEM_REGIONS
+from pacman.model.placements import Placement
 from spinn_front_end_common.utilities.helpful_functions import (
+    cache_region_addresses, clear_region_address_cache,
+    invalidate_region_addresses, locate_memory_region_for_placement,
     sort_out_downed_chips_cores_links)
 
 
+class _MockCPUInfo(object):
+    def __init__(self, user_0):
+        self.user = [user_0]
+
+
+class _MockTransceiver(object):
+    """ Pretend transceiver where region i of a core is at base + i
+    """
+
+    def __init__(self, base_address):
+        self._base_address = base_address
+        self.n_calls = 0
+
+    def get_cpu_information_from_core(self, x, y, p):
+        self.n_calls += 1
+        return _MockCPUInfo(self._base_address)
+
+    def read_memory(self, x, y, base_address, length, cpu=0):
+        self.n_calls += 1
+        return struct.pack("<{}I".format(MAX_MEM_REGIONS), *[
+            self._base_address + i for i in range(MAX_MEM_REGIONS)])
+
+
 class TestHelpfulFunctions(unittest.TestCase):
 
     def test_sort_out_downed_cores_chip_links(self):
@@ -33,6 +61,35 @@ class TestHelpfulFunctions(unittest.TestCase):
             down_links, {(1, 1, 3), (2, 1, 2)},
             "Down Links not parsed correctly")
 
+    def test_region_address_cache(self):
+        clear_region_address_cache()
+        placement = Placement(None, 0, 0, 1)
+        txrx = _MockTransceiver(1000)
+
+        # Only the first lookup goes to the machine
+        self.assertEqual(
+            locate_memory_region_for_placement(placement, 2, txrx), 1002)
+        self.assertEqual(
+            locate_memory_region_for_placement(placement, 3, txrx), 1003)
+        self.assertEqual(txrx.n_calls, 2)
+
+        # Loaded regions need no lookup at all
+        cache_region_addresses(0, 0, 2, 2000, range(3000, 3010))
+        self.assertEqual(locate_memory_region_for_placement(
+            Placement(None, 0, 0, 2), 4, txrx), 3004)
+        self.assertEqual(txrx.n_calls, 2)
+
+        # A known base address saves asking the core where it is
+        cache_region_addresses(0, 0, 1, 1000)
+        locate_memory_region_for_placement(placement, 2, txrx)
+        self.assertEqual(txrx.n_calls, 3)
+
+        # Reloading forgets everything
+        invalidate_region_addresses(0, 0, 1)
+        locate_memory_region_for_placement(placement, 2, txrx)
+        self.assertEqual(txrx.n_calls, 5)
+        clear_region_address_cache()
+
 
 if __name__ == '__main__':
     unittest.main()
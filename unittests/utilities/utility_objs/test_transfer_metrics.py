@@ -0,0 +1,105 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from spinn_front_end_common.utilities.utility_objs import TransferMetrics
+from spinn_front_end_common.utilities.utility_objs.transfer_metrics import (
+    TRANSFER_METRICS_FILE_NAME)
+
+_MB = 1024 * 1024
+
+
+class TestTransferMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self._folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._folder)
+
+    def test_provenance(self):
+        metrics = TransferMetrics("test")
+        # Two overlapping transfers on one board take 3 seconds in total
+        metrics.record("scp", (0, 0), 1, 1, 1, 2 * _MB, 0.0, 2.0,
+                       retransmit_rounds=1, timeouts=2, queue_wait=0.5)
+        metrics.record("scp", (0, 0), 1, 1, 2, 4 * _MB, 1.0, 3.0)
+        metrics.record("scp", (8, 4), 9, 5, 1, _MB, 0.0, 4.0)
+        items = {
+            tuple(item.names): item.value
+            for item in metrics.get_provenance_data()}
+        names = ("test", "transfers", "scp", "board0:0")
+        self.assertEqual(items[names + ("n_transfers", )], 2)
+        self.assertEqual(items[names + ("bytes", )], 6 * _MB)
+        self.assertAlmostEqual(items[names + ("seconds", )], 3.0)
+        self.assertAlmostEqual(
+            items[names + ("megabytes_per_second", )], 2.0)
+        self.assertEqual(items[names + ("retransmit_rounds", )], 1)
+        self.assertEqual(items[names + ("timeouts", )], 2)
+        self.assertAlmostEqual(items[names + ("queue_wait_seconds", )], 0.5)
+        self.assertAlmostEqual(items[(
+            "test", "transfers", "scp", "slowest_core", "9:5:1",
+            "megabytes_per_second")], 0.25)
+
+    def test_write(self):
+        metrics = TransferMetrics("test")
+        metrics.record("data_in", None, 0, 0, None, 100, 1.0, 2.0)
+        metrics.write(self._folder)
+        self.assertEqual(metrics.transfers, [])
+        metrics.record("data_out", (0, 0), 0, 0, 3, 200, 2.0, 3.0)
+        metrics.write(self._folder)
+        with open(os.path.join(
+                self._folder, TRANSFER_METRICS_FILE_NAME)) as f:
+            transfers = [json.loads(line) for line in f]
+        self.assertEqual(
+            [transfer["path"] for transfer in transfers],
+            ["data_in", "data_out"])
+        self.assertEqual(transfers[0]["board"], None)
+        self.assertEqual(transfers[1]["board"], [0, 0])
+        self.assertEqual(transfers[1]["bytes"], 200)
+
+        # Writing does not change the summary
+        items = {
+            tuple(item.names): item.value
+            for item in metrics.get_provenance_data()}
+        self.assertEqual(
+            items[("test", "transfers", "data_in", "unknown_board",
+                   "n_transfers")], 1)
+
+    def test_max_pending(self):
+        metrics = TransferMetrics("test", max_pending=3)
+        for i in range(5):
+            metrics.record("scp", (0, 0), 0, 0, i, 100, i, i + 1.0)
+        self.assertEqual(len(metrics.transfers), 3)
+        items = {
+            tuple(item.names): item.value
+            for item in metrics.get_provenance_data()}
+        self.assertEqual(
+            items[("test", "transfers", "scp", "board0:0", "n_transfers")],
+            5)
+        self.assertEqual(
+            items[("test", "transfers", "n_not_written")], 2)
+        metrics.write(self._folder)
+        with open(os.path.join(
+                self._folder, TRANSFER_METRICS_FILE_NAME)) as f:
+            self.assertEqual(len(f.readlines()), 3)
+        self.assertEqual(metrics.transfers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import unittest
+from spinn_front_end_common.utilities.utility_objs import TransmissionPacer
+
+
+class TestTransmissionPacer(unittest.TestCase):
+
+    def test_aimd(self):
+        pacer = TransmissionPacer(0.01, 0.002, 0.05, 0.002)
+        # Little loss shortens the gap a step at a time, down to the minimum
+        pacer.observe(1000, 5)
+        self.assertAlmostEqual(pacer.gap, 0.008)
+        for _ in range(10):
+            pacer.observe(1000, 0)
+        self.assertAlmostEqual(pacer.gap, 0.002)
+
+        # Loss doubles it, up to the maximum
+        pacer.observe(1000, 100)
+        self.assertAlmostEqual(pacer.gap, 0.004)
+        for _ in range(10):
+            pacer.observe(10, 10)
+        self.assertAlmostEqual(pacer.gap, 0.05)
+        self.assertEqual(pacer.n_rounds, 22)
+        self.assertEqual(pacer.n_lossy_rounds, 11)
+
+        # Empty rounds say nothing
+        pacer.observe(0, 0)
+        self.assertEqual(pacer.n_rounds, 22)
+
+    def test_loss_from_no_gap(self):
+        pacer = TransmissionPacer(0.0, 0.0, 0.001, 0.0001)
+        pacer.observe(100, 50)
+        self.assertAlmostEqual(pacer.gap, 0.0001)
+
+    def test_wait(self):
+        pacer = TransmissionPacer(0.02, 0.0, 1.0, 0.01)
+        start = time.time()
+        for _ in range(4):
+            pacer.wait()
+        self.assertGreaterEqual(time.time() - start, 0.06)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,317 @@
+# Copyright (c) 2019 The University of Manchester
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import select
+import shutil
+import socket
+import struct
+import tempfile
+import unittest
+import numpy
+from spinnman.exceptions import SpinnmanTimeoutException
+from spinn_front_end_common.utility_models import (
+    DataSpeedUpPacketGatherMachineVertex)
+from spinn_front_end_common.utility_models.\
+    data_speed_up_packet_gatherer_machine_vertex import (
+        DATA_OUT_COMMANDS,
+        THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_EXTRACTOR_IN_BYTES,
+        THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_INPUT_IN_BYTES,
+        WORDS_PER_FULL_PACKET,
+        WORDS_PER_FULL_PACKET_WITH_SEQUENCE_NUM, _ConcurrentDataOut,
+        _DataOutTransfer, data_checksum)
+
+
+class _MockConnection(object):
+    """ A connection that receives what is sent down its other end
+    """
+
+    def __init__(self):
+        self._socket, self.other_end = socket.socketpair(
+            socket.AF_UNIX, socket.SOCK_DGRAM)
+
+    def fileno(self):
+        return self._socket.fileno()
+
+    def is_ready_to_receive(self, timeout=0):
+        return bool(select.select([self._socket], [], [], timeout)[0])
+
+    def receive(self, timeout=None):
+        if not self.is_ready_to_receive(timeout):
+            raise SpinnmanTimeoutException("receive", timeout)
+        return self._socket.recv(300)
+
+    def close(self):
+        self._socket.close()
+        self.other_end.close()
+
+
+class _MockGatherer(object):
+    """ A gatherer where a transfer of n bytes is n one-byte packets, of\
+        which the last is only sent when asked for again
+    """
+
+    def __init__(self, name, log):
+        self._name = name
+        self._log = log
+        self._received = None
+
+    def _uses_data_out_protocol(self, length):
+        return length > 1
+
+    def get_data(self, placement, address, length, fixed_routes):
+        self._log.append((self._name, "scp", address))
+        return bytearray(length)
+
+    def _start_data_out(self, placement, address, length, start):
+        self._log.append((self._name, "start", address))
+        connection = _MockConnection()
+        for i in range(length - 1):
+            connection.other_end.send(bytes(bytearray([i])))
+        self._received = bytearray()
+        return _DataOutTransfer(
+            placement, address, length, start, connection, length)
+
+    def _data_out_received(self, transceiver, transfer, data):
+        self._received.extend(data)
+        transfer.finished = len(self._received) == transfer.length_in_bytes
+
+    def _data_out_timed_out(self, transceiver, transfer):
+        transfer.n_timeouts += 1
+        transfer.connection.other_end.send(
+            bytes(bytearray([transfer.length_in_bytes - 1])))
+
+    def _finish_data_out(self, transceiver, transfer, fixed_routes):
+        self._log.append((self._name, "end", transfer.memory_address))
+        transfer.connection.close()
+        return self._received
+
+    def close_connection(self):
+        self._log.append((self._name, "close", None))
+
+
+class TestMissingSequenceNumbers(unittest.TestCase):
+
+    def _gatherer(self, max_seq_num):
+        gatherer = DataSpeedUpPacketGatherMachineVertex.__new__(
+            DataSpeedUpPacketGatherMachineVertex)
+        gatherer._max_seq_num = max_seq_num
+        return gatherer
+
+    def test_missing(self):
+        gatherer = self._gatherer(10)
+        seq_nums = numpy.zeros(11, dtype=bool)
+        seq_nums[[0, 2, 3, 9, 10]] = True
+        self.assertEqual(
+            list(gatherer._calculate_missing_seq_nums(seq_nums)),
+            [1, 4, 5, 6, 7, 8])
+        self.assertFalse(gatherer._check(seq_nums))
+        seq_nums[:] = True
+        self.assertEqual(
+            len(gatherer._calculate_missing_seq_nums(seq_nums)), 0)
+        self.assertTrue(gatherer._check(seq_nums))
+
+    def test_packets(self):
+        missing = numpy.arange(0, 400, 2, dtype="<u4")
+        n_packets = 3
+        packets = list(
+            DataSpeedUpPacketGatherMachineVertex._missing_seq_nums_packets(
+                missing, n_packets))
+        self.assertEqual(len(packets), n_packets)
+
+        first = struct.unpack("<{}I".format(len(packets[0]) // 4), packets[0])
+        self.assertEqual(len(first), WORDS_PER_FULL_PACKET)
+        self.assertEqual(first[:2], (
+            DATA_OUT_COMMANDS.START_MISSING_SEQ.value, n_packets))
+        received = list(first[2:])
+        for packet in packets[1:]:
+            words = struct.unpack("<{}I".format(len(packet) // 4), packet)
+            self.assertLessEqual(
+                len(words), WORDS_PER_FULL_PACKET_WITH_SEQUENCE_NUM + 1)
+            self.assertEqual(words[0], DATA_OUT_COMMANDS.MISSING_SEQ.value)
+            received.extend(words[1:])
+        self.assertEqual(received, list(missing))
+
+    def test_ranges_layout(self):
+        packet_bytes = WORDS_PER_FULL_PACKET_WITH_SEQUENCE_NUM * 4
+        offsets, lengths = \
+            DataSpeedUpPacketGatherMachineVertex._ranges_layout(
+                [8, packet_bytes, packet_bytes + 2, 6])
+        self.assertEqual(lengths, [8, packet_bytes, packet_bytes + 4, 8])
+        self.assertEqual(
+            offsets, [0, packet_bytes, 2 * packet_bytes, 4 * packet_bytes])
+
+    def test_connection_reused(self):
+        gatherer = self._gatherer(0)
+        gatherer._x = 0
+        gatherer._y = 0
+        gatherer._ip_address = "127.0.0.1"
+        gatherer._connection = None
+        tagged = list()
+        cls = DataSpeedUpPacketGatherMachineVertex
+        reprogram_tag = \
+            cls._DataSpeedUpPacketGatherMachineVertex__reprogram_tag
+        cls._DataSpeedUpPacketGatherMachineVertex__reprogram_tag = \
+            lambda _self, connection: tagged.append(connection)
+        try:
+            get_connection = \
+                gatherer._DataSpeedUpPacketGatherMachineVertex__get_connection
+            connection = get_connection()
+            self.assertIs(get_connection(), connection)
+            self.assertEqual(tagged, [connection])
+            gatherer.close_connection()
+            self.assertIsNot(get_connection(), connection)
+            self.assertEqual(len(tagged), 2)
+        finally:
+            cls._DataSpeedUpPacketGatherMachineVertex__reprogram_tag = \
+                reprogram_tag
+            gatherer.close_connection()
+
+
+class TestDataChecksum(unittest.TestCase):
+    def test_whole_words(self):
+        data = struct.pack("<4I", 1, 2, 0xFFFFFFFF, 0x80000000)
+        self.assertEqual(data_checksum(data), 0x80000002)
+        self.assertEqual(data_checksum(bytearray(data)), 0x80000002)
+
+    def test_partial_word(self):
+        data = struct.pack("<I", 5) + b"\x01\x02"
+        self.assertEqual(data_checksum(data), 5 + 0x0201)
+
+    def test_empty(self):
+        self.assertEqual(data_checksum(b""), 0)
+
+    def test_matches_word_sum(self):
+        data = numpy.random.bytes(4099)
+        padded = data + b"\0"
+        words = struct.unpack("<{}I".format(len(padded) // 4), padded)
+        self.assertEqual(data_checksum(data), sum(words) & 0xFFFFFFFF)
+
+
+class TestThresholds(unittest.TestCase):
+
+    def _gatherer(self, ip_address):
+        gatherer = DataSpeedUpPacketGatherMachineVertex.__new__(
+            DataSpeedUpPacketGatherMachineVertex)
+        gatherer._ip_address = ip_address
+        gatherer._data_out_threshold = \
+            THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_EXTRACTOR_IN_BYTES
+        gatherer._data_in_threshold = \
+            THRESHOLD_WHERE_SDP_BETTER_THAN_DATA_INPUT_IN_BYTES
+        gatherer._thresholds_calibrated = False
+        return gatherer
+
+    def test_calibrated_threshold(self):
+        threshold = DataSpeedUpPacketGatherMachineVertex._calibrated_threshold
+        sizes = [10, 20, 40, 80]
+        self.assertEqual(
+            threshold(sizes, [1, 2, 3, 4], [2, 3, 2, 3]), 40)
+        self.assertEqual(
+            threshold(sizes, [1, 2, 3, 4], [0, 3, 2, 3]), 40)
+        self.assertEqual(
+            threshold(sizes, [1, 2, 3, 4], [0, 1, 2, 3]), 10)
+        self.assertEqual(
+            threshold(sizes, [1, 2, 3, 4], [2, 3, 4, 5]), 160)
+
+    def test_uses_thresholds(self):
+        gatherer = self._gatherer("127.0.0.1")
+        gatherer.set_thresholds(1000, 100)
+        self.assertTrue(gatherer.thresholds_calibrated)
+        self.assertFalse(gatherer._uses_data_out_protocol(999))
+        self.assertTrue(gatherer._uses_data_out_protocol(1000))
+        self.assertFalse(gatherer._worse_via_scp(99))
+        self.assertTrue(gatherer._worse_via_scp(100))
+
+    def test_thresholds_file(self):
+        folder = tempfile.mkdtemp()
+        try:
+            thresholds_file = os.path.join(folder, "thresholds.json")
+            cls = DataSpeedUpPacketGatherMachineVertex
+            gatherers = [self._gatherer("10.0.0.1"),
+                         self._gatherer("10.0.0.2")]
+            cls.read_thresholds(gatherers, thresholds_file)
+            self.assertFalse(gatherers[0].thresholds_calibrated)
+            gatherers[0].set_thresholds(1000, 100)
+            cls.write_thresholds(gatherers, thresholds_file)
+            gatherers[1].set_thresholds(2000, 200)
+            cls.write_thresholds(gatherers[1:], thresholds_file)
+
+            others = [self._gatherer("10.0.0.1"), self._gatherer("10.0.0.2"),
+                      self._gatherer("10.0.0.3")]
+            cls.read_thresholds(others, thresholds_file)
+            self.assertEqual(others[0].thresholds, (1000, 100))
+            self.assertEqual(others[1].thresholds, (2000, 200))
+            self.assertFalse(others[2].thresholds_calibrated)
+        finally:
+            shutil.rmtree(folder)
+
+
+class TestConcurrentDataOut(unittest.TestCase):
+
+    def setUp(self):
+        self._timeout = \
+            DataSpeedUpPacketGatherMachineVertex.TIMEOUT_PER_RECEIVE_IN_SECONDS
+        DataSpeedUpPacketGatherMachineVertex.\
+            TIMEOUT_PER_RECEIVE_IN_SECONDS = 0.01
+
+    def tearDown(self):
+        DataSpeedUpPacketGatherMachineVertex.\
+            TIMEOUT_PER_RECEIVE_IN_SECONDS = self._timeout
+
+    def _run(self, reads, max_concurrent=None):
+        results = dict()
+        _ConcurrentDataOut(
+            None, None, results.__setitem__, max_concurrent).run(reads)
+        return results
+
+    def test_many_gatherers(self):
+        log = list()
+        gatherers = [_MockGatherer(i, log) for i in range(3)]
+        reads = [
+            (gatherer, None, address, length, (i, address))
+            for i, gatherer in enumerate(gatherers)
+            for address, length in ((0, 5), (100, 1), (200, 8))]
+        results = self._run(reads)
+        self.assertEqual(len(results), len(reads))
+        for _, _, address, length, key in reads:
+            if length > 1:
+                self.assertEqual(results[key], bytearray(range(length)))
+            else:
+                self.assertEqual(results[key], bytearray(length))
+
+        # Each gatherer does its reads in order, but all are started
+        # before any finishes
+        for i in range(3):
+            self.assertEqual(
+                [(step, address) for name, step, address in log
+                 if name == i],
+                [("start", 0), ("end", 0), ("scp", 100), ("start", 200),
+                 ("end", 200)])
+        self.assertEqual(
+            [step for _, step, _ in log[:3]], ["start"] * 3)
+
+    def test_max_concurrent(self):
+        log = list()
+        gatherers = [_MockGatherer(i, log) for i in range(3)]
+        results = self._run(
+            [(gatherer, None, 0, 4, i)
+             for i, gatherer in enumerate(gatherers)], max_concurrent=1)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(
+            [step for _, step, _ in log], ["start", "end"] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()